@@ -0,0 +1,7 @@
+"""
+Benchmarki wydajności generatora planu lekcji.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python -m benchmarks.run                      # pomiar i porównanie z benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline    # zapis nowego punktu odniesienia
+"""
@@ -0,0 +1,338 @@
+# benchmarks/run.py
+
+"""
+Pomiar czasu gorących ścieżek algorytmu genetycznego dla szkół od 1 do 40 klas.
+
+Mierzone operacje: random_lesson_slot, dsatur_individual (budowa osobnika heurystyką
+DSATUR), convert_to_schedule, evaluate_schedule, crossover, mutation oraz pełna generacja
+(evolve_generation). Operatory i generacja działają na osobnikach losowych, jak przy
+zapisie punktu odniesienia. Dla każdej operacji
+i rozmiaru szkoły zapisywany jest czas jednego wywołania (mediana i minimum z powtórzeń).
+Wyniki trafiają do pliku JSON razem z informacjami o maszynie i są porównywane
+z zapisanym punktem odniesienia — wzrost zarówno minimalnego, jak i medianowego czasu
+ponad próg kończy program kodem 1 (pojedynczy wolny pomiar nie wystarcza do alarmu).
+
+Powtórzenia wykonywane są rundami przez wszystkie rozmiary i operacje, a w każdej rundzie
+mierzone jest też stałe obciążenie referencyjne; porównanie uwzględnia zmianę najkrótszego
+z tych czasów w całym przebiegu. Mimo to punkt odniesienia ma sens tylko dla tej samej
+maszyny; po zmianie sprzętu należy go odświeżyć opcją --update-baseline.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.schools import build_school
+from src.genetic.genetic_construction import DSaturInitializer
+from src.genetic.genetic_generator import ScheduleGenerator
+
+DEFAULT_SIZES = (1, 5, 10, 20, 40)
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+DEFAULT_REPEAT = 10
+DEFAULT_THRESHOLD = 0.5
+
+# Liczba wywołań operacji w jednej próbce
+CALLS = {
+    'random_lesson_slot': 1000,
+    'dsatur_individual': 5,
+    'convert_to_schedule': 20,
+    'evaluate_schedule': 20,
+    'crossover': 20,
+    'mutation': 20,
+    'generation': 1
+}
+
+
+def machine_info() -> Dict:
+    """Informacje o maszynie i wersjach bibliotek zapisywane razem z wynikami"""
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__
+    }
+
+
+def time_calls(operation: Callable[[int], None], calls: int, seed: Optional[int] = None) -> float:
+    """
+    Mierzy czas jednego wywołania operacji (jedna próbka).
+
+    Args:
+        operation: Funkcja przyjmująca numer wywołania (dane przygotowane są wcześniej)
+        calls: Liczba wywołań w próbce
+        seed: Ziarno generatorów liczb losowych ustawiane przed próbką — operacje losowe wykonują
+            wtedy w każdej próbce tę samą pracę, a rozrzut czasów to tylko szum maszyny
+
+    Returns:
+        Czas jednego wywołania w sekundach
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    # Jak timeit — odśmiecanie w trakcie pomiaru czyni wyniki zależnymi od kolejności rozmiarów
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for call in range(calls):
+            operation(call)
+        return (time.perf_counter() - start) / calls
+    finally:
+        gc.enable()
+
+
+def sampler(operation: Callable, calls: int, seed: Optional[int] = None,
+            prepare: Optional[Callable[[int], List]] = None) -> Callable[[], float]:
+    """
+    Tworzy funkcję zwracającą kolejną próbkę czasu operacji.
+
+    Args:
+        operation: Funkcja przyjmująca numer wywołania albo, gdy podano prepare, przygotowany argument
+        calls: Liczba wywołań w próbce
+        seed: Ziarno ustawiane przed każdą próbką (po przygotowaniu danych)
+        prepare: Funkcja zwracająca listę argumentów dla podanej liczby wywołań (poza pomiarem czasu)
+    """
+    def sample() -> float:
+        if prepare is None:
+            return time_calls(operation, calls, seed)
+        inputs = prepare(calls)
+        return time_calls(lambda call: operation(inputs[call]), calls, seed)
+
+    return sample
+
+
+def summarize(samples: List[float], calls: int) -> Dict:
+    """Mediana i minimum czasu jednego wywołania (w sekundach) z próbek operacji"""
+    return {'median': statistics.median(samples), 'min': min(samples), 'calls': calls, 'repeat': len(samples)}
+
+
+def calibration_sampler() -> Callable[[], float]:
+    """
+    Próbki czasu stałego obciążenia referencyjnego (Python + numpy) w sekundach.
+    Wyniki dzielone są przez ten czas, co kompensuje różnice szybkości maszyny między przebiegami.
+    """
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(20000)]
+    matrix = np.random.default_rng(0).random((200, 200))
+
+    def workload(call):
+        sorted(values)
+        {index: value for index, value in enumerate(values[:5000])}
+        np.argsort(matrix, axis=1)
+
+    return sampler(workload, 5)
+
+
+def school_samplers(class_count: int, population_size: int, workdir: str) -> Dict[str, Callable[[], float]]:
+    """Przygotowuje szkołę o podanej liczbie klas i zwraca funkcje próbkujące każdą operację"""
+    random.seed(class_count)
+    np.random.seed(class_count)
+
+    school = build_school(class_count)
+    generator = ScheduleGenerator(school, {
+        'iterations': 1,
+        'population_size': population_size,
+        'mutation_rate': 0.2,
+        'crossover_rate': 0.8,
+        'initializer': 'random',
+        'best_solution_path': os.path.join(workdir, f'best_{class_count}.json')
+    })
+    toolbox, operators, evaluator = generator.toolbox, generator.operators, generator.evaluator
+    manager = generator.population_manager
+    manager.set_params(generator.params)
+
+    count = max(CALLS.values())
+    individuals = [toolbox.individual() for _ in range(count)]
+    samplers = {}
+
+    samplers['random_lesson_slot'] = sampler(
+        lambda call: operators.random_lesson_slot(), CALLS['random_lesson_slot'], class_count
+    )
+    initializer = DSaturInitializer(school)
+    samplers['dsatur_individual'] = sampler(
+        lambda call: initializer.build(), CALLS['dsatur_individual'], class_count
+    )
+    samplers['convert_to_schedule'] = sampler(
+        lambda call: operators.convert_to_schedule(individuals[call]), CALLS['convert_to_schedule'],
+        class_count
+    )
+
+    # Ocena bez trafień w cache — każda próbka zaczyna od pustego cache i świeżych kopii
+    def prepare_evaluation(calls):
+        evaluator.fitness_cache.clear()
+        return [toolbox.clone(individuals[call]) for call in range(calls)]
+
+    samplers['evaluate_schedule'] = sampler(
+        evaluator.evaluate_schedule, CALLS['evaluate_schedule'], class_count, prepare_evaluation
+    )
+
+    # Operatory modyfikują osobniki, więc każda próbka dostaje nowe kopie
+    def prepare_pairs(calls):
+        return [(toolbox.clone(individuals[call]), toolbox.clone(individuals[-call - 1])) for call in range(calls)]
+
+    samplers['crossover'] = sampler(
+        lambda pair: operators.crossover(*pair), CALLS['crossover'], class_count, prepare_pairs
+    )
+    samplers['mutation'] = sampler(
+        lambda pair: operators.mutation(pair[0]), CALLS['mutation'], class_count, prepare_pairs
+    )
+
+    # Każda próbka ewoluuje tę samą populację początkową z tymi samymi współczynnikami adaptacyjnymi
+    population = manager.initialize_population(toolbox, population_size)
+    initial_rates = copy.deepcopy(operators.adaptive_rates)
+
+    def prepare_population(calls):
+        operators.adaptive_rates = copy.deepcopy(initial_rates)
+        evaluator.fitness_cache.clear()
+        return [[toolbox.clone(individual) for individual in population] for _ in range(calls)]
+
+    samplers['generation'] = sampler(
+        lambda generation: manager.evolve_generation(generation, toolbox, operators), CALLS['generation'],
+        class_count, prepare_population
+    )
+
+    return samplers
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Porównuje wyniki z punktem odniesienia.
+
+    Operacja jest regresją, gdy ponad próg wzrosło zarówno minimum, jak i mediana czasu
+    (po uwzględnieniu zmiany szybkości maszyny) — chwilowe obciążenie zwykle podbija tylko jedno z nich.
+
+    Returns:
+        Lista opisów regresji (pusta, jeśli żadna operacja nie zwolniła ponad próg)
+    """
+    # Stosunek szybkości maszyny teraz i przy zapisie punktu odniesienia
+    speed = 1.0
+    current, reference_speed = results.get('calibration'), baseline.get('calibration')
+    if current and reference_speed:
+        speed = current / reference_speed
+
+    regressions = []
+    for size, operations in results['results'].items():
+        for name, timing in operations.items():
+            reference = baseline.get('results', {}).get(size, {}).get(name)
+            if reference is None:
+                continue
+            ratios = {
+                statistic: timing[statistic] / (reference[statistic] * speed) if reference[statistic] > 0 else 1.0
+                for statistic in ('min', 'median')
+            }
+            line = (f"{size:>3} classes  {name:<20} min {timing['min'] * 1e3:10.3f} ms "
+                    f"({ratios['min']:5.2f}x)  median {timing['median'] * 1e3:10.3f} ms "
+                    f"({ratios['median']:5.2f}x baseline)")
+            print(line)
+            if min(ratios.values()) > 1 + threshold:
+                regressions.append(line)
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Tworzy parser argumentów wiersza poleceń"""
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description="Schedule generator benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Numbers of class groups to benchmark")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help="Rounds of measurements (samples per operation)")
+    parser.add_argument('--population-size', type=int, default=50, help="Population size for the full generation")
+    parser.add_argument('--output', help="Write results JSON to this file")
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline results JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown relative to the baseline (0.5 = 50%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Store results as the new baseline")
+    parser.add_argument('--verbose', action='store_true', help="Keep INFO/DEBUG logging enabled")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia benchmarków; zwraca 1 przy regresji"""
+    args = build_parser().parse_args(argv)
+
+    if not args.verbose:
+        # Logi na konsolę zniekształcają pomiary
+        logging.disable(logging.INFO)
+
+    results = {
+        'machine': machine_info(),
+        'timestamp': datetime.now().isoformat(),
+        'settings': {'repeat': args.repeat, 'population_size': args.population_size},
+        'calibration': None,
+        'results': {}
+    }
+
+    calibrate = calibration_sampler()
+    calibrations = []
+    samples = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        samplers = {}
+        for size in args.sizes:
+            print(f"Preparing school with {size} classes...", file=sys.stderr)
+            samplers[size] = school_samplers(size, args.population_size, workdir)
+            samples[size] = {name: [] for name in samplers[size]}
+
+        # Powtórzenia biegną rundami przez wszystkie rozmiary i operacje — spowolnienie maszyny trwające
+        # kilka sekund psuje wtedy jedną próbkę wielu operacji, a nie wszystkie próbki jednej operacji
+        for round_index in range(args.repeat):
+            print(f"Round {round_index + 1}/{args.repeat}...", file=sys.stderr)
+            calibrations.append(calibrate())
+            for size, size_samplers in samplers.items():
+                for name, sample in size_samplers.items():
+                    samples[size][name].append(sample())
+        calibrations.append(calibrate())
+
+    results['results'] = {
+        str(size): {name: summarize(values, CALLS[name]) for name, values in operations.items()}
+        for size, operations in samples.items()
+    }
+    # Minimum ze wszystkich rund jest stabilniejsze niż pojedynczy pomiar —
+    # na współdzielonej maszynie pojedyncze pomiary różnią się o kilkadziesiąt procent
+    results['calibration'] = min(calibrations)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path} - run with --update-baseline first")
+        print(json.dumps(results, indent=2))
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+    if baseline.get('machine') != results['machine']:
+        print("Warning: baseline was recorded on a different machine", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
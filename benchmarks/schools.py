@@ -0,0 +1,18 @@
+# benchmarks/schools.py
+
+"""
+Szkoły o rosnącej liczbie klas dla benchmarków.
+
+Domyślna szkoła ma po jednym nauczycielu każdego przedmiotu i osiem sal, co przy
+kilkudziesięciu klasach czyni problem nierozwiązywalnym — benchmarki używają więc
+syntetycznych szkół (src.utils.school_generator), w których pule nauczycieli i sal
+rosną z liczbą klas. Ziarnem jest liczba klas, więc szkoła danego rozmiaru jest zawsze ta sama.
+"""
+
+from src.models.school import School
+from src.utils.school_generator import generate_school
+
+
+def build_school(class_count: int) -> School:
+    """Syntetyczna szkoła z class_count klasami, dwoma nauczycielami i salą na klasę"""
+    return generate_school(seed=class_count, class_count=class_count)
@@ -0,0 +1,199 @@
+# src/cli.py
+
+"""
+Wsadowe uruchamianie generatora z wiersza poleceń (bez GUI).
+
+Przykład:
+    python -m src.cli szkola_a.json szkola_b.json --iterations 500 --jobs 2
+
+Konfiguracją szkoły jest plik .json w formacie SchoolInputFrame.get_configuration()
+(klucze 'class_counts' i 'profiles', opcjonalnie listy 'subjects', 'teachers',
+'classrooms') albo katalog z danymi CSV/JSONL (patrz SchoolRepository). Plan trafia
+do katalogu wyjściowego przez ScheduleRepository pod nazwą konfiguracji, a na standardowe
+wyjście wypisywana jest jedna linia JSON na konfigurację (statystyki GenerationStats
+albo, przy --engine milp, statystyki MILPSolver). Przy --engine annealing i --engine tabu plan
+układa ScheduleGenerator z symulowanym wyżarzaniem lub przeszukiwaniem tabu (parametr 'optimizer').
+Moduł nie importuje customtkinter, sv_ttk ani matplotlib.
+"""
+
+import argparse
+import json
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.genetic.genetic_generator import ScheduleGenerator
+from src.repository.schedule_repository import ScheduleRepository
+from src.repository.school_repository import SchoolRepository
+from src.solvers.milp_solver import MILPSolver
+from src.utils.logger import GPLLogger
+
+# Domyślne parametry (jak w GUI)
+DEFAULT_PARAMS = {
+    'iterations': 2000,
+    'population_size': 200,
+    'mutation_rate': 0.2,
+    'crossover_rate': 0.8
+}
+
+# Opcje wiersza poleceń nadpisujące parametry algorytmu
+PARAM_OPTIONS = (
+    'iterations', 'population_size', 'mutation_rate', 'crossover_rate', 'workers', 'islands', 'phase_timing',
+    'seed_solver', 'solver_time_limit', 'initializer', 'local_search', 'local_search_top_k',
+    'local_search_evaluations', 'local_search_ms', 'annealing_time_limit', 'tabu_time_limit', 'tabu_intensification'
+)
+
+# Metody układania planu (--engine)
+ENGINES = ('genetic', 'annealing', 'tabu', 'milp')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Tworzy parser argumentów wiersza poleceń"""
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description="Generates school schedules without the GUI"
+    )
+    parser.add_argument('configs', nargs='+', help="School configuration JSON files or dataset directories")
+    parser.add_argument('--params', help="JSON file with genetic algorithm parameters")
+    parser.add_argument('--iterations', type=int, help="Number of generations")
+    parser.add_argument('--population-size', type=int, help="Population size")
+    parser.add_argument('--mutation-rate', type=float, help="Mutation rate")
+    parser.add_argument('--crossover-rate', type=float, help="Crossover rate")
+    parser.add_argument('--workers', type=int,
+                        help="Evaluation processes per configuration; above 1 disables delta evaluation")
+    parser.add_argument('--islands', type=int, help="Number of islands (island model)")
+    parser.add_argument('--initializer', choices=('dsatur', 'random'),
+                        help="Initial population: DSATUR construction (default) or random lesson slots")
+    parser.add_argument('--local-search', action='store_true', default=None,
+                        help="Improve the best offspring of every generation with local search")
+    parser.add_argument('--local-search-top-k', type=int, help="Individuals improved by local search per generation")
+    parser.add_argument('--local-search-evaluations', type=int,
+                        help="Local search budget in evaluations per generation")
+    parser.add_argument('--local-search-ms', type=float, help="Local search time limit in milliseconds per generation")
+    parser.add_argument('--phase-timing', action='store_true', default=None,
+                        help="Record per-phase generation timings in the statistics")
+    parser.add_argument('--engine', choices=ENGINES, default='genetic',
+                        help="Scheduling engine: genetic algorithm, simulated annealing, tabu search "
+                             "or exact MILP solver")
+    parser.add_argument('--annealing-time-limit', type=float, help="Time budget of simulated annealing in seconds")
+    parser.add_argument('--tabu-time-limit', type=float, help="Time budget of tabu search in seconds")
+    parser.add_argument('--tabu-intensification', type=float,
+                        help="Improve the final schedule with tabu search for this many seconds")
+    parser.add_argument('--seed-solver', choices=('milp',), help="Seed the GA population with a solver's schedule")
+    parser.add_argument('--solver-time-limit', type=float, help="Time limit of the MILP solver in seconds")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="Configurations generated in parallel")
+    parser.add_argument('--output-dir', default='data', help="Directory for generated schedules")
+    parser.add_argument('--checkpoint-dir', help="Directory for evolution checkpoints")
+    parser.add_argument('--resume', action='store_true', help="Resume from existing checkpoints")
+    parser.add_argument('--seed', type=int, help="Random seed (configuration N uses seed + N)")
+    return parser
+
+
+def build_params(args: argparse.Namespace) -> Dict:
+    """Łączy parametry domyślne, plik --params i opcje wiersza poleceń"""
+    params = dict(DEFAULT_PARAMS)
+    if args.params:
+        with open(args.params, 'r', encoding='utf-8') as f:
+            params.update(json.load(f))
+
+    for option in PARAM_OPTIONS:
+        value = getattr(args, option)
+        if value is not None:
+            params[option] = value
+
+    return params
+
+
+def build_tasks(args: argparse.Namespace, params: Dict) -> List[Dict]:
+    """Tworzy zadanie dla każdego pliku konfiguracji"""
+    tasks = []
+    for index, config in enumerate(args.configs):
+        name = Path(config).stem
+        task_params = dict(params)
+        task_params['best_solution_path'] = str(Path(args.output_dir) / f"{name}_best_solution.json")
+        if args.engine in ('annealing', 'tabu'):
+            task_params['optimizer'] = args.engine
+
+        resume_from = None
+        if args.checkpoint_dir:
+            checkpoint_path = Path(args.checkpoint_dir) / f"{name}.npz"
+            task_params['checkpoint_path'] = str(checkpoint_path)
+            if args.resume and checkpoint_path.exists():
+                resume_from = str(checkpoint_path)
+
+        tasks.append({
+            'config': config,
+            'name': name,
+            'engine': args.engine,
+            'params': task_params,
+            'output_dir': args.output_dir,
+            'resume_from': resume_from,
+            'seed': args.seed + index if args.seed is not None else None
+        })
+    return tasks
+
+
+def run_task(task: Dict) -> Dict:
+    """
+    Generuje plan dla jednej konfiguracji (także w procesie roboczym puli).
+
+    Returns:
+        Słownik z nazwą konfiguracji, statusem i statystykami lub komunikatem błędu
+    """
+    logger = GPLLogger(__name__)
+    result = {'config': task['config'], 'schedule': task['name']}
+
+    try:
+        if task['seed'] is not None:
+            random.seed(task['seed'])
+            np.random.seed(task['seed'] % 2 ** 32)
+
+        school = SchoolRepository().load_school(task['config'])
+
+        if task['engine'] == 'milp':
+            solver = MILPSolver(school, task['params'])
+            schedule = solver.solve()
+            stats = solver.stats
+        else:
+            generator = ScheduleGenerator(school, task['params'])
+            schedule, _, generation_stats = generator.generate(resume_from=task['resume_from'])
+            stats = generation_stats.to_dict()
+
+        ScheduleRepository(task['output_dir']).save_schedule(schedule, task['name'])
+
+        result.update(status='ok', stats=stats)
+
+    except Exception as e:
+        logger.error(f"Error generating schedule for {task['config']}: {str(e)}")
+        result.update(status='error', error=str(e))
+
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punkt wejścia CLI; zwraca kod wyjścia (1, jeśli choć jedna konfiguracja się nie powiodła)"""
+    args = build_parser().parse_args(argv)
+    tasks = build_tasks(args, build_params(args))
+
+    results = []
+    if args.jobs > 1 and len(tasks) > 1:
+        # Wyniki wypisywane są w kolejności konfiguracji, gdy tylko będą gotowe
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(tasks))) as executor:
+            for result in executor.map(run_task, tasks):
+                results.append(result)
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+    else:
+        for task in tasks:
+            result = run_task(task)
+            results.append(result)
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
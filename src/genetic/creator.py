@@ -1,5 +1,7 @@
 # src/genetic/creator.py
 from deap import base, creator, tools
+
+from src.genetic.genetic_encoding import GeneArray
 from src.utils.logger import GPLLogger
 
 logger = GPLLogger(__name__)
@@ -27,9 +29,9 @@ def create_base_types() -> None:
         if hasattr(creator, 'Individual'):
             delattr(creator, 'Individual')
 
-        # Tworzymy typy
+        # Tworzymy typy — osobnik to tablica genów o stałej szerokości
         creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
+        creator.create("Individual", GeneArray, fitness=creator.FitnessMax)
 
         # Zapisz referencję dla bezpieczeństwa
         _individual_class = creator.Individual
@@ -0,0 +1,283 @@
+# src/genetic/genetic_annealing.py
+
+"""
+Symulowane wyżarzanie — optymalizator jednego rozwiązania, alternatywa dla PopulationManager.
+
+Zamiast populacji klonowanych osobników przechowywany jest jeden plan z EvaluationState
+i kopia najlepszego planu. Sąsiedztwo (NeighbourhoodMoves) i ocena przyrostowa
+(DeltaEvaluator) są wspólne z przeszukiwaniem lokalnym, a ruch gorszy jest cofany.
+
+Minimalizowana energia to nieobcięta suma kar (DeltaEvaluator.penalty) minus wynik 0-100,
+a najlepszy plan wybierany jest jak w przeszukiwaniu lokalnym: wynik, przy remisie kary.
+Chłodzenie jest adaptacyjne: po każdym kroku ('annealing_step_moves' ruchów) temperatura
+rośnie lub maleje tak, aby odsetek przyjętych ruchów podążał za docelowym, malejącym
+wykładniczo w czasie od 'annealing_initial_acceptance' do FINAL_ACCEPTANCE. Gdy najlepszy plan
+nie poprawia się przez 'annealing_reheat_steps' kroków, wyżarzanie wraca do najlepszego planu
+i podgrzewa temperaturę. Budżetem jest czas ('annealing_time_limit', w sekundach).
+
+Postęp raportowany jest jak w PopulationManager: krok to jedna „generacja”, a wpis historii
+zawiera dodatkowo temperaturę, odsetek przyjętych ruchów i liczbę ruchów.
+"""
+
+import math
+import random
+import time
+from datetime import datetime
+from typing import Dict, Generator, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from src.genetic.creator import get_individual_class
+from src.genetic.genetic_delta import DeltaEvaluator, EvaluationState
+from src.genetic.genetic_local_search import EPSILON, NeighbourhoodMoves
+from src.genetic.genetic_utils import EvolutionResult, GenerationResult, GenerationStats, run_to_completion
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+if TYPE_CHECKING:
+    from src.genetic.genetic_evaluator import GeneticEvaluator
+
+# Docelowy odsetek przyjętych ruchów na końcu budżetu czasu
+FINAL_ACCEPTANCE = 0.01
+
+# Mnożnik temperatury przy korekcie po każdym kroku
+COOLING_FACTOR = 0.9
+
+# Mnożnik temperatury przy podgrzaniu
+REHEAT_FACTOR = 4.0
+
+# Liczba próbnych ruchów przy szacowaniu temperatury początkowej
+TEMPERATURE_SAMPLES = 200
+
+# Wynik, po którego osiągnięciu wyżarzanie kończy się wcześniej (jak w _should_stop)
+TARGET_FITNESS = 95
+
+
+class SimulatedAnnealing:
+    """Optymalizuje jeden plan symulowanym wyżarzaniem z adaptacyjnym chłodzeniem i podgrzewaniem"""
+
+    def __init__(self, school: School, evaluator: 'GeneticEvaluator', params: Dict):
+        """
+        Args:
+            school: Szkoła, dla której generujemy plan
+            evaluator: Ewaluator algorytmu (wymaga backendu 'numpy')
+            params: Parametry 'annealing_time_limit', 'annealing_step_moves',
+                'annealing_initial_acceptance', 'annealing_reheat_steps'
+
+        Raises:
+            ValueError: Gdy ewaluator nie ma kernela NumPy
+        """
+        if evaluator.kernel is None:
+            raise ValueError("Simulated annealing requires the numpy evaluator backend")
+
+        self.logger = GPLLogger(__name__)
+        self.moves = NeighbourhoodMoves(school)
+        self.delta = evaluator.delta if evaluator.delta is not None else DeltaEvaluator(evaluator.kernel)
+
+        self.time_limit = float(params.get('annealing_time_limit', 60))
+        self.step_moves = max(1, int(params.get('annealing_step_moves', 1000)))
+        self.initial_acceptance = min(0.99, max(FINAL_ACCEPTANCE, float(
+            params.get('annealing_initial_acceptance', 0.5)
+        )))
+        self.reheat_steps = max(1, int(params.get('annealing_reheat_steps', 20)))
+
+        # Najlepszy dotąd plan (kopia genów) i jego wynik
+        self.best_genes: Optional[np.ndarray] = None
+        self.best_fitness = 0.0
+
+    def best(self):
+        """Kopia najlepszego dotąd osobnika (lub None przed rozpoczęciem wyżarzania)"""
+        if self.best_genes is None:
+            return None
+        individual = get_individual_class()(self.best_genes.copy())
+        individual.fitness.values = (self.best_fitness,)
+        return individual
+
+    def anneal(self, individual: np.ndarray, progress_callback=None) -> EvolutionResult:
+        """Przeprowadza wyżarzanie do końca (patrz anneal_iter)"""
+        return run_to_completion(self.anneal_iter(individual, progress_callback))
+
+    def anneal_iter(self, individual: np.ndarray,
+                    progress_callback=None) -> Generator[GenerationResult, None, EvolutionResult]:
+        """
+        Wyżarza plan, zwracając wynik każdego kroku.
+
+        Args:
+            individual: Plan początkowy (modyfikowany w miejscu — staje się bieżącym planem)
+            progress_callback: Funkcja do raportowania postępu
+
+        Yields:
+            GenerationResult po każdym kroku ('generation' to numer kroku)
+
+        Returns:
+            EvolutionResult z najlepszym planem (wartość StopIteration)
+        """
+        try:
+            start_time = time.time()
+            genes = np.asarray(individual)
+            score, state = self.delta.fitness(genes, getattr(individual, 'eval_state', None))
+            individual.eval_state = state
+            penalty = self.delta.penalty(state)
+            energy = penalty - score
+
+            best_penalty = penalty
+            self.best_genes, self.best_fitness = genes.copy(), score
+
+            temperature = self._initial_temperature(individual, state, energy)
+            state = individual.eval_state
+            self.logger.info(
+                "Annealing started: fitness=%.2f, temperature=%.3f, time limit=%.0fs",
+                score, temperature, self.time_limit
+            )
+
+            progress_history: List[Dict] = []
+            step_times = []
+            total_moves = 0
+            reheats = 0
+            stagnation = 0
+            step = 0
+
+            while True:
+                step_start = time.time()
+                accepted = 0
+                improved = False
+
+                moves = 0
+                for _ in range(self.step_moves):
+                    move = self.moves.propose(genes, state)
+                    if move is None:
+                        break
+                    moves += 1
+                    previous, undo = self.moves.evaluate(self.delta, individual, genes, move)
+                    new_score, penalty = self.delta.score(state), self.delta.penalty(state)
+                    difference = penalty - new_score - energy
+
+                    if difference <= 0 or random.random() < math.exp(-difference / temperature):
+                        accepted += 1
+                        score, energy = new_score, energy + difference
+                        best_score = self.best_fitness
+                        if score > best_score + EPSILON or \
+                                (score > best_score - EPSILON and penalty < best_penalty - EPSILON):
+                            self.best_genes, self.best_fitness, best_penalty = genes.copy(), score, penalty
+                            improved = True
+                    else:
+                        self.moves.reject(self.delta, individual, genes, previous, undo)
+                total_moves += moves
+
+                # Adaptacyjne chłodzenie — odsetek przyjętych ruchów podąża za docelowym
+                elapsed = time.time() - start_time
+                fraction = min(1.0, elapsed / self.time_limit) if self.time_limit > 0 else 1.0
+                target = self.initial_acceptance * (FINAL_ACCEPTANCE / self.initial_acceptance) ** fraction
+                acceptance = accepted / moves if moves else 0.0
+                temperature *= COOLING_FACTOR if acceptance > target else 1 / COOLING_FACTOR
+
+                # Podgrzanie po stagnacji — powrót do najlepszego planu
+                stagnation = 0 if improved else stagnation + 1
+                if stagnation >= self.reheat_steps:
+                    genes[:] = self.best_genes
+                    state = self.delta.build(genes)
+                    score = self.delta.score(state)
+                    individual.eval_state = state
+                    energy = self.delta.penalty(state) - score
+                    temperature *= REHEAT_FACTOR
+                    reheats += 1
+                    stagnation = 0
+                    self.logger.debug("Annealing reheated at step %d: temperature=%.3f", step, temperature)
+
+                step_time = time.time() - step_start
+                step_times.append(step_time)
+                progress = self._record_progress(
+                    step, score, step_time, fraction, temperature, acceptance, total_moves, progress_callback
+                )
+                progress_history.append(progress)
+
+                yield GenerationResult(
+                    generation=step,
+                    best_fitness=self.best_fitness,
+                    avg_fitness=score,
+                    time=step_time,
+                    stats={'avg': score, 'std': 0.0, 'min': score, 'max': self.best_fitness},
+                    progress=progress
+                )
+
+                step += 1
+                if fraction >= 1.0 or self.best_fitness >= TARGET_FITNESS:
+                    break
+
+            total_time = time.time() - start_time
+            self.logger.info(
+                "Annealing finished: fitness=%.2f, moves=%d (%.0f/s), reheats=%d",
+                self.best_fitness, total_moves, total_moves / max(total_time, EPSILON), reheats
+            )
+
+            individual.zhash = None
+            stats = GenerationStats(
+                total_time=total_time,
+                avg_generation_time=np.mean(step_times),
+                min_generation_time=min(step_times),
+                max_generation_time=max(step_times),
+                total_generations=len(step_times),
+                best_fitness=self.best_fitness,
+                avg_fitness=score,
+                timestamp=datetime.now()
+            )
+
+            return EvolutionResult(
+                best_individual=self.best(),
+                best_fitness=self.best_fitness,
+                progress_history=progress_history,
+                stats=stats
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error during simulated annealing: {str(e)}")
+            raise
+
+    def _initial_temperature(self, individual: np.ndarray, state: EvaluationState, energy: float) -> float:
+        """
+        Temperatura, przy której średni ruch pogarszający jest przyjmowany z prawdopodobieństwem
+        'annealing_initial_acceptance' (szacowana na próbnych, cofanych ruchach)
+        """
+        genes = np.asarray(individual)
+        worsening = []
+        for _ in range(TEMPERATURE_SAMPLES):
+            move = self.moves.propose(genes, state)
+            if move is None:
+                break
+            previous, undo = self.moves.evaluate(self.delta, individual, genes, move)
+            difference = self.delta.penalty(state) - self.delta.score(state) - energy
+            if difference > EPSILON:
+                worsening.append(difference)
+            self.moves.reject(self.delta, individual, genes, previous, undo)
+
+        if not worsening:
+            return 1.0
+        return float(np.mean(worsening)) / -math.log(self.initial_acceptance)
+
+    def _record_progress(self, step: int, score: float, step_time: float, fraction: float, temperature: float,
+                         acceptance: float, moves: int, callback=None) -> Dict:
+        """Wpis historii postępu w formacie PopulationManager._record_progress"""
+        progress = {
+            'generation': step,
+            'best_fitness': self.best_fitness,
+            'avg_fitness': score,
+            'std_fitness': 0.0,
+            'min_fitness': score,
+            'generation_time': step_time,
+            'progress_percent': fraction * 100,
+            'temperature': temperature,
+            'acceptance': acceptance,
+            'moves': moves
+        }
+
+        if callback:
+            callback(progress)
+
+        self.logger.info(
+            f"Step {step}: Best={self.best_fitness:.2f}, "
+            f"Current={score:.2f}, "
+            f"T={temperature:.3f}, "
+            f"Time={step_time:.4f}s"
+        )
+
+        return progress
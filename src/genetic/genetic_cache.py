@@ -0,0 +1,79 @@
+# src/genetic/genetic_cache.py
+
+"""
+Ograniczony cache wyników fitness z usuwaniem najdawniej używanych wpisów (LRU).
+
+Kluczem jest 64-bitowy hasz Zobrista osobnika (genetic_encoding.individual_hash),
+więc rozmiar wpisu jest stały i limit pamięci można przeliczyć na limit liczby wpisów.
+"""
+
+import sys
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+# Szacowany narzut OrderedDict na wpis (slot tablicy haszującej + węzeł listy kolejności)
+_ORDERED_DICT_ENTRY_BYTES = 104
+
+# Szacowany rozmiar wpisu: 64-bitowy klucz + krotka z jedną liczbą + narzut słownika
+ENTRY_BYTES = (
+    sys.getsizeof((1 << 64) - 1) + sys.getsizeof((0.0,)) + sys.getsizeof(0.0) + _ORDERED_DICT_ENTRY_BYTES
+)
+
+
+class FitnessCache:
+    """Cache LRU o budżecie pamięci podanym w megabajtach"""
+
+    def __init__(self, max_memory_mb: float = 8.0):
+        self.max_entries = max(1, int(max_memory_mb * 1024 * 1024 // ENTRY_BYTES))
+        self._entries: OrderedDict = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, ...]]:
+        """Zwraca wynik dla klucza (oznaczając go jako ostatnio użyty) albo None"""
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: Tuple[float, ...]):
+        """Zapisuje wynik; po przekroczeniu limitu usuwa najdawniej używany wpis"""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Czyści cache (liczniki pozostają)"""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Odsetek trafień w procentach"""
+        total = self.hits + self.misses
+        return self.hits / total * 100 if total > 0 else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Liczniki cache jako słownik"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hit_rate': self.hit_rate
+        }
@@ -0,0 +1,181 @@
+# src/genetic/genetic_checkpoint.py
+
+"""
+Punkty kontrolne długich przebiegów ewolucji.
+
+Checkpoint to pojedynczy skompresowany plik .npz: geny populacji i hall of fame trafiają
+do niego jako tablice int16 (osobniki × geny × pola), wartości fitness jako float64,
+a pozostały stan (generacja, adaptive_rates, stan generatorów liczb losowych,
+historia postępu) jako metadane JSON. Plik zapisywany jest atomowo — przerwanie
+zapisu nie niszczy poprzedniego checkpointu.
+"""
+
+import json
+import os
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+
+from src.genetic.creator import get_individual_class
+
+CHECKPOINT_VERSION = 1
+
+
+@dataclass
+class Checkpoint:
+    """Stan ewolucji po zakończonej generacji"""
+    generation: int  # Numer następnej generacji do wykonania
+    population_genes: np.ndarray
+    population_fitness: np.ndarray
+    hall_of_fame_genes: np.ndarray
+    hall_of_fame_fitness: np.ndarray
+    adaptive_rates: Dict[str, Dict[str, float]]
+    random_state: Tuple
+    numpy_random_state: Tuple
+    progress_history: List[Dict] = field(default_factory=list)
+    elapsed_time: float = 0.0
+
+    @classmethod
+    def capture(cls, generation: int, population: List, hall_of_fame, operators,
+                progress_history: List[Dict], elapsed_time: float) -> 'Checkpoint':
+        """Zapamiętuje bieżący stan ewolucji (wraz ze stanem generatorów liczb losowych)"""
+        return cls(
+            generation=generation,
+            population_genes=_stack_genes(population),
+            population_fitness=_stack_fitness(population),
+            hall_of_fame_genes=_stack_genes(hall_of_fame),
+            hall_of_fame_fitness=_stack_fitness(hall_of_fame),
+            adaptive_rates=json.loads(json.dumps(operators.adaptive_rates)),
+            random_state=random.getstate(),
+            numpy_random_state=np.random.get_state(),
+            progress_history=list(progress_history),
+            elapsed_time=elapsed_time
+        )
+
+    def restore_population(self) -> List:
+        """Odtwarza populację z przypisanymi wartościami fitness"""
+        return _restore_individuals(self.population_genes, self.population_fitness)
+
+    def restore(self, hall_of_fame, operators):
+        """Odtwarza hall of fame, adaptive_rates i stan generatorów liczb losowych"""
+        # Wstawianie od najsłabszego zachowuje kolejność osobników o równym fitness
+        hall_of_fame.clear()
+        for individual in reversed(_restore_individuals(self.hall_of_fame_genes, self.hall_of_fame_fitness)):
+            hall_of_fame.insert(individual)
+
+        operators.adaptive_rates = json.loads(json.dumps(self.adaptive_rates))
+
+        random.setstate(self.random_state)
+        np.random.set_state(self.numpy_random_state)
+
+
+def _stack_genes(individuals) -> np.ndarray:
+    """Łączy osobniki w jedną tablicę (osobniki × geny × pola)"""
+    if not len(individuals):
+        return np.empty((0, 0, 6), dtype=np.int16)
+    return np.stack([np.asarray(individual) for individual in individuals])
+
+
+def _stack_fitness(individuals) -> np.ndarray:
+    """Wartości fitness osobników jako tablica (osobniki × cele)"""
+    return np.array([individual.fitness.values for individual in individuals], dtype=np.float64).reshape(
+        len(individuals), -1
+    )
+
+
+def _restore_individuals(genes: np.ndarray, fitness: np.ndarray) -> List:
+    """Tworzy osobniki z tablicy genów i przypisuje im zapisane wartości fitness"""
+    individual_class = get_individual_class()
+    individuals = []
+    for row, values in zip(genes, fitness):
+        individual = individual_class(row)
+        individual.fitness.values = tuple(float(value) for value in values)
+        individuals.append(individual)
+    return individuals
+
+
+def save_checkpoint(path: Union[str, Path], checkpoint: Checkpoint):
+    """
+    Zapisuje checkpoint do pliku .npz (atomowo — przez plik tymczasowy).
+
+    Args:
+        path: Ścieżka pliku checkpointu
+        checkpoint: Stan ewolucji
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    bit_generator, keys, position, has_gauss, cached_gaussian = checkpoint.numpy_random_state
+    random_version, random_internal, random_gauss = checkpoint.random_state
+
+    metadata: Dict[str, Any] = {
+        'version': CHECKPOINT_VERSION,
+        'generation': checkpoint.generation,
+        'adaptive_rates': checkpoint.adaptive_rates,
+        'random_state': {'version': random_version, 'gauss_next': random_gauss},
+        'numpy_random_state': {
+            'bit_generator': bit_generator,
+            'position': int(position),
+            'has_gauss': int(has_gauss),
+            'cached_gaussian': float(cached_gaussian)
+        },
+        'progress_history': checkpoint.progress_history,
+        'elapsed_time': checkpoint.elapsed_time
+    }
+
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as file:
+        np.savez_compressed(
+            file,
+            population_genes=checkpoint.population_genes,
+            population_fitness=checkpoint.population_fitness,
+            hall_of_fame_genes=checkpoint.hall_of_fame_genes,
+            hall_of_fame_fitness=checkpoint.hall_of_fame_fitness,
+            random_internal=np.asarray(random_internal, dtype=np.uint64),
+            numpy_random_keys=np.asarray(keys, dtype=np.uint32),
+            metadata=np.array(json.dumps(metadata, default=float))
+        )
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Checkpoint:
+    """
+    Wczytuje checkpoint zapisany przez save_checkpoint.
+
+    Raises:
+        FileNotFoundError: Gdy plik nie istnieje
+        ValueError: Gdy plik ma nieobsługiwaną wersję
+    """
+    with np.load(Path(path), allow_pickle=False) as data:
+        metadata = json.loads(str(data['metadata']))
+        if metadata.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {metadata.get('version')}")
+
+        random_meta = metadata['random_state']
+        numpy_meta = metadata['numpy_random_state']
+
+        return Checkpoint(
+            generation=int(metadata['generation']),
+            population_genes=data['population_genes'],
+            population_fitness=data['population_fitness'],
+            hall_of_fame_genes=data['hall_of_fame_genes'],
+            hall_of_fame_fitness=data['hall_of_fame_fitness'],
+            adaptive_rates=metadata['adaptive_rates'],
+            random_state=(
+                random_meta['version'],
+                tuple(int(value) for value in data['random_internal']),
+                random_meta['gauss_next']
+            ),
+            numpy_random_state=(
+                numpy_meta['bit_generator'],
+                data['numpy_random_keys'],
+                numpy_meta['position'],
+                numpy_meta['has_gauss'],
+                numpy_meta['cached_gaussian']
+            ),
+            progress_history=metadata['progress_history'],
+            elapsed_time=float(metadata['elapsed_time'])
+        )
@@ -0,0 +1,269 @@
+# src/genetic/genetic_construction.py
+
+"""
+Konstrukcyjna heurystyka DSATUR dla populacji początkowej.
+
+Planowanie lekcji to kolorowanie grafu konfliktów: wierzchołkami są godziny lekcji
+(klasa × przedmiot × liczba godzin), kolorami sloty (dzień, godzina), a krawędzie łączą
+lekcje tej samej klasy lub tego samego nauczyciela; sale są zasobem o ograniczonej
+liczbie w każdym slocie. Heurystyka przydziela każdej parze klasa-przedmiot jednego
+nauczyciela, a następnie zawsze planuje lekcję o największym stopniu nasycenia
+(najmniejszej liczbie dostępnych slotów), przy remisie — o największym stopniu
+w grafie (pozostałe lekcje tej klasy i nauczyciela), a dalej losowo.
+
+Zajętość klas, nauczycieli i sal przechowywana jest jako maski bitowe slotów,
+a nasycenie przeliczane tylko dla par, których dotyczyła ostatnia decyzja.
+Losowe rozstrzyganie remisów daje zróżnicowane, prawie dopuszczalne osobniki.
+"""
+
+import heapq
+import random
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.genetic.genetic_encoding import DAYS, HOURS_PER_DAY
+from src.models.school import School
+
+SLOTS = DAYS * HOURS_PER_DAY
+ALL_SLOTS = (1 << SLOTS) - 1
+
+# Maska slotów jednego dnia (dzień d to bity d * HOURS_PER_DAY ... d * HOURS_PER_DAY + 7)
+DAY_MASK = (1 << HOURS_PER_DAY) - 1
+
+
+class DSaturInitializer:
+    """Buduje osobniki z kompletem wymaganych lekcji heurystyką DSATUR"""
+
+    def __init__(self, school: School):
+        self.school = school
+
+        # Nauczyciele i zbiór sal każdego przedmiotu (zbiory sal numerowane)
+        self.subject_teachers: List[Tuple[int, ...]] = [
+            tuple(school.teacher_index[teacher.id] for teacher in school.subject_teachers[subject.name])
+            for subject in school.subject_list
+        ]
+        room_sets: Dict[frozenset, int] = {}
+        self.subject_room_set: List[int] = []
+        for subject in school.subject_list:
+            rooms = frozenset(school.classroom_index[room.id] for room in school.subject_rooms[subject.name])
+            self.subject_room_set.append(room_sets.setdefault(rooms, len(room_sets)))
+        self.room_sets: List[Tuple[int, ...]] = [tuple(sorted(rooms)) for rooms in room_sets]
+
+        # Zbiory zawierające daną salę — sale należące do mniejszej liczby zbiorów są wybierane
+        # najpierw, aby nie zajmować sal specjalnych lekcjami, które mogą odbyć się gdzie indziej
+        self.room_memberships: List[List[int]] = [[] for _ in school.classroom_list]
+        for set_id, rooms in enumerate(self.room_sets):
+            for room in rooms:
+                self.room_memberships[room].append(set_id)
+
+        # Pary klasa-przedmiot do zaplanowania: (indeks klasy, indeks przedmiotu, liczba godzin).
+        # Przedmioty bez nauczyciela lub sali są pomijane — ich lekcji nie da się poprawnie zapisać
+        self.requirements: List[Tuple[int, int, int]] = [
+            (class_idx, school.subject_index[subject.name], subject.hours_per_week)
+            for class_idx, class_group in enumerate(school.class_groups)
+            for subject in class_group.subjects
+            if subject.hours_per_week > 0 and school.subject_teachers[subject.name]
+            and school.subject_rooms[subject.name]
+        ]
+
+        self.max_hours_per_day = [teacher.max_hours_per_day for teacher in school.teacher_list]
+        self.max_hours_per_week = [teacher.max_hours_per_week for teacher in school.teacher_list]
+
+    def build(self) -> List[Tuple[int, ...]]:
+        """
+        Tworzy jeden plan.
+
+        Returns:
+            Lista genów (dzień, godzina, klasa, przedmiot, nauczyciel, sala) posortowana
+            według klasy, dnia i godziny. Lekcje, dla których zabrakło wolnego slotu,
+            trafiają do slotu wolnego dla klasy (z konfliktem nauczyciela lub sali)
+        """
+        groups = self._assign_teachers()
+        state = _ConstructionState(self, groups)
+
+        # Kolejka priorytetowa z leniwym unieważnianiem — aktualny klucz pary jest w state.keys
+        heap = [state.push_key(group) for group in range(len(groups))]
+        heapq.heapify(heap)
+
+        genes = []
+        while heap:
+            key = heapq.heappop(heap)
+            group = key[-1]
+            if state.remaining[group] == 0 or state.keys[group] != key:
+                continue
+
+            genes.append(state.place(group))
+            for neighbour in state.affected(group):
+                if state.remaining[neighbour]:
+                    heapq.heappush(heap, state.push_key(neighbour))
+
+        genes.sort(key=lambda gene: (gene[2], gene[0], gene[1]))
+        return genes
+
+    def _assign_teachers(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Przydziela nauczyciela każdej parze klasa-przedmiot (najmniej obciążonego względem
+        tygodniowego limitu, remisy losowo). Pary są przetwarzane od przedmiotów
+        z najmniejszą liczbą nauczycieli.
+
+        Returns:
+            Lista (indeks klasy, indeks przedmiotu, indeks nauczyciela, liczba godzin)
+        """
+        load = defaultdict(int)
+        order = list(self.requirements)
+        random.shuffle(order)
+        order.sort(key=lambda requirement: len(self.subject_teachers[requirement[1]]))
+
+        groups = []
+        for class_idx, subject_idx, hours in order:
+            teacher = min(
+                self.subject_teachers[subject_idx],
+                key=lambda t: ((load[t] + hours) / max(1, self.max_hours_per_week[t]), random.random())
+            )
+            load[teacher] += hours
+            groups.append((class_idx, subject_idx, teacher, hours))
+        return groups
+
+
+class _ConstructionState:
+    """Zajętość slotów i nasycenie par klasa-przedmiot podczas budowy jednego planu"""
+
+    def __init__(self, initializer: DSaturInitializer, groups: List[Tuple[int, int, int, int]]):
+        self.initializer = initializer
+        self.groups = groups
+        school = initializer.school
+
+        self.remaining = [hours for _, _, _, hours in groups]
+        self.keys: List[Optional[Tuple]] = [None] * len(groups)
+
+        # Maski zajętych slotów
+        self.class_busy = [0] * len(school.class_groups)
+        self.teacher_busy = [0] * len(school.teacher_list)
+        self.room_busy = [0] * len(school.classroom_list)
+        # Dni, w których nauczyciel osiągnął dzienny limit (jako maska slotów)
+        self.teacher_full_days = [0] * len(school.teacher_list)
+        self.teacher_day_hours = [[0] * DAYS for _ in school.teacher_list]
+
+        # Liczba wolnych sal zbioru w każdym slocie i maska slotów bez wolnej sali
+        self.set_free = [[len(rooms)] * SLOTS for rooms in initializer.room_sets]
+        self.set_full = [0] * len(initializer.room_sets)
+
+        # Liczba godzin przedmiotu klasy w każdym dniu i liczba lekcji klasy w dniu
+        self.subject_days = [[0] * DAYS for _ in groups]
+        self.class_days = [[0] * DAYS for _ in school.class_groups]
+
+        # Sąsiedztwo: pary tej samej klasy, tego samego nauczyciela i tego samego zbioru sal
+        self.class_groups = defaultdict(list)
+        self.teacher_groups = defaultdict(list)
+        self.set_groups = defaultdict(list)
+        self.class_remaining = defaultdict(int)
+        self.teacher_remaining = defaultdict(int)
+        for group, (class_idx, subject_idx, teacher, hours) in enumerate(groups):
+            self.class_groups[class_idx].append(group)
+            self.class_remaining[class_idx] += hours
+            self.teacher_groups[teacher].append(group)
+            self.teacher_remaining[teacher] += hours
+            self.set_groups[initializer.subject_room_set[subject_idx]].append(group)
+
+        # Zbiory sal, które w ostatnim kroku straciły ostatnią wolną salę
+        self._filled_sets: List[int] = []
+
+    def available(self, group: int) -> int:
+        """Maska slotów, w których można zaplanować kolejną lekcję pary"""
+        class_idx, subject_idx, teacher, _ = self.groups[group]
+        busy = (self.class_busy[class_idx] | self.teacher_busy[teacher] | self.teacher_full_days[teacher] |
+                self.set_full[self.initializer.subject_room_set[subject_idx]])
+        return ALL_SLOTS & ~busy
+
+    def push_key(self, group: int) -> Tuple:
+        """Klucz kolejki: nasycenie (malejąco), stopień (malejąco), losowy remis"""
+        class_idx, _, teacher, _ = self.groups[group]
+        saturation = SLOTS - self.available(group).bit_count()
+        degree = self.class_remaining[class_idx] + self.teacher_remaining[teacher]
+        key = (-saturation, -degree, random.random(), group)
+        self.keys[group] = key
+        return key
+
+    def place(self, group: int) -> Tuple[int, ...]:
+        """Planuje jedną lekcję pary i zwraca jej gen"""
+        class_idx, subject_idx, teacher, _ = self.groups[group]
+        initializer = self.initializer
+        set_id = initializer.subject_room_set[subject_idx]
+
+        available = self.available(group)
+        if available:
+            slot = self._choose_slot(group, available)
+        else:
+            # Brak wolnego slotu — lekcja w slocie wolnym dla klasy (naprawi ją ewolucja)
+            free = ALL_SLOTS & ~self.class_busy[class_idx] or ALL_SLOTS
+            slot = random.choice([s for s in range(SLOTS) if free >> s & 1])
+
+        room = self._choose_room(set_id, slot)
+        day, hour = divmod(slot, HOURS_PER_DAY)
+        bit = 1 << slot
+
+        self.class_busy[class_idx] |= bit
+        self.teacher_busy[teacher] |= bit
+        self.teacher_day_hours[teacher][day] += 1
+        if self.teacher_day_hours[teacher][day] >= initializer.max_hours_per_day[teacher]:
+            self.teacher_full_days[teacher] |= DAY_MASK << (day * HOURS_PER_DAY)
+
+        self._filled_sets = []
+        if not self.room_busy[room] & bit:
+            self.room_busy[room] |= bit
+            for member in initializer.room_memberships[room]:
+                self.set_free[member][slot] -= 1
+                if self.set_free[member][slot] == 0:
+                    self.set_full[member] |= bit
+                    self._filled_sets.append(member)
+
+        self.subject_days[group][day] += 1
+        self.class_days[class_idx][day] += 1
+        self.remaining[group] -= 1
+        self.class_remaining[class_idx] -= 1
+        self.teacher_remaining[teacher] -= 1
+
+        return day, hour, class_idx, subject_idx, teacher, room
+
+    def affected(self, group: int) -> set:
+        """Pary, których nasycenie lub stopień mogły się zmienić po zaplanowaniu lekcji pary"""
+        class_idx, _, teacher, _ = self.groups[group]
+        affected = set(self.class_groups[class_idx])
+        affected.update(self.teacher_groups[teacher])
+        for set_id in self._filled_sets:
+            affected.update(self.set_groups[set_id])
+        return affected
+
+    def _choose_slot(self, group: int, available: int) -> int:
+        """
+        Wybiera slot: dzień z najmniejszą liczbą godzin przedmiotu i najmniejszą liczbą
+        lekcji klasy (remisy losowo), a w nim najwcześniejszą wolną godzinę —
+        lekcje rozkładają się na tydzień, a dzień klasy zaczyna się rano bez okienek.
+        """
+        class_idx = self.groups[group][0]
+        subject_days = self.subject_days[group]
+        class_days = self.class_days[class_idx]
+
+        best_day, best_key = -1, None
+        for day in range(DAYS):
+            if not available >> (day * HOURS_PER_DAY) & DAY_MASK:
+                continue
+            key = (subject_days[day], class_days[day], random.random())
+            if best_key is None or key < best_key:
+                best_day, best_key = day, key
+
+        day_slots = available >> (best_day * HOURS_PER_DAY) & DAY_MASK
+        hour = (day_slots & -day_slots).bit_length() - 1
+        return best_day * HOURS_PER_DAY + hour
+
+    def _choose_room(self, set_id: int, slot: int) -> int:
+        """Wolna sala ze zbioru (najpierw należące do najmniejszej liczby zbiorów); bez wolnej — losowa"""
+        rooms = self.initializer.room_sets[set_id]
+        bit = 1 << slot
+        free = [room for room in rooms if not self.room_busy[room] & bit]
+        if not free:
+            return random.choice(rooms)
+
+        memberships = self.initializer.room_memberships
+        fewest = min(len(memberships[room]) for room in free)
+        return random.choice([room for room in free if len(memberships[room]) == fewest])
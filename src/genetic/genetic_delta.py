@@ -0,0 +1,466 @@
+# src/genetic/genetic_delta.py
+
+"""
+Przyrostowa (delta) ocena osobników.
+
+Przy dekodowaniu lekcje konkurują ze sobą wyłącznie w obrębie jednego slotu (dzień, godzina),
+więc zmiana genu wpływa tylko na slot, z którego lekcja wyszła, i slot, do którego trafiła.
+EvaluationState przechowuje dla osobnika zdekodowane sloty oraz liczniki i składniki kar
+per klasa / dzień klasy / nauczyciel / sala. Operatory zgłaszają zmienione geny
+(genetic_encoding.mark_changed), a DeltaEvaluator przelicza tylko dotknięte sloty i zasoby.
+Wynik jest zgodny z FitnessKernel. Aktualizację można zapisać w StateUndo i wycofać (revert)
+bez ponownego dekodowania slotów — z tego korzystają ruchy odrzucane przez przeszukiwanie lokalne
+i wyżarzanie.
+"""
+
+from bisect import insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.genetic.genetic_encoding import DAYS, HOURS_PER_DAY
+from src.genetic.genetic_kernel import FitnessKernel, ROOM_TOTAL_SLOTS
+
+N_SLOTS = DAYS * HOURS_PER_DAY
+
+# Powyżej tego odsetka zmienionych genów taniej jest zbudować stan od nowa
+REBUILD_FRACTION = 0.25
+
+
+def _day_penalty(mask: int) -> int:
+    """Kara za rozkład jednego dnia klasy (maska zajętych godzin) — jak w _evaluate_distribution"""
+    if mask == 0:
+        return 0
+    hours = [hour for hour in range(HOURS_PER_DAY) if mask >> hour & 1]
+    first, last = hours[0], hours[-1]
+    gaps = last - first + 1 - len(hours)
+
+    penalty = 15 * gaps if gaps > 0 else 0
+    if first > 2:
+        penalty += 10
+    if last > 6:
+        penalty += 10
+    return penalty
+
+
+# Kara dla każdej możliwej maski godzin w dniu
+DAY_PENALTY = [_day_penalty(mask) for mask in range(1 << HOURS_PER_DAY)]
+
+
+class EvaluationState:
+    """
+    Stan oceny jednego osobnika — płaskie listy, aby kopiowanie przy klonowaniu było tanie.
+
+    Kandydat to gen poprawny i z odpowiednią salą: (slot, klasa, nauczyciel, sala).
+    """
+
+    __slots__ = (
+        'candidates', 'slot_members', 'slot_accepted', 'occupied', 'occupied_position', 'changed',
+        'class_count', 'class_hours', 'teacher_day', 'teacher_week', 'room_count',
+        'class_penalty', 'teacher_penalty', 'room_score',
+        'distribution_total', 'teacher_total', 'room_total', 'scheduled_total'
+    )
+
+    def __init__(self, n_genes: int, n_classes: int, n_teachers: int, n_rooms: int):
+        self.candidates: List[Optional[Tuple[int, int, int, int]]] = [None] * n_genes
+        self.slot_members: List[List[int]] = [[] for _ in range(N_SLOTS)]
+        # Lekcje przyjęte w slocie: (gen, klasa, nauczyciel, sala)
+        self.slot_accepted: List[List[Tuple[int, int, int, int]]] = [[] for _ in range(N_SLOTS)]
+        # Sloty z przyjętymi lekcjami (w dowolnej kolejności) i pozycja każdego slotu na tej liście (-1: pusty)
+        self.occupied: List[int] = []
+        self.occupied_position = [-1] * N_SLOTS
+        # Indeksy genów zmienionych od ostatniej oceny
+        self.changed = set()
+
+        # Liczniki zajętości
+        self.class_count = [0] * n_classes
+        self.class_hours = [0] * (n_classes * DAYS)  # maska godzin dla (klasa, dzień)
+        self.teacher_day = [0] * (n_teachers * DAYS)
+        self.teacher_week = [0] * n_teachers
+        self.room_count = [0] * n_rooms
+
+        # Składniki metryk
+        self.class_penalty = [0.0] * n_classes
+        self.teacher_penalty = [0] * n_teachers
+        self.room_score = [0] * n_rooms
+        self.distribution_total = 0
+        self.teacher_total = 0
+        self.room_total = 0
+        self.scheduled_total = 0
+
+    def __deepcopy__(self, memo):
+        """Kopia bez rekurencyjnego deepcopy — krotki są niezmienne, wystarczą kopie list"""
+        copy_ = EvaluationState.__new__(EvaluationState)
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name in ('slot_members', 'slot_accepted'):
+                value = [list(items) for items in value]
+            elif isinstance(value, (list, set)):
+                value = value.copy()
+            setattr(copy_, name, value)
+        return copy_
+
+    def mark_occupancy(self, slot: int):
+        """Dopisuje slot do listy zajętych lub z niej usuwa, zależnie od przyjętych w nim lekcji"""
+        position = self.occupied_position[slot]
+        if self.slot_accepted[slot]:
+            if position < 0:
+                self.occupied_position[slot] = len(self.occupied)
+                self.occupied.append(slot)
+        elif position >= 0:
+            # Usunięcie przez zamianę z ostatnim elementem listy
+            last = self.occupied.pop()
+            if last != slot:
+                self.occupied[position] = last
+                self.occupied_position[last] = position
+            self.occupied_position[slot] = -1
+
+
+class StateUndo:
+    """Zapis zmian jednej aktualizacji EvaluationState, pozwalający ją wycofać (DeltaEvaluator.revert)"""
+
+    __slots__ = ('candidates', 'slot_members', 'slot_accepted', 'applied', 'class_penalty', 'teacher_penalty',
+                 'room_score', 'totals')
+
+    def __init__(self):
+        self.candidates: List[Tuple[int, Optional[Tuple[int, int, int, int]]]] = []
+        self.slot_members: Dict[int, List[int]] = {}
+        self.slot_accepted: List[Tuple[int, List[Tuple[int, int, int, int]]]] = []
+        # Zmiany liczników: (dzień, bit godziny, klasa, nauczyciel, sala, znak)
+        self.applied: List[Tuple[int, int, int, int, int, int]] = []
+        self.class_penalty: List[Tuple[int, float]] = []
+        self.teacher_penalty: List[Tuple[int, int]] = []
+        self.room_score: List[Tuple[int, int]] = []
+        self.totals: Tuple[int, int, int] = (0, 0, 0)
+
+
+class DeltaEvaluator:
+    """Buduje i aktualizuje EvaluationState; tabele pomocnicze pochodzą z FitnessKernel"""
+
+    def __init__(self, kernel: FitnessKernel):
+        self.kernel = kernel
+        self.n_classes = kernel.n_classes
+        self.n_subjects = kernel.n_subjects
+        self.n_teachers = kernel.n_teachers
+        self.n_rooms = kernel.n_rooms
+
+        # Tabele jako listy Pythona — szybszy dostęp do pojedynczych elementów niż w NumPy
+        self.room_suitable = kernel.room_suitable.tolist()
+        self.required_hours = kernel.required_hours.tolist()
+        self.total_required = sum(self.required_hours)
+        self.first_year = kernel.first_year.tolist()
+        self.max_hours_per_day = kernel.max_hours_per_day.tolist()
+        self.max_hours_per_week = kernel.max_hours_per_week.tolist()
+
+    def fitness(self, genes: np.ndarray, state: Optional[EvaluationState]) -> Tuple[float, EvaluationState]:
+        """
+        Zwraca wynik osobnika i jego (zaktualizowany lub nowy) stan.
+
+        Args:
+            genes: Tablica genów osobnika
+            state: Dotychczasowy stan albo None
+
+        Returns:
+            Para (wynik 0-100, stan)
+        """
+        if self.needs_build(genes, state):
+            state = self.build(genes)
+        elif state.changed:
+            self.update(genes, state)
+        return self.score(state), state
+
+    @staticmethod
+    def needs_build(genes: np.ndarray, state: Optional[EvaluationState]) -> bool:
+        """Czy ocena wymaga zbudowania stanu od nowa (brak stanu, inna szerokość albo zbyt wiele zmian)"""
+        return state is None or len(state.candidates) != len(genes) or \
+            len(state.changed) > len(genes) * REBUILD_FRACTION
+
+    def build(self, genes: np.ndarray) -> EvaluationState:
+        """Buduje stan od zera (pełne dekodowanie)"""
+        state = EvaluationState(len(genes), self.n_classes, self.n_teachers, self.n_rooms)
+        for index, gene in enumerate(genes.tolist()):
+            candidate = self._candidate(gene)
+            state.candidates[index] = candidate
+            if candidate is not None:
+                state.slot_members[candidate[0]].append(index)
+
+        for slot in range(N_SLOTS):
+            if state.slot_members[slot]:
+                self._resolve_slot(state, slot, set(), set(), set())
+
+        for class_idx in range(self.n_classes):
+            self._refresh_class(state, class_idx)
+            for day in range(DAYS):
+                state.distribution_total += DAY_PENALTY[state.class_hours[class_idx * DAYS + day]]
+        for teacher_idx in range(self.n_teachers):
+            self._refresh_teacher(state, teacher_idx)
+        for room_idx in range(self.n_rooms):
+            self._refresh_room(state, room_idx)
+        return state
+
+    def update(self, genes: np.ndarray, state: EvaluationState, undo: Optional[StateUndo] = None):
+        """
+        Nanosi zmienione geny na stan, przeliczając tylko dotknięte sloty i zasoby.
+
+        Args:
+            genes: Tablica genów osobnika
+            state: Stan do aktualizacji
+            undo: Zapis zmian do późniejszego wycofania (revert) albo None
+        """
+        if undo is not None:
+            undo.totals = (state.distribution_total, state.teacher_total, state.room_total)
+
+        affected_slots = set()
+        for index in state.changed:
+            old = state.candidates[index]
+            new = self._candidate(genes[index].tolist())
+            if undo is not None:
+                undo.candidates.append((index, old))
+                for candidate in (old, new):
+                    if candidate is not None and candidate[0] not in undo.slot_members:
+                        undo.slot_members[candidate[0]] = list(state.slot_members[candidate[0]])
+
+            if old is not None:
+                state.slot_members[old[0]].remove(index)
+                affected_slots.add(old[0])
+
+            state.candidates[index] = new
+            if new is not None:
+                insort(state.slot_members[new[0]], index)
+                affected_slots.add(new[0])
+        state.changed.clear()
+
+        classes, teachers, rooms = set(), set(), set()
+        # Kara za rozkład dnia liczona przed zmianą — odejmowana po przeliczeniu slotów
+        class_days = {}
+        for slot in affected_slots:
+            self._resolve_slot(state, slot, classes, teachers, rooms, class_days, undo)
+
+        if undo is not None:
+            undo.class_penalty.extend((class_idx, state.class_penalty[class_idx]) for class_idx in classes)
+            undo.teacher_penalty.extend((teacher_idx, state.teacher_penalty[teacher_idx]) for teacher_idx in teachers)
+            undo.room_score.extend((room_idx, state.room_score[room_idx]) for room_idx in rooms)
+
+        for key, old_penalty in class_days.items():
+            state.distribution_total += DAY_PENALTY[state.class_hours[key]] - old_penalty
+        for class_idx in classes:
+            self._refresh_class(state, class_idx)
+        for teacher_idx in teachers:
+            self._refresh_teacher(state, teacher_idx)
+        for room_idx in rooms:
+            self._refresh_room(state, room_idx)
+
+    def revert(self, state: EvaluationState, undo: StateUndo):
+        """
+        Wycofuje aktualizację zapisaną w undo. Geny osobnika trzeba przywrócić osobno
+        (bez zgłaszania zmian — stan odpowiada wtedy znów genom sprzed aktualizacji).
+        """
+        for index, candidate in undo.candidates:
+            state.candidates[index] = candidate
+        for slot, members in undo.slot_members.items():
+            state.slot_members[slot] = members
+        for slot, accepted in reversed(undo.slot_accepted):
+            state.slot_accepted[slot] = accepted
+            state.mark_occupancy(slot)
+        for day, bit, class_idx, teacher_idx, room_idx, sign in reversed(undo.applied):
+            self._apply(state, day, bit, class_idx, teacher_idx, room_idx, -sign)
+
+        for class_idx, penalty in undo.class_penalty:
+            state.class_penalty[class_idx] = penalty
+        for teacher_idx, penalty in undo.teacher_penalty:
+            state.teacher_penalty[teacher_idx] = penalty
+        for room_idx, score in undo.room_score:
+            state.room_score[room_idx] = score
+        state.distribution_total, state.teacher_total, state.room_total = undo.totals
+        state.changed.clear()
+
+    def metrics(self, state: EvaluationState) -> Optional[Dict[str, float]]:
+        """Metryki planu ze stanu (jak FitnessKernel.metrics); None dla pustego planu"""
+        return self.metrics_from_totals(
+            sum(state.class_penalty), state.scheduled_total, state.distribution_total,
+            state.teacher_total, state.room_total
+        )
+
+    def score(self, state: EvaluationState) -> float:
+        """Wynik planu (0-100) ze stanu"""
+        return self.score_from_totals(
+            sum(state.class_penalty), state.scheduled_total, state.distribution_total,
+            state.teacher_total, state.room_total
+        )
+
+    def penalty(self, state: EvaluationState) -> float:
+        """
+        Ważona suma kar planu bez obcinania metryk do zakresu 0-100. Rozróżnia plany o tym samym
+        wyniku, np. gdy kara za rozkład przekracza 100 i metryka rozkładu wynosi już 0.
+        """
+        return self.penalty_from_totals(
+            sum(state.class_penalty), state.scheduled_total, state.distribution_total,
+            state.teacher_total, state.room_total
+        )
+
+    def metrics_from_totals(self, class_penalty: float, scheduled: int, distribution: int, teacher: int,
+                            room: int) -> Optional[Dict[str, float]]:
+        """
+        Metryki planu z sum składników (suma kar klas, liczba lekcji, kary rozkładu i nauczycieli,
+        wkład sal) — także dla planów przechowywanych poza EvaluationState; None dla pustego planu
+        """
+        if scheduled == 0:
+            return None
+
+        score = 100.0 - class_penalty
+        overall = scheduled / self.total_required * 100 if self.total_required > 0 else 0.0
+        return {
+            'completeness': max(0, min(score, overall)),
+            'distribution': max(0, 100.0 - distribution),
+            'teacher_load': max(0, 100.0 - teacher),
+            'room_usage': max(0, min(100, 100.0 + room)),
+            # Zdekodowany plan nie zawiera konfliktów
+            'constraints': 100.0
+        }
+
+    def score_from_totals(self, class_penalty: float, scheduled: int, distribution: int, teacher: int,
+                          room: int) -> float:
+        """Jak score, z sum składników (patrz metrics_from_totals)"""
+        metrics = self.metrics_from_totals(class_penalty, scheduled, distribution, teacher, room)
+        if metrics is None:
+            return 0.0
+        return self.kernel.combine_one(metrics)
+
+    def penalty_from_totals(self, class_penalty: float, scheduled: int, distribution: int, teacher: int,
+                            room: int) -> float:
+        """Jak penalty, z sum składników (patrz metrics_from_totals)"""
+        weights = self.kernel.weights
+        missing = 100.0 - scheduled / self.total_required * 100 if self.total_required > 0 else 0.0
+        return (
+            max(class_penalty, missing) * weights['completeness'] +
+            distribution * weights['distribution'] +
+            teacher * weights['teacher_load'] -
+            room * weights['room_usage']
+        )
+
+    def class_penalty(self, class_idx: int, count: int) -> float:
+        """Kara kompletności klasy z podaną liczbą lekcji (jak FitnessKernel._completeness)"""
+        required = self.required_hours[class_idx]
+
+        penalty = 0.0
+        if count == 0:
+            penalty = 50.0 + 20.0 * self.first_year[class_idx]
+        completion = count / required if required > 0 else 0.0
+        if completion < 0.8:
+            penalty = penalty + (0.8 - completion) * 100
+        return penalty
+
+    def teacher_penalty(self, teacher_idx: int, day_hours: Sequence[int], weekly: int) -> int:
+        """Kara obciążenia nauczyciela z godzinami w dniach tygodnia (jak FitnessKernel._teacher_load)"""
+        max_day = self.max_hours_per_day[teacher_idx]
+        max_week = self.max_hours_per_week[teacher_idx]
+
+        penalty = 0
+        for hours in day_hours:
+            if hours > max_day:
+                penalty += 10 * (hours - max_day)
+
+        if weekly > max_week:
+            penalty += 15 * (weekly - max_week)
+        elif weekly < max_week * 0.5:
+            penalty += 10
+        return penalty
+
+    @staticmethod
+    def room_score(count: int) -> int:
+        """Wkład sali z podaną liczbą lekcji do metryki wykorzystania (jak FitnessKernel._room_usage)"""
+        usage = count / ROOM_TOTAL_SLOTS * 100
+
+        score = 0
+        if usage < 30:
+            score -= 10
+        elif usage > 90:
+            score -= 5
+        if 60 <= usage <= 80:
+            score += 5
+        return score
+
+    def _candidate(self, gene: List[int]) -> Optional[Tuple[int, int, int, int]]:
+        """Zwraca (slot, klasa, nauczyciel, sala) dla genu branego pod uwagę przy dekodowaniu, inaczej None"""
+        day, hour, class_idx, subject_idx, teacher_idx, room_idx = gene
+        if not (0 <= day < DAYS and 0 <= hour < HOURS_PER_DAY and
+                0 <= class_idx < self.n_classes and 0 <= subject_idx < self.n_subjects and
+                0 <= teacher_idx < self.n_teachers and 0 <= room_idx < self.n_rooms):
+            return None
+        if not self.room_suitable[subject_idx][room_idx]:
+            return None
+        return day * HOURS_PER_DAY + hour, class_idx, teacher_idx, room_idx
+
+    def _resolve_slot(self, state: EvaluationState, slot: int, classes: set, teachers: set, rooms: set,
+                      class_days: Optional[Dict[int, int]] = None, undo: Optional[StateUndo] = None):
+        """
+        Ponownie dekoduje jeden slot (zachłannie, w kolejności genów) i aktualizuje liczniki.
+        Liczniki zmieniane są tylko dla lekcji, które wypadły z planu slotu lub do niego weszły.
+        """
+        accepted = []
+        used_classes, used_teachers, used_rooms = set(), set(), set()
+        for index in state.slot_members[slot]:
+            _, class_idx, teacher_idx, room_idx = state.candidates[index]
+            if class_idx in used_classes or teacher_idx in used_teachers or room_idx in used_rooms:
+                continue
+            used_classes.add(class_idx)
+            used_teachers.add(teacher_idx)
+            used_rooms.add(room_idx)
+            accepted.append((index, class_idx, teacher_idx, room_idx))
+
+        previous = state.slot_accepted[slot]
+        if accepted == previous:
+            return
+        state.slot_accepted[slot] = accepted
+        state.mark_occupancy(slot)
+        if undo is not None:
+            undo.slot_accepted.append((slot, previous))
+
+        day, hour = divmod(slot, HOURS_PER_DAY)
+        bit = 1 << hour
+        kept = set(accepted).intersection(previous)
+        # Najpierw wycofanie lekcji, które wypadły, potem dodanie nowych
+        for entries, sign in ((previous, -1), (accepted, 1)):
+            for entry in entries:
+                if entry in kept:
+                    continue
+                _, class_idx, teacher_idx, room_idx = entry
+                if class_days is not None:
+                    key = class_idx * DAYS + day
+                    class_days.setdefault(key, DAY_PENALTY[state.class_hours[key]])
+                self._apply(state, day, bit, class_idx, teacher_idx, room_idx, sign)
+                if undo is not None:
+                    undo.applied.append((day, bit, class_idx, teacher_idx, room_idx, sign))
+                classes.add(class_idx)
+                teachers.add(teacher_idx)
+                rooms.add(room_idx)
+
+    @staticmethod
+    def _apply(state: EvaluationState, day: int, bit: int, class_idx: int, teacher_idx: int, room_idx: int,
+               sign: int):
+        """Dodaje (sign=1) lub usuwa (sign=-1) lekcję z liczników"""
+        state.class_count[class_idx] += sign
+        state.class_hours[class_idx * DAYS + day] ^= bit
+        state.teacher_day[teacher_idx * DAYS + day] += sign
+        state.teacher_week[teacher_idx] += sign
+        state.room_count[room_idx] += sign
+        state.scheduled_total += sign
+
+    def _refresh_class(self, state: EvaluationState, class_idx: int):
+        """Przelicza karę kompletności klasy"""
+        state.class_penalty[class_idx] = self.class_penalty(class_idx, state.class_count[class_idx])
+
+    def _refresh_teacher(self, state: EvaluationState, teacher_idx: int):
+        """Przelicza karę obciążenia nauczyciela"""
+        penalty = self.teacher_penalty(
+            teacher_idx, state.teacher_day[teacher_idx * DAYS:(teacher_idx + 1) * DAYS],
+            state.teacher_week[teacher_idx]
+        )
+        state.teacher_total += penalty - state.teacher_penalty[teacher_idx]
+        state.teacher_penalty[teacher_idx] = penalty
+
+    def _refresh_room(self, state: EvaluationState, room_idx: int):
+        """Przelicza wkład sali do metryki wykorzystania"""
+        score = self.room_score(state.room_count[room_idx])
+        state.room_total += score - state.room_score[room_idx]
+        state.room_score[room_idx] = score
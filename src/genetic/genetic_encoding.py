@@ -0,0 +1,262 @@
+# src/genetic/genetic_encoding.py
+
+"""
+Kodowanie chromosomu jako tablicy liczb całkowitych o stałej szerokości.
+
+Każdy gen to wiersz (dzień, godzina, klasa, przedmiot, nauczyciel, sala). Klasa, przedmiot,
+nauczyciel i sala są indeksami nadanymi przez School przy konstrukcji (patrz School._build_indexes).
+Pusty gen ma wszystkie pola równe EMPTY.
+"""
+
+import copy
+from typing import Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.models.lesson import Lesson
+
+if TYPE_CHECKING:
+    from src.models.school import School
+
+# Indeksy pól genu
+DAY, HOUR, CLASS, SUBJECT, TEACHER, ROOM = range(6)
+GENE_FIELDS = 6
+GENE_DTYPE = np.int16
+
+# Wartość pola oznaczająca pusty gen
+EMPTY = -1
+EMPTY_GENE = (EMPTY,) * GENE_FIELDS
+
+DAYS = 5
+HOURS_PER_DAY = 8
+
+# Zapas pustych genów (względem liczby wymaganych lekcji) na lekcje dodawane przez mutację
+CHROMOSOME_HEADROOM = 0.5
+
+
+class GeneArray(np.ndarray):
+    """
+    Tablica genów o kształcie (liczba_genów, GENE_FIELDS).
+    Baza dla klasy Individual z DEAP — przyjmuje tablicę albo listę krotek (None = pusty gen).
+    """
+
+    def __new__(cls, genes=()):
+        if isinstance(genes, np.ndarray):
+            data = np.array(genes, dtype=GENE_DTYPE)
+        else:
+            data = np.array(
+                [EMPTY_GENE if gene is None else tuple(gene) for gene in genes],
+                dtype=GENE_DTYPE
+            )
+        return data.reshape(-1, GENE_FIELDS).view(cls)
+
+    def __deepcopy__(self, memo):
+        """Kopiuje tablicę razem z atrybutami (np. fitness)"""
+        copy_ = np.ndarray.copy(self)
+        copy_.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return copy_
+
+    def __reduce__(self):
+        return self.__class__, (np.asarray(self),), self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+# Maska 64-bitowa dla haszy Zobrista
+HASH_MASK = (1 << 64) - 1
+
+# Każde pole genu zajmuje w pakowaniu pełne 16 bitów (szerokość GENE_DTYPE)
+_FIELD_MASK = np.int64(0xFFFF)
+_POSITION_SHIFT = np.uint64(32)
+
+
+def pack_genes(genes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pakuje geny bez utraty informacji w pary słów uint64: (dzień, godzina, klasa, przedmiot)
+    w pierwszym słowie, (nauczyciel, sala) w młodszej połowie drugiego — po 16 bitów na pole.
+    Starsza połowa drugiego słowa pozostaje wolna (gene_hashes zapisuje w niej pozycję genu).
+
+    Returns:
+        Para tablic uint64 o kształcie genes bez ostatniego wymiaru
+    """
+    fields = (np.asarray(genes, dtype=np.int64) & _FIELD_MASK).astype(np.uint64)
+    low = (fields[..., DAY] | fields[..., HOUR] << np.uint64(16) |
+           fields[..., CLASS] << np.uint64(32) | fields[..., SUBJECT] << np.uint64(48))
+    high = fields[..., TEACHER] | fields[..., ROOM] << np.uint64(16)
+    return low, high
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """Mieszanie SplitMix64 na tablicy uint64 (przepełnienia zawijają się modulo 2^64)"""
+    z = values + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def gene_hashes(genes: np.ndarray, start: int = 0) -> np.ndarray:
+    """Klucze Zobrista (uint64) dla genów leżących na pozycjach start, start+1, ..."""
+    genes = np.asarray(genes).reshape(-1, GENE_FIELDS)
+    return _position_hashes(genes, np.arange(start, start + len(genes)))
+
+
+def _position_hashes(genes: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Klucze Zobrista (uint64) genów leżących na podanych pozycjach"""
+    low, high = pack_genes(genes)
+    return _splitmix64(_splitmix64(low) ^ (high | positions.astype(np.uint64) << _POSITION_SHIFT))
+
+
+def segment_hash(genes: np.ndarray, start: int = 0) -> int:
+    """Suma (mod 2^64) kluczy Zobrista segmentu genów zaczynającego się na pozycji start"""
+    return int(gene_hashes(genes, start).sum(dtype=np.uint64))
+
+
+def individual_hash(individual: np.ndarray) -> int:
+    """
+    64-bitowy hasz Zobrista osobnika: suma kluczy par (pozycja, gen) modulo 2^64.
+    Suma jest przemienna, więc zmiana genu aktualizuje hasz w O(1) (set_gene / set_genes).
+    Pozycja wchodzi do klucza, bo przy dekodowaniu kolejność genów rozstrzyga konflikty w slocie.
+    Wynik jest zapamiętywany w atrybucie zhash osobnika.
+    """
+    zhash = getattr(individual, 'zhash', None)
+    if zhash is None:
+        zhash = segment_hash(individual)
+        if hasattr(individual, '__dict__'):
+            individual.zhash = zhash
+    return zhash
+
+
+def set_gene(individual: np.ndarray, index: int, gene: Sequence[int]):
+    """Ustawia gen, aktualizując hasz Zobrista i zgłaszając zmianę stanowi oceny przyrostowej"""
+    zhash = getattr(individual, 'zhash', None)
+    if zhash is not None:
+        zhash -= segment_hash(individual[index], index)
+
+    individual[index] = gene
+
+    if zhash is not None:
+        individual.zhash = (zhash + segment_hash(individual[index], index)) & HASH_MASK
+    mark_changed(individual, (index,))
+
+
+def set_genes(individual: np.ndarray, start: int, genes: np.ndarray):
+    """Nadpisuje segment genów od pozycji start (jak set_gene, dla całego segmentu)"""
+    end = start + len(genes)
+    zhash = getattr(individual, 'zhash', None)
+    if zhash is not None:
+        zhash -= segment_hash(individual[start:end], start)
+
+    individual[start:end] = genes
+
+    if zhash is not None:
+        individual.zhash = (zhash + segment_hash(individual[start:end], start)) & HASH_MASK
+    mark_changed(individual, range(start, end))
+
+
+def set_genes_at(individual: np.ndarray, indices: Sequence[int], genes: Sequence[Sequence[int]]):
+    """Ustawia geny na dowolnych pozycjach (jak set_gene, z jedną aktualizacją hasza dla wszystkich)"""
+    if not len(indices):
+        return
+    positions = np.asarray(indices, dtype=np.intp)
+    zhash = getattr(individual, 'zhash', None)
+    if zhash is not None:
+        zhash -= int(_position_hashes(np.asarray(individual[positions]), positions).sum(dtype=np.uint64))
+
+    individual[positions] = genes
+
+    if zhash is not None:
+        zhash += int(_position_hashes(np.asarray(individual[positions]), positions).sum(dtype=np.uint64))
+        individual.zhash = zhash & HASH_MASK
+    mark_changed(individual, positions.tolist())
+
+
+def mark_changed(individual: np.ndarray, indices: Iterable[int]):
+    """Zgłasza zmienione geny stanowi oceny przyrostowej (jeśli osobnik go ma)"""
+    state = getattr(individual, 'eval_state', None)
+    if state is not None:
+        state.changed.update(indices)
+
+
+def inherit_tracking(child: np.ndarray, parent: np.ndarray):
+    """
+    Przenosi na potomka utworzonego jako kopia genów rodzica jego hasz Zobrista
+    oraz stan oceny przyrostowej. Rodzic traci stan — inaczej oba osobniki współdzieliłyby ten sam obiekt.
+    """
+    parent_attributes = getattr(parent, '__dict__', {})
+    if 'zhash' in parent_attributes:
+        child.zhash = parent_attributes['zhash']
+
+    state = parent_attributes.pop('eval_state', None)
+    if state is not None:
+        child.eval_state = state
+
+
+def chromosome_length(total_lessons: int) -> int:
+    """Zwraca szerokość chromosomu dla danej liczby wymaganych lekcji"""
+    return total_lessons + int(total_lessons * CHROMOSOME_HEADROOM)
+
+
+def encode_lesson(school: 'School', lesson: Lesson) -> Tuple[int, ...]:
+    """Koduje obiekt Lesson jako krotkę indeksów"""
+    return (
+        lesson.day,
+        lesson.hour,
+        school.class_index[lesson.class_group],
+        school.subject_index[lesson.subject.name],
+        school.teacher_index[lesson.teacher.id],
+        school.classroom_index[lesson.classroom.id]
+    )
+
+
+def decode_gene(school: 'School', gene: Sequence[int]) -> Optional[Lesson]:
+    """Dekoduje gen do obiektu Lesson; zwraca None dla pustego lub nieprawidłowego genu"""
+    day, hour, class_idx, subject_idx, teacher_idx, room_idx = (int(value) for value in gene)
+    if day == EMPTY:
+        return None
+
+    if not (0 <= class_idx < len(school.class_names) and
+            0 <= subject_idx < len(school.subject_list) and
+            0 <= teacher_idx < len(school.teacher_list) and
+            0 <= room_idx < len(school.classroom_list)):
+        return None
+
+    return Lesson(
+        subject=school.subject_list[subject_idx],
+        teacher=school.teacher_list[teacher_idx],
+        classroom=school.classroom_list[room_idx],
+        class_group=school.class_names[class_idx],
+        day=day,
+        hour=hour
+    )
+
+
+def gene_to_record(school: 'School', gene: Sequence[int]) -> Optional[List]:
+    """
+    Zamienia gen na rekord niezależny od indeksów:
+    [dzień, godzina, nazwa_klasy, nazwa_przedmiotu, id_nauczyciela, id_sali].
+    Używane przy zapisie rozwiązania do JSON.
+    """
+    lesson = decode_gene(school, gene)
+    if lesson is None:
+        return None
+    return [lesson.day, lesson.hour, lesson.class_group, lesson.subject.name,
+            lesson.teacher.id, lesson.classroom.id]
+
+
+def record_to_gene(school: 'School', record: Optional[Sequence]) -> Optional[Tuple[int, ...]]:
+    """Odwrotność gene_to_record; zwraca None, jeśli rekord odwołuje się do nieznanych zasobów"""
+    if record is None:
+        return None
+    try:
+        day, hour, class_name, subject_name, teacher_id, classroom_id = record
+        return (
+            int(day),
+            int(hour),
+            school.class_index[class_name],
+            school.subject_index[subject_name],
+            school.teacher_index[teacher_id],
+            school.classroom_index[classroom_id]
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
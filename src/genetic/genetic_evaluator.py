@@ -2,14 +2,25 @@
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, Union, List, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
+import numpy as np
+
+from src.genetic.genetic_cache import FitnessCache
+from src.genetic.genetic_encoding import individual_hash
+from src.genetic.genetic_delta import DeltaEvaluator
+from src.genetic.genetic_kernel import FitnessKernel
 from src.models.schedule import Schedule
 from src.models.school import School
 from src.utils.logger import GPLLogger
 
 if TYPE_CHECKING:
     from src.genetic.genetic_operators import GeneticOperators
+    from src.genetic.genetic_parallel import ParallelEvaluator
+
+# Odsetek osobników populacji wymagających pełnej oceny (brak stanu albo wiele zmienionych genów),
+# od którego oceniamy je partią kernela zamiast budować stany delta — partia jest kilkukrotnie tańsza
+BATCH_FRACTION = 0.1
 
 
 @dataclass
@@ -33,9 +44,7 @@ class GeneticEvaluator:
         # Cache dla optymalizacji
         self._metrics_cache = {}
         self.cache_size_limit = 1000
-        self._fitness_cache = {}
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self.fitness_cache = FitnessCache(params.get('fitness_cache_mb', 8.0))
 
         # Wagi dla różnych komponentów oceny
         self.weights = {
@@ -46,88 +55,62 @@ class GeneticEvaluator:
             'constraints': 0.15  # Spełnienie ograniczeń
         }
 
-    def evaluate_schedule(self, schedule: Union[List, 'Schedule']) -> Tuple[float]:
+        # Backend oceny osobników: 'numpy' (wektorowy kernel) lub 'python' (przez obiekt Schedule)
+        self.backend = params.get('evaluator_backend', 'numpy')
+        if self.backend not in ('numpy', 'python'):
+            raise ValueError(f"Unknown evaluator backend: {self.backend}")
+        self.kernel = FitnessKernel(school, self.weights) if self.backend == 'numpy' else None
+
+        # Ocena przyrostowa: osobniki niosą EvaluationState, a po mutacji/krzyżowaniu
+        # przeliczane są tylko zmienione geny (wymaga backendu 'numpy'). Domyślnie wyłączona
+        # przy puli procesów — stan żyje w procesie głównym, więc pula nie miałaby czego liczyć
+        default_delta = int(params.get('workers') or 1) <= 1
+        use_delta = params.get('delta_evaluation', default_delta) and self.kernel is not None
+        self.delta = DeltaEvaluator(self.kernel) if use_delta else None
+
+        # Opcjonalna pula procesów (ParallelEvaluator) dla evaluate_population
+        self.parallel: Optional['ParallelEvaluator'] = None
+
+    def evaluate_schedule(self, schedule: Union[np.ndarray, 'Schedule']) -> Tuple[float]:
         """
         Główna funkcja oceniająca plan lekcji.
 
         Args:
-            schedule: Lista reprezentująca osobnika lub obiekt Schedule
+            schedule: Tablica genów reprezentująca osobnika lub obiekt Schedule
 
         Returns:
             Tuple[float]: Pojedyncza wartość fitness w krotce (wymagane przez DEAP)
         """
         try:
-            # Jeśli dostaliśmy listę (osobnika), sprawdź cache i ew. konwertuj na Schedule
-            if isinstance(schedule, list):
-                # Wylicz hash dla osobnika jako cache key
-                try:
-                    # Sortujemy i konwertujemy na tuple dla hashowania
-                    cache_key = tuple(sorted(tuple(x) if x is not None else None for x in schedule))
+            cache_key = None
+
+            # Osobnik z możliwością przechowania stanu — ocena przyrostowa
+            if self._supports_delta(schedule):
+                return self._evaluate_delta(schedule)
 
+            # Jeśli dostaliśmy tablicę (osobnika), sprawdź cache i ew. konwertuj na Schedule
+            if isinstance(schedule, np.ndarray):
+                genes = np.asarray(schedule)
+
+                # Wylicz hash dla osobnika jako cache key
+                cache_key = self._cache_key(schedule)
+                if cache_key is not None:
                     # Sprawdź czy w cache
-                    if cache_key in self._fitness_cache:
-                        self._cache_hits += 1
-                        return self._fitness_cache[cache_key]
-
-                    self._cache_misses += 1
-                except Exception as e:
-                    # Jeśli problem z utworzeniem klucza, ignoruj cache
-                    self.logger.debug(f"Cache key generation error: {str(e)}")
-                    pass
-
-                # Konwertuj na Schedule jeśli potrzeba
-                schedule = self.operators.convert_to_schedule(schedule)
-                if not schedule:
-                    return (0.0,)
-
-            # Sprawdzenie czy mamy poprawny obiekt Schedule
-            if not isinstance(schedule, Schedule):
-                self.logger.error(f"Invalid schedule type: {type(schedule)}")
-                return (0.0,)
-
-            # Obliczenie wszystkich metryk
-            try:
-                metrics = {
-                    'completeness': self._evaluate_completeness(schedule),
-                    'distribution': self._evaluate_distribution(schedule),
-                    'teacher_load': self._evaluate_teacher_load(schedule),
-                    'room_usage': self._evaluate_room_usage(schedule),
-                    'constraints': self._evaluate_constraints(schedule)
-                }
-            except Exception as e:
-                self.logger.error(f"Error calculating metrics: {str(e)}")
-                return (0.0,)
-
-            # Obliczenie kar i nagród
-            penalties = self._calculate_penalties(schedule, metrics)
-            rewards = self._calculate_rewards(schedule, metrics)
-
-            # Obliczenie wyniku
-            total_score = sum(
-                score * self.weights[metric]
-                for metric, score in metrics.items()
-            )
+                    cached = self.fitness_cache.get(cache_key)
+                    if cached is not None:
+                        return cached
 
-            # Aplikacja kar i nagród
-            total_score = max(0, min(100, total_score - sum(penalties.values()) + sum(rewards.values())))
+                result = self._evaluate_uncached(genes)
+            else:
+                result = self._score_schedule(schedule)
 
             # Zapisanie do cache'a
-            result = (total_score,)
-            if 'cache_key' in locals() and cache_key is not None:
-                self._fitness_cache[cache_key] = result
-
-                # Limit rozmiaru cache
-                if len(self._fitness_cache) > 10000:  # Ogranicz rozmiar cache
-                    # Usuń 20% najstarszych wpisów
-                    to_remove = int(len(self._fitness_cache) * 0.2)
-                    for old_key in list(self._fitness_cache.keys())[:to_remove]:
-                        del self._fitness_cache[old_key]
+            if cache_key is not None:
+                self.fitness_cache.put(cache_key, result)
 
             # Logowanie statystyk cache co 1000 wywołań
-            if (self._cache_hits + self._cache_misses) % 1000 == 0:
-                hit_rate = self._cache_hits / (self._cache_hits + self._cache_misses) * 100 if (
-                                                                                                           self._cache_hits + self._cache_misses) > 0 else 0
-                self.logger.debug(f"Fitness cache: {hit_rate:.1f}% hit rate, cache size: {len(self._fitness_cache)}")
+            if (self.fitness_cache.hits + self.fitness_cache.misses) % 1000 == 0:
+                self._log_cache_stats()
 
             # Zwróć wynik jako krotkę (wymagane przez DEAP)
             return result
@@ -136,6 +119,162 @@ class GeneticEvaluator:
             self.logger.error(f"Error during schedule evaluation: {str(e)}")
             return (0.0,)
 
+    def evaluate_population(self, individuals: Sequence[np.ndarray]) -> List[Tuple[float]]:
+        """
+        Ocenia całą listę osobników jednym wywołaniem kernela.
+
+        Osobniki spoza cache są składane w jedną tablicę (osobniki × geny × pola)
+        i oceniane razem przez FitnessKernel.fitness_batch. Przy ocenie przyrostowej decyzja zapada
+        dla całej populacji: gdy co najmniej BATCH_FRACTION osobników wymaga zbudowania stanu od nowa,
+        trafiają one do partii (tracąc stan), a pozostałe są aktualizowane przyrostowo.
+
+        Args:
+            individuals: Lista osobników (tablic genów)
+
+        Returns:
+            List[Tuple[float]]: Wartości fitness w kolejności osobników (krotki wymagane przez DEAP)
+        """
+        try:
+            results: List[Optional[Tuple[float]]] = [None] * len(individuals)
+            pending_keys: List[Optional[int]] = []
+            pending_genes: List[np.ndarray] = []
+            pending_indices: List[List[int]] = []
+            pending_by_key: Dict[int, int] = {}
+
+            rebuilds = [
+                self._supports_delta(individual) and
+                self.delta.needs_build(np.asarray(individual), getattr(individual, 'eval_state', None))
+                for individual in individuals
+            ]
+            batch_rebuilds = sum(rebuilds) >= max(1, len(individuals) * BATCH_FRACTION)
+
+            for i, individual in enumerate(individuals):
+                if self._supports_delta(individual):
+                    # Ocena przyrostowa jest tańsza niż wyliczenie klucza cache
+                    if not (batch_rebuilds and rebuilds[i]):
+                        results[i] = self._evaluate_delta(individual)
+                        continue
+                    # Stan nie odpowiada genom — zostanie zbudowany przy następnej ocenie przyrostowej
+                    individual.eval_state = None
+
+                genes = np.asarray(individual)
+                cache_key = self._cache_key(individual)
+
+                cached = self.fitness_cache.get(cache_key) if cache_key is not None else None
+                if cached is not None:
+                    results[i] = cached
+                    continue
+
+                if cache_key is not None and cache_key in pending_by_key:
+                    # Duplikat w tej samej partii — oceniamy tylko raz
+                    pending_indices[pending_by_key[cache_key]].append(i)
+                    continue
+
+                if cache_key is not None:
+                    pending_by_key[cache_key] = len(pending_genes)
+                pending_keys.append(cache_key)
+                pending_genes.append(genes)
+                pending_indices.append([i])
+
+            if pending_genes:
+                shapes = {genes.shape for genes in pending_genes}
+                if self.kernel is not None and len(shapes) == 1 and pending_genes[0].ndim == 2:
+                    scorer = self.parallel if self.parallel is not None else self.kernel
+                    scores = scorer.fitness_batch(np.stack(pending_genes))
+                    batch_results = [(float(score),) for score in scores]
+                else:
+                    # Brak kernela albo osobniki różnej długości — oceniamy pojedynczo
+                    batch_results = [self._evaluate_uncached(genes) for genes in pending_genes]
+
+                for cache_key, indices, result in zip(pending_keys, pending_indices, batch_results):
+                    for i in indices:
+                        results[i] = result
+                    if cache_key is not None:
+                        self.fitness_cache.put(cache_key, result)
+
+            self._log_cache_stats()
+            return results
+
+        except Exception as e:
+            self.logger.error(f"Error during population evaluation: {str(e)}")
+            return [(0.0,)] * len(individuals)
+
+    def _supports_delta(self, individual) -> bool:
+        """Czy osobnika można ocenić przyrostowo (włączona delta i osobnik może przechować stan)"""
+        return self.delta is not None and isinstance(individual, np.ndarray) and hasattr(individual, '__dict__')
+
+    def _evaluate_delta(self, individual: np.ndarray) -> Tuple[float]:
+        """Ocenia osobnika przyrostowo, budując stan przy pierwszej ocenie"""
+        score, state = self.delta.fitness(np.asarray(individual), getattr(individual, 'eval_state', None))
+        individual.eval_state = state
+        return (score,)
+
+    def _evaluate_uncached(self, genes: np.ndarray) -> Tuple[float]:
+        """Ocenia tablicę genów z pominięciem cache"""
+        if self.kernel is not None:
+            # Kernel liczy wynik bezpośrednio na tablicy genów
+            return (self.kernel.fitness(genes),)
+
+        # Konwertuj na Schedule jeśli potrzeba
+        schedule = self.operators.convert_to_schedule(genes)
+        if not schedule:
+            return (0.0,)
+        return self._score_schedule(schedule)
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Liczniki cache fitness: trafienia, chybienia, usunięcia, rozmiar i skuteczność"""
+        return self.fitness_cache.stats()
+
+    def _cache_key(self, individual: np.ndarray) -> Optional[int]:
+        """Hasz Zobrista osobnika jako klucz cache; None, jeśli nie da się go wyliczyć"""
+        try:
+            return individual_hash(individual)
+        except Exception as e:
+            # Jeśli problem z utworzeniem klucza, ignoruj cache
+            self.logger.debug("Cache key generation error: %s", e)
+            return None
+
+    def _log_cache_stats(self):
+        """Loguje skuteczność cache"""
+        self.logger.debug(
+            "Fitness cache: %.1f%% hit rate, cache size: %d, evictions: %d",
+            self.fitness_cache.hit_rate, len(self.fitness_cache), self.fitness_cache.evictions
+        )
+
+    def _score_schedule(self, schedule: 'Schedule') -> Tuple[float]:
+        """Oblicza wynik dla obiektu Schedule (ścieżka 'python')"""
+        # Sprawdzenie czy mamy poprawny obiekt Schedule
+        if not isinstance(schedule, Schedule):
+            self.logger.error(f"Invalid schedule type: {type(schedule)}")
+            return (0.0,)
+
+        # Obliczenie wszystkich metryk
+        try:
+            metrics = {
+                'completeness': self._evaluate_completeness(schedule),
+                'distribution': self._evaluate_distribution(schedule),
+                'teacher_load': self._evaluate_teacher_load(schedule),
+                'room_usage': self._evaluate_room_usage(schedule),
+                'constraints': self._evaluate_constraints(schedule)
+            }
+        except Exception as e:
+            self.logger.error(f"Error calculating metrics: {str(e)}")
+            return (0.0,)
+
+        # Obliczenie kar i nagród
+        penalties = self._calculate_penalties(schedule, metrics)
+        rewards = self._calculate_rewards(schedule, metrics)
+
+        # Obliczenie wyniku
+        total_score = sum(
+            score * self.weights[metric]
+            for metric, score in metrics.items()
+        )
+
+        # Aplikacja kar i nagród
+        total_score = max(0, min(100, total_score - sum(penalties.values()) + sum(rewards.values())))
+        return (total_score,)
+
     def _evaluate_completeness(self, schedule: 'Schedule') -> float:
         """Ocenia kompletność planu lekcji"""
         try:
@@ -1,16 +1,26 @@
 # src/algorithms/genetic_generator.py
 
 import json
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Generator, List, Optional, Tuple
 
+import numpy as np
 from deap import base, tools
 
 from src.genetic.creator import create_base_types, get_individual_class
+from src.genetic.genetic_annealing import SimulatedAnnealing
+from src.genetic.genetic_checkpoint import load_checkpoint
+from src.genetic.genetic_construction import DSaturInitializer
+from src.genetic.genetic_encoding import chromosome_length, encode_lesson, gene_to_record, record_to_gene
 from src.genetic.genetic_evaluator import GeneticEvaluator
+from src.genetic.genetic_islands import IslandModel
 from src.genetic.genetic_operators import GeneticOperators
+from src.genetic.genetic_parallel import ParallelEvaluator
 from src.genetic.genetic_population import PopulationManager
+from src.genetic.genetic_tabu import TabuSearch
+from src.genetic.genetic_utils import EvolutionResult, GenerationResult, run_to_completion
 from src.models.lesson import Lesson
 from src.models.schedule import Schedule
 from src.models.school import School
@@ -19,6 +29,12 @@ from src.utils.validators import ScheduleValidator
 
 
 class ScheduleGenerator:
+    # Domyślny plik najlepszego znanego rozwiązania (parametr 'best_solution_path')
+    BEST_SOLUTION_PATH = 'data/best_solution.json'
+
+    # Optymalizatory (parametr 'optimizer'): algorytm genetyczny, symulowane wyżarzanie lub przeszukiwanie tabu
+    OPTIMIZERS = ('genetic', 'annealing', 'tabu')
+
     def __init__(self, school: School, params: Dict):
         self.school = school
         self.params = params
@@ -28,7 +44,14 @@ class ScheduleGenerator:
         # Komponenty algorytmu genetycznego
         self.operators = GeneticOperators(school)  # Najpierw operators
         self.evaluator = GeneticEvaluator(school, self.operators, params)  # Potem evaluator z operators
-        self.population_manager = PopulationManager(school)
+        self.population_manager = PopulationManager(school, self.evaluator)
+        self._island_model: Optional[IslandModel] = None
+        self._annealing: Optional[SimulatedAnnealing] = None
+        self._tabu: Optional[TabuSearch] = None
+
+        self.optimizer = params.get('optimizer', 'genetic')
+        if self.optimizer not in self.OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer: {self.optimizer}")
 
         # Inicjalizacja DEAP
         self._setup_deap()
@@ -52,15 +75,20 @@ class ScheduleGenerator:
                 self.operators.random_lesson_slot
             )
 
-            # Ważne - użyj get_individual_class zamiast creator.Individual
-            individual_class = get_individual_class()
-            self.toolbox.register(
-                "individual",
-                tools.initRepeat,
-                individual_class,
-                self.toolbox.lesson_slot,
-                n=self._calculate_total_lessons()
-            )
+            # Chromosom ma stałą szerokość: wymagane lekcje + zapas pustych genów
+            self.total_lessons = self._calculate_total_lessons()
+            self.chromosome_length = chromosome_length(self.total_lessons)
+
+            # Osobniki populacji początkowej: heurystyka DSATUR ('dsatur') lub losowe sloty ('random')
+            initializer = self.params.get('initializer', 'dsatur')
+            if initializer == 'dsatur':
+                self.initializer = DSaturInitializer(self.school)
+                self.toolbox.register("individual", self._constructed_individual)
+            elif initializer == 'random':
+                self.initializer = None
+                self.toolbox.register("individual", self._random_individual)
+            else:
+                raise ValueError(f"Unknown initializer: {initializer}")
 
             self.toolbox.register(
                 "population",
@@ -71,16 +99,50 @@ class ScheduleGenerator:
 
             # Operatory genetyczne
             self.toolbox.register("evaluate", self.evaluator.evaluate_schedule)
+            self.toolbox.register("evaluate_population", self.evaluator.evaluate_population)
             self.toolbox.register("mate", self.operators.crossover)
             self.toolbox.register("mutate", self.operators.mutation)
             self.toolbox.register("select", tools.selTournament, tournsize=3)
 
+            # Opcjonalna równoległa ocena w puli procesów — używana przez evaluate_population
+            self.parallel = self._setup_parallel()
+            if self.parallel is not None:
+                self.evaluator.parallel = self.parallel
+
             self.logger.info("DEAP toolbox initialized successfully")
 
         except Exception as e:
             self.logger.error(f"Error setting up DEAP: {str(e)}")
             raise RuntimeError("Failed to initialize genetic algorithm components")
 
+    def _setup_parallel(self) -> Optional[ParallelEvaluator]:
+        """Tworzy pulę procesów, jeśli parametr 'workers' jest większy od 1"""
+        workers = int(self.params.get('workers') or 1)
+        if workers <= 1:
+            return None
+
+        if self.evaluator.kernel is None:
+            self.logger.warning("Parallel evaluation requires the numpy evaluator backend, using a single process")
+            return None
+
+        self.logger.info(f"Parallel evaluation enabled with {workers} workers")
+        return ParallelEvaluator(self.evaluator.kernel, workers, self.params.get('chunk_size'))
+
+    def _random_individual(self):
+        """Tworzy losowego osobnika: wymagane lekcje z losowych slotów, reszta to puste geny"""
+        # Ważne - użyj get_individual_class zamiast creator.Individual
+        individual_class = get_individual_class()
+        genes = [self.toolbox.lesson_slot() for _ in range(self.total_lessons)]
+        genes.extend([None] * (self.chromosome_length - self.total_lessons))
+        return individual_class(genes)
+
+    def _constructed_individual(self):
+        """Tworzy osobnika heurystyką DSATUR: komplet wymaganych lekcji, reszta to puste geny"""
+        individual_class = get_individual_class()
+        genes = self.initializer.build()
+        genes.extend([None] * (self.chromosome_length - len(genes)))
+        return individual_class(genes)
+
     def _calculate_total_lessons(self) -> int:
         """Oblicza całkowitą liczbę lekcji do zaplanowania"""
         try:
@@ -88,12 +150,12 @@ class ScheduleGenerator:
             for class_group in self.school.class_groups:
                 class_total = sum(subject.hours_per_week for subject in class_group.subjects)
                 self.logger.debug(
-                    f"Class {class_group.name} needs {class_total} lessons per week",
-                    cache_key=f"lessons_count_{class_group.name}"
+                    "Class %s needs %d lessons per week", class_group.name, class_total,
+                    cache_key=('lessons_count', class_group.name)
                 )
                 total += class_total
 
-            self.logger.info(f"Total lessons to schedule: {total}")
+            self.logger.info("Total lessons to schedule: %d", total)
             return total
 
         except Exception as e:
@@ -101,29 +163,39 @@ class ScheduleGenerator:
             raise ValueError("Could not calculate required lessons")
 
     def _load_best_solution(self) -> Optional[List]:
-        """Wczytuje najlepsze znane rozwiązanie"""
+        """
+        Wczytuje najlepsze znane rozwiązanie i koduje je dla bieżącej szkoły.
+        Lekcje odwołujące się do nieistniejących klas lub zasobów są pomijane.
+        """
         try:
-            path = Path('data/best_solution.json')
+            path = Path(self.params.get('best_solution_path', self.BEST_SOLUTION_PATH))
             if not path.exists():
                 return None
 
             with open(path, 'r') as f:
                 data = json.load(f)
-                self.logger.info(f"Loaded best known solution with fitness: {data['fitness']}")
-                return data['solution']
+
+            solution = [record_to_gene(self.school, record) for record in data['solution']]
+
+            # Dopasuj długość do szerokości chromosomu
+            solution = solution[:self.chromosome_length]
+            solution.extend([None] * (self.chromosome_length - len(solution)))
+
+            self.logger.info(f"Loaded best known solution with fitness: {data['fitness']}")
+            return solution
 
         except Exception as e:
             self.logger.warning(f"Could not load best solution: {str(e)}")
             return None
 
-    def _save_best_solution(self, solution: List, fitness: float):
-        """Zapisuje najlepsze rozwiązanie"""
+    def _save_best_solution(self, solution: np.ndarray, fitness: float):
+        """Zapisuje najlepsze rozwiązanie (z nazwami zamiast indeksów, aby przetrwało zmianę konfiguracji)"""
         try:
-            path = Path('data/best_solution.json')
+            path = Path(self.params.get('best_solution_path', self.BEST_SOLUTION_PATH))
             path.parent.mkdir(parents=True, exist_ok=True)
 
             data = {
-                'solution': solution,
+                'solution': [gene_to_record(self.school, gene) for gene in solution.tolist()],
                 'fitness': fitness,
                 'timestamp': datetime.now().isoformat()
             }
@@ -190,6 +262,22 @@ class ScheduleGenerator:
 
         return schedule
 
+    def _generate_seed_schedule(self) -> Schedule:
+        """
+        Plan dodawany do początkowej populacji: przy 'seed_solver' == 'milp' rozwiązanie
+        MILPSolver (z limitem czasu 'solver_time_limit'), w przeciwnym razie plan podstawowy.
+        """
+        if self.params.get('seed_solver') == 'milp':
+            # Import lokalny — pakiet solvers korzysta z modułów pakietu genetic
+            from src.solvers.milp_solver import MILPSolver
+
+            try:
+                return MILPSolver(self.school, self.params).solve()
+            except Exception as e:
+                self.logger.warning(f"MILP seed failed, using basic schedule: {str(e)}")
+
+        return self._generate_basic_schedule()
+
     def _add_basic_lesson(self, schedule, class_group, day, hour, subject):
         """
         Pomocnicza metoda do dodawania podstawowych lekcji.
@@ -206,26 +294,13 @@ class ScheduleGenerator:
         """
         try:
             # Znajdź dostępnych nauczycieli dla tego przedmiotu
-            available_teachers = [
-                t for t in self.school.teachers.values()
-                if subject.name in t.subjects
-            ]
+            available_teachers = self.school.subject_teachers[subject.name]
 
             if not available_teachers:
                 return False
 
             # Znajdź odpowiednie sale
-            suitable_rooms = [
-                r for r in self.school.classrooms.values()
-                if self.operators.is_room_suitable(Lesson(
-                    subject=subject,
-                    teacher=None,
-                    classroom=r,
-                    class_group=class_group.name,
-                    day=day,
-                    hour=hour
-                ))
-            ]
+            suitable_rooms = self.school.subject_rooms[subject.name]
 
             if not suitable_rooms:
                 return False
@@ -258,9 +333,41 @@ class ScheduleGenerator:
             self.logger.error(f"Błąd podczas dodawania podstawowej lekcji: {str(e)}")
             return False
 
-    def generate(self, progress_callback=None):
-        """Główna funkcja generująca plan"""
+    def generate(self, progress_callback=None, resume_from: Optional[str] = None):
+        """
+        Główna funkcja generująca plan (blokuje do końca ewolucji, patrz generate_iter).
+
+        Args:
+            progress_callback: Funkcja do raportowania postępu
+            resume_from: Ścieżka checkpointu, od którego należy wznowić ewolucję
+
+        Returns:
+            Krotka (najlepszy plan, historia postępu, GenerationStats)
+        """
+        return run_to_completion(self.generate_iter(progress_callback, resume_from))
+
+    def generate_iter(self, progress_callback=None, resume_from: Optional[str] = None,
+                      include_best: bool = False) -> Generator[GenerationResult, None, Tuple]:
+        """
+        Generuje plan, zwracając migawkę po każdej generacji.
+
+        Konsument pobiera migawki we własnym tempie; zamknięcie generatora (close())
+        przerywa ewolucję. Bieżące najlepsze rozwiązanie jest zawsze dostępne przez
+        current_best() / current_best_schedule().
+
+        Args:
+            progress_callback: Funkcja do raportowania postępu
+            resume_from: Ścieżka checkpointu, od którego należy wznowić ewolucję
+            include_best: Czy dołączać do migawek kopię najlepszego osobnika
+
+        Yields:
+            GenerationResult dla każdej generacji
+
+        Returns:
+            Krotka (najlepszy plan, historia postępu, GenerationStats) (wartość StopIteration)
+        """
         self.logger.info("Starting schedule generation")
+        evolution = None
 
         try:
             # Sprawdzamy tylko, czy szkoła ma klasy
@@ -268,30 +375,83 @@ class ScheduleGenerator:
                 self.logger.error("No classes defined in school")
                 raise ValueError("School has no classes defined")
 
-            # Generowanie podstawowego planu
-            basic_schedule = self._generate_basic_schedule()
+            # Generowanie podstawowego planu (lub rozwiązania MILP, parametr 'seed_solver')
+            basic_schedule = self._generate_seed_schedule()
 
             # Konwersja podstawowego planu do formatu osobnika
             basic_individual = self._convert_schedule_to_individual(basic_schedule)
 
-            # Generowanie początkowej populacji
-            population = self.population_manager.initialize_population(
-                self.toolbox,
-                self.params['population_size'],
-                self.best_known_solution,
-                basic_individual
-            )
-
             self.population_manager.set_params(self.params)
 
-            # Główna pętla ewolucyjna
-            result = self.population_manager.evolve_population(
-                population,
-                self.toolbox,
-                self.operators,
-                self.params,
-                progress_callback
-            )
+            if self.optimizer == 'annealing':
+                # Wyżarzanie jednego planu zamiast ewolucji populacji
+                if resume_from is not None or self.params.get('checkpoint_path'):
+                    self.logger.warning("Checkpoints are not supported by simulated annealing - ignoring")
+                self._annealing = SimulatedAnnealing(self.school, self.evaluator, self.params)
+                evolution = self._annealing.anneal_iter(
+                    self._single_solution_start(basic_individual), progress_callback
+                )
+            elif self.optimizer == 'tabu':
+                # Przeszukiwanie tabu jednego planu zamiast ewolucji populacji
+                if resume_from is not None or self.params.get('checkpoint_path'):
+                    self.logger.warning("Checkpoints are not supported by tabu search - ignoring")
+                self._tabu = TabuSearch(self.school, self.evaluator, self.params)
+                evolution = self._tabu.search_iter(
+                    self._single_solution_start(basic_individual), progress_callback
+                )
+            elif int(self.params.get('islands') or 1) > 1:
+                # Model wyspowy — subpopulacje w osobnych procesach z migracją
+                if resume_from is not None or self.params.get('checkpoint_path'):
+                    self.logger.warning("Checkpoints are not supported by the island model - ignoring")
+                self._island_model = IslandModel(self.school, self.params, self.population_manager)
+                evolution = self._island_model.evolve_iter(
+                    self.best_known_solution, basic_individual, progress_callback
+                )
+            else:
+                checkpoint = None
+                if resume_from is not None:
+                    # Wznowienie — populacja, hall of fame i stan RNG pochodzą z checkpointu
+                    checkpoint = load_checkpoint(resume_from)
+                    if checkpoint.population_genes.shape[1] != self.chromosome_length:
+                        raise ValueError(
+                            f"Checkpoint chromosome length {checkpoint.population_genes.shape[1]} "
+                            f"does not match {self.chromosome_length}"
+                        )
+                    population = None
+                else:
+                    # Generowanie początkowej populacji
+                    population = self.population_manager.initialize_population(
+                        self.toolbox,
+                        self.params['population_size'],
+                        self.best_known_solution,
+                        basic_individual
+                    )
+
+                # Główna pętla ewolucyjna
+                evolution = self.population_manager.evolve_iter(
+                    population,
+                    self.toolbox,
+                    self.operators,
+                    self.params,
+                    progress_callback,
+                    checkpoint
+                )
+
+            # Intensyfikacja — przeszukiwanie tabu najlepszego planu po zakończeniu optymalizacji
+            intensification = float(self.params.get('tabu_intensification') or 0)
+            if intensification > 0 and self.optimizer != 'tabu':
+                evolution = self._intensify(evolution, intensification, progress_callback)
+
+            while True:
+                try:
+                    snapshot = next(evolution)
+                except StopIteration as finished:
+                    result = finished.value
+                    break
+
+                if include_best:
+                    snapshot.best_individual = self.current_best()
+                yield snapshot
 
             best_schedule = self.operators.convert_to_schedule(result.best_individual)
             self._save_best_solution(result.best_individual, result.best_fitness)
@@ -307,26 +467,98 @@ class ScheduleGenerator:
             self.logger.error("Fatal error during schedule generation", exc_info=True)
             raise RuntimeError(f"Schedule generation failed: {str(e)}")
 
+        finally:
+            # Przy przerwaniu zamknij także ewolucję (checkpoint, zatrzymanie wysp)
+            if evolution is not None:
+                evolution.close()
+            self._island_model = None
+            self._annealing = None
+            self._tabu = None
+            if self.parallel is not None:
+                self.parallel.close()
+
+    def current_best(self):
+        """
+        Kopia najlepszego dotąd osobnika (lub None, jeśli ewolucja jeszcze nie oceniła populacji).
+        W modelu wyspowym dostępna tylko w trakcie generate_iter.
+        """
+        if self._tabu is not None and self._tabu.best_plan is not None:
+            return self._tabu.best()
+        if self._island_model is not None:
+            return self._island_model.best()
+        if self._annealing is not None:
+            return self._annealing.best()
+        if not len(self.population_manager.hall_of_fame):
+            return None
+        return self.toolbox.clone(self.population_manager.hall_of_fame[0])
+
+    def current_best_schedule(self) -> Optional[Schedule]:
+        """Najlepszy dotąd plan (lub None)"""
+        best = self.current_best()
+        return self.operators.convert_to_schedule(best) if best is not None else None
+
+    def _intensify(self, evolution: Generator[GenerationResult, None, EvolutionResult], time_limit: float,
+                   progress_callback=None) -> Generator[GenerationResult, None, EvolutionResult]:
+        """
+        Przekazuje migawki optymalizacji, a potem poprawia jej najlepszy plan przeszukiwaniem tabu
+        (parametr 'tabu_intensification' — budżet w sekundach). Kroki tabu numerowane są dalej
+        jak generacje, a wynik łączy historię i statystyki obu etapów.
+        """
+        result = yield from evolution
+
+        if self.evaluator.kernel is None:
+            self.logger.warning("Tabu intensification requires the numpy evaluator backend - skipping")
+            return result
+
+        self._tabu = TabuSearch(self.school, self.evaluator, self.params, time_limit=time_limit)
+        first_step = result.stats.total_generations
+        intensified = yield from self._tabu.search_iter(result.best_individual, progress_callback, first_step)
+        self.logger.info(
+            "Tabu intensification: fitness %.2f -> %.2f", result.best_fitness, intensified.best_fitness
+        )
+
+        best_individual, best_fitness = result.best_individual, result.best_fitness
+        if intensified.best_fitness > best_fitness:
+            best_individual, best_fitness = intensified.best_individual, intensified.best_fitness
+
+        return EvolutionResult(
+            best_individual=best_individual,
+            best_fitness=best_fitness,
+            progress_history=result.progress_history + intensified.progress_history,
+            stats=replace(
+                result.stats,
+                total_time=result.stats.total_time + intensified.stats.total_time,
+                total_generations=first_step + intensified.stats.total_generations,
+                best_fitness=best_fitness,
+                timestamp=intensified.stats.timestamp
+            )
+        )
+
+    def _single_solution_start(self, basic_individual) -> np.ndarray:
+        """
+        Plan początkowy wyżarzania i przeszukiwania tabu: najlepszy z najlepszego znanego rozwiązania,
+        planu podstawowego (lub rozwiązania MILP) i osobnika z inicjalizatora populacji
+        """
+        individual_class = get_individual_class()
+        candidates = [self.toolbox.individual(), individual_class(basic_individual)]
+        if self.best_known_solution is not None:
+            candidates.append(individual_class(self.best_known_solution))
+
+        for candidate in candidates:
+            candidate.fitness.values = self.toolbox.evaluate(candidate)
+        return max(candidates, key=lambda candidate: candidate.fitness.values[0])
+
     def _convert_schedule_to_individual(self, schedule):
         """Konwertuje obiekt Schedule na format osobnika (chromosomu)"""
         individual = []
 
         for lesson in schedule.lessons:
-            # Format: (day, hour, class_group, subject.name, teacher.id, classroom.id)
-            lesson_tuple = (
-                lesson.day,
-                lesson.hour,
-                lesson.class_group,
-                lesson.subject.name,
-                lesson.teacher.id,
-                lesson.classroom.id
-            )
-            individual.append(lesson_tuple)
+            # Format: (day, hour, class_idx, subject_idx, teacher_idx, classroom_idx)
+            individual.append(encode_lesson(self.school, lesson))
 
-        # Uzupełnij do wymaganej długości
-        required_lessons = self._calculate_total_lessons()
-        if len(individual) < required_lessons:
+        # Uzupełnij do szerokości chromosomu
+        if len(individual) < self.chromosome_length:
             # Dodaj None dla brakujących lekcji
-            individual.extend([None] * (required_lessons - len(individual)))
+            individual.extend([None] * (self.chromosome_length - len(individual)))
 
         return individual
@@ -0,0 +1,359 @@
+# src/genetic/genetic_islands.py
+
+"""
+Model wyspowy algorytmu genetycznego.
+
+Każda wyspa to osobny proces z własną subpopulacją, operatorami (i ich adaptive_rates)
+oraz toolboxem. Co migration_interval generacji wyspy wymieniają najlepsze osobniki
+według topologii 'ring' (do następnej wyspy) lub 'full' (do wszystkich pozostałych).
+Proces główny scala statystyki wysp w EvolutionResult / GenerationStats.
+"""
+
+import math
+import multiprocessing
+import random
+import time
+from datetime import datetime
+from typing import Dict, Generator, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from deap import tools
+
+from src.genetic.creator import get_individual_class
+from src.genetic.genetic_population import _should_stop
+from src.genetic.genetic_utils import (
+    EvolutionResult, GenerationResult, GenerationStats, run_to_completion, summarize_local_search, summarize_phases
+)
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+if TYPE_CHECKING:
+    from src.genetic.genetic_population import PopulationManager
+
+# Migrant przesyłany między procesami: (tablica genów, wartości fitness)
+Migrant = Tuple[np.ndarray, Tuple[float, ...]]
+
+
+def _island_worker(connection, school: School, params: Dict, seed: int, population_size: int,
+                   best_known: Optional[List], basic_individual: Optional[List]):
+    """
+    Pętla procesu wyspy — wykonuje polecenia przesyłane przez IslandModel.
+
+    Polecenia: ('evolve', k), ('emigrants', n), ('immigrants', migranci), ('best', None), ('stop', None).
+    Odpowiedzi mają postać ('ok', dane) lub ('error', komunikat).
+    """
+    # Import lokalny — genetic_generator importuje ten moduł
+    from src.genetic.genetic_generator import ScheduleGenerator
+
+    logger = GPLLogger(__name__)
+    try:
+        random.seed(seed)
+        np.random.seed(seed % 2 ** 32)
+
+        generator = ScheduleGenerator(school, params)
+        manager = generator.population_manager
+        manager.set_params(params)
+        population = manager.initialize_population(
+            generator.toolbox, population_size, best_known, basic_individual
+        )
+        individual_class = get_individual_class()
+    except Exception as e:
+        logger.error(f"Error initializing island: {str(e)}")
+        connection.send(('error', str(e)))
+        connection.close()
+        return
+
+    connection.send(('ok', None))
+
+    while True:
+        try:
+            command, payload = connection.recv()
+        except EOFError:
+            break
+
+        if command == 'stop':
+            break
+
+        try:
+            if command == 'evolve':
+                records = []
+                for _ in range(payload):
+                    gen_start = time.time()
+                    record = manager.evolve_generation(population, generator.toolbox, generator.operators)
+                    records.append((record, time.time() - gen_start))
+                connection.send(('ok', records))
+
+            elif command == 'emigrants':
+                best = tools.selBest(population, payload)
+                connection.send(('ok', [(np.asarray(ind).copy(), ind.fitness.values) for ind in best]))
+
+            elif command == 'immigrants':
+                # Migranci zastępują najsłabsze osobniki wyspy
+                worst = sorted(range(len(population)), key=lambda i: population[i].fitness.values[0])
+                for index, (genes, fitness) in zip(worst, payload):
+                    immigrant = individual_class(genes)
+                    immigrant.fitness.values = fitness
+                    population[index] = immigrant
+                connection.send(('ok', None))
+
+            elif command == 'best':
+                best = manager.hall_of_fame[0] if len(manager.hall_of_fame) else tools.selBest(population, 1)[0]
+                connection.send(('ok', (np.asarray(best).copy(), best.fitness.values)))
+
+            else:
+                connection.send(('error', f"Unknown island command: {command}"))
+
+        except Exception as e:
+            logger.error(f"Error on island during '{command}': {str(e)}")
+            connection.send(('error', str(e)))
+
+    connection.close()
+
+
+def merge_records(records: List[Dict]) -> Dict:
+    """Scala statystyki generacji z wysp o równej liczebności w statystyki całej populacji"""
+    avg = float(np.mean([record['avg'] for record in records]))
+    # Wariancja łączna: średnia z (std² + avg²) minus kwadrat średniej całkowitej
+    second_moment = np.mean([record['std'] ** 2 + record['avg'] ** 2 for record in records])
+    merged = {
+        'avg': avg,
+        'std': float(math.sqrt(max(0.0, second_moment - avg ** 2))),
+        'min': float(min(record['min'] for record in records)),
+        'max': float(max(record['max'] for record in records))
+    }
+
+    # Wyspy działają równolegle, więc czas fazy to czas najwolniejszej wyspy
+    if all('phases' in record for record in records):
+        merged['phases'] = {
+            phase: max(record['phases'].get(phase, 0.0) for record in records)
+            for phase in records[0]['phases']
+        }
+
+    # Przeszukiwanie lokalne: czas najwolniejszej wyspy, pozostałe wartości sumowane
+    if all('local_search' in record for record in records):
+        merged['local_search'] = {
+            key: (max if key == 'time' else sum)(record['local_search'][key] for record in records)
+            for key in records[0]['local_search']
+        }
+    return merged
+
+
+class IslandModel:
+    """Uruchamia ewolucję na kilku wyspach (procesach) z okresową migracją"""
+
+    TOPOLOGIES = ('ring', 'full')
+
+    def __init__(self, school: School, params: Dict, population_manager: 'PopulationManager'):
+        """
+        Args:
+            school: Szkoła, dla której generujemy plan
+            params: Parametry algorytmu ('islands', 'migration_interval', 'migration_size',
+                'migration_topology' oraz parametry zwykłej ewolucji)
+            population_manager: Menedżer populacji procesu głównego (raportowanie postępu)
+        """
+        self.school = school
+        self.params = params
+        self.population_manager = population_manager
+        self.logger = GPLLogger(__name__)
+
+        self.n_islands = int(params['islands'])
+        self.migration_interval = max(1, int(params.get('migration_interval', 10)))
+        self.migration_size = max(0, int(params.get('migration_size', 2)))
+        self.topology = params.get('migration_topology', 'ring')
+        if self.topology not in self.TOPOLOGIES:
+            raise ValueError(f"Unknown migration topology: {self.topology}")
+
+        # Łączna wielkość populacji jest dzielona między wyspy
+        self.island_size = max(2, params['population_size'] // self.n_islands)
+
+        self._connections = []
+        self._processes = []
+
+    def evolve(self, best_known: Optional[List], basic_individual: Optional[List],
+               progress_callback=None) -> EvolutionResult:
+        """
+        Przeprowadza ewolucję na wyspach do końca (patrz evolve_iter).
+
+        Returns:
+            EvolutionResult z najlepszym osobnikiem ze wszystkich wysp
+        """
+        return run_to_completion(self.evolve_iter(best_known, basic_individual, progress_callback))
+
+    def evolve_iter(self, best_known: Optional[List], basic_individual: Optional[List],
+                    progress_callback=None) -> Generator[GenerationResult, None, EvolutionResult]:
+        """
+        Przeprowadza ewolucję na wyspach, zwracając scalony wynik każdej generacji.
+        Zamknięcie generatora zatrzymuje procesy wysp.
+
+        Args:
+            best_known: Najlepsze znane rozwiązanie (lub None)
+            basic_individual: Osobnik z podstawowego planu (lub None)
+            progress_callback: Funkcja do raportowania postępu
+
+        Yields:
+            GenerationResult po każdej generacji (bez najlepszego osobnika)
+
+        Returns:
+            EvolutionResult z najlepszym osobnikiem ze wszystkich wysp (wartość StopIteration)
+        """
+        try:
+            start_time = time.time()
+            self._start_islands(best_known, basic_individual)
+
+            n_generations = self.params.get('iterations', 1000)
+            generation_times = []
+            progress_history = []
+            prev_best = []
+            record = None
+            gen = 0
+            stopped = False
+
+            while gen < n_generations and not stopped:
+                epoch = min(self.migration_interval, n_generations - gen)
+                island_records = self._broadcast('evolve', [epoch] * self.n_islands)
+
+                # Scal statystyki wysp generacja po generacji
+                for step in range(epoch):
+                    record = merge_records([records[step][0] for records in island_records])
+                    gen_time = max(records[step][1] for records in island_records)
+                    generation_times.append(gen_time)
+
+                    progress = self.population_manager._record_progress(gen, record, gen_time, progress_callback)
+                    progress_history.append(progress)
+
+                    yield GenerationResult(
+                        generation=gen,
+                        best_fitness=record['max'],
+                        avg_fitness=record['avg'],
+                        time=gen_time,
+                        stats=record,
+                        progress=progress
+                    )
+
+                    prev_best.append(record['max'])
+                    if _should_stop(record, gen, prev_best):
+                        self.logger.info(f"Stopping early at generation {gen} - achieved desired fitness")
+                        stopped = True
+                        break
+                    gen += 1
+
+                if not stopped and gen < n_generations:
+                    self._migrate()
+
+            best_individual = self.best()
+            fitness = best_individual.fitness.values
+
+            total_time = time.time() - start_time
+            stats = GenerationStats(
+                total_time=total_time,
+                avg_generation_time=np.mean(generation_times),
+                min_generation_time=min(generation_times),
+                max_generation_time=max(generation_times),
+                total_generations=len(generation_times),
+                best_fitness=fitness[0],
+                avg_fitness=record['avg'],
+                timestamp=datetime.now(),
+                phase_times=summarize_phases(progress_history),
+                local_search=summarize_local_search(progress_history)
+            )
+
+            return EvolutionResult(
+                best_individual=best_individual,
+                best_fitness=fitness[0],
+                progress_history=progress_history,
+                stats=stats
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error during island evolution: {str(e)}")
+            raise
+
+        finally:
+            self._stop_islands()
+
+    def best(self):
+        """Najlepszy dotąd osobnik ze wszystkich wysp (wymaga działających wysp)"""
+        genes, fitness = max(self._broadcast('best', [None] * self.n_islands), key=lambda item: item[1][0])
+        best_individual = get_individual_class()(genes)
+        best_individual.fitness.values = fitness
+        return best_individual
+
+    def _start_islands(self, best_known: Optional[List], basic_individual: Optional[List]):
+        """Uruchamia procesy wysp i czeka na inicjalizację ich populacji"""
+        # Wyspy nie tworzą własnych wysp ani pul procesów
+        island_params = {key: value for key, value in self.params.items() if key not in ('islands', 'workers')}
+        island_params['population_size'] = self.island_size
+
+        self.logger.info(
+            f"Starting {self.n_islands} islands of {self.island_size} individuals "
+            f"({self.topology} topology, migration every {self.migration_interval} generations)"
+        )
+
+        for _ in range(self.n_islands):
+            # Ziarna wysp pochodzą z głównego generatora, więc przebieg jest powtarzalny
+            seed = random.randrange(2 ** 32)
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_island_worker,
+                args=(child_connection, self.school, island_params, seed, self.island_size,
+                      best_known, basic_individual),
+                daemon=True
+            )
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+        for connection in self._connections:
+            self._receive(connection)
+
+    def _broadcast(self, command: str, payloads: List) -> List:
+        """Wysyła polecenie do wszystkich wysp (równolegle) i zbiera odpowiedzi w kolejności wysp"""
+        for connection, payload in zip(self._connections, payloads):
+            connection.send((command, payload))
+        return [self._receive(connection) for connection in self._connections]
+
+    @staticmethod
+    def _receive(connection):
+        """Odbiera odpowiedź wyspy; błąd po stronie wyspy zgłaszany jest jako RuntimeError"""
+        status, payload = connection.recv()
+        if status != 'ok':
+            raise RuntimeError(f"Island failed: {payload}")
+        return payload
+
+    def _migrate(self):
+        """Wymienia najlepsze osobniki między wyspami zgodnie z topologią"""
+        if self.migration_size <= 0 or self.n_islands < 2:
+            return
+
+        emigrants = self._broadcast('emigrants', [self.migration_size] * self.n_islands)
+
+        immigrants: List[List[Migrant]] = [[] for _ in range(self.n_islands)]
+        for source, migrants in enumerate(emigrants):
+            if self.topology == 'ring':
+                targets = [(source + 1) % self.n_islands]
+            else:
+                targets = [target for target in range(self.n_islands) if target != source]
+            for target in targets:
+                immigrants[target].extend(migrants)
+
+        # Migranci nie mogą wyprzeć całej populacji wyspy
+        immigrants = [migrants[:self.island_size - 1] for migrants in immigrants]
+        self._broadcast('immigrants', immigrants)
+
+        self.logger.debug(f"Migrated {sum(len(migrants) for migrants in immigrants)} individuals between islands")
+
+    def _stop_islands(self):
+        """Zatrzymuje procesy wysp"""
+        for connection in self._connections:
+            try:
+                connection.send(('stop', None))
+                connection.close()
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
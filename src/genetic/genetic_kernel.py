@@ -0,0 +1,293 @@
+# src/genetic/genetic_kernel.py
+
+"""
+Wektorowe (NumPy) obliczanie funkcji przystosowania.
+
+Kernel odtwarza wynik ścieżki GeneticEvaluator -> convert_to_schedule -> _evaluate_*:
+dekoduje chromosomy do tablic zajętości osobnik × zasób × dzień × godzina
+(klasa, nauczyciel, sala), a wszystkie metryki liczy redukcjami NumPy.
+Cała populacja jest oceniana naraz jako tablica (osobniki × geny × pola).
+Nie trzyma loggera, więc da się go bez problemu serializować.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.genetic.genetic_encoding import DAY, HOUR, CLASS, SUBJECT, TEACHER, ROOM, DAYS, HOURS_PER_DAY
+from src.models.school import School
+
+# Liczba slotów przyjmowana przez Schedule.get_classroom_usage
+ROOM_TOTAL_SLOTS = 40
+
+
+class FitnessKernel:
+    """Oblicza metryki i wynik planu bezpośrednio na tablicy genów"""
+
+    METRICS = ('completeness', 'distribution', 'teacher_load', 'room_usage', 'constraints')
+
+    def __init__(self, school: School, weights: Dict[str, float]):
+        self.weights = dict(weights)
+
+        self.n_classes = len(school.class_groups)
+        self.n_subjects = len(school.subject_list)
+        self.n_teachers = len(school.teacher_list)
+        self.n_rooms = len(school.classroom_list)
+
+        # Wymagana liczba godzin i rocznik każdej klasy
+        self.required_hours = np.array(
+            [sum(subject.hours_per_week for subject in class_group.subjects)
+             for class_group in school.class_groups],
+            dtype=np.int64
+        )
+        self.first_year = np.array([class_group.year == 1 for class_group in school.class_groups])
+
+        # Limity nauczycieli
+        self.max_hours_per_day = np.array([t.max_hours_per_day for t in school.teacher_list], dtype=np.int64)
+        self.max_hours_per_week = np.array([t.max_hours_per_week for t in school.teacher_list], dtype=np.int64)
+
+        # Tabela przedmiot × sala: czy sala jest odpowiednia (z tabel dopasowań szkoły)
+        self.room_suitable = np.zeros((self.n_subjects, self.n_rooms), dtype=bool)
+        for subject_idx, subject in enumerate(school.subject_list):
+            for room in school.subject_rooms[subject.name]:
+                self.room_suitable[subject_idx, school.classroom_index[room.id]] = True
+
+    def fitness(self, genes: np.ndarray) -> float:
+        """Zwraca wynik planu (0-100) dla pojedynczego osobnika"""
+        return float(self.fitness_batch(np.asarray(genes)[None])[0])
+
+    def metrics(self, genes: np.ndarray) -> Optional[Dict[str, float]]:
+        """Zwraca metryki planu albo None, jeśli po dekodowaniu plan jest pusty"""
+        metrics, has_plan = self.metrics_batch(np.asarray(genes)[None])
+        if not has_plan[0]:
+            return None
+        return {metric: float(values[0]) for metric, values in metrics.items()}
+
+    def fitness_batch(self, genes: np.ndarray) -> np.ndarray:
+        """
+        Ocenia wiele osobników naraz.
+
+        Args:
+            genes: Tablica (osobniki × geny × pola)
+
+        Returns:
+            Tablica wyników (0-100) o długości równej liczbie osobników
+        """
+        metrics, has_plan = self.metrics_batch(genes)
+        return np.where(has_plan, self.combine(metrics), 0.0)
+
+    def metrics_batch(self, genes: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        """
+        Liczy metryki dla wielu osobników naraz.
+
+        Returns:
+            Para (słownik metryka -> tablica wartości, maska osobników z niepustym planem)
+        """
+        genes = np.asarray(genes, dtype=np.int64)
+        n_individuals = genes.shape[0]
+        n_slots = DAYS * HOURS_PER_DAY
+
+        individual, gene = self._decode_batch(genes)
+        lessons = genes[individual, gene]
+        slot = lessons[:, DAY] * HOURS_PER_DAY + lessons[:, HOUR]
+
+        # Tablice zajętości osobnik × zasób × dzień × godzina
+        class_occ = np.bincount(
+            (individual * self.n_classes + lessons[:, CLASS]) * n_slots + slot,
+            minlength=n_individuals * self.n_classes * n_slots
+        ).reshape(n_individuals, self.n_classes, DAYS, HOURS_PER_DAY)
+        teacher_occ = np.bincount(
+            (individual * self.n_teachers + lessons[:, TEACHER]) * n_slots + slot,
+            minlength=n_individuals * self.n_teachers * n_slots
+        ).reshape(n_individuals, self.n_teachers, DAYS, HOURS_PER_DAY)
+        room_occ = np.bincount(
+            (individual * self.n_rooms + lessons[:, ROOM]) * n_slots + slot,
+            minlength=n_individuals * self.n_rooms * n_slots
+        ).reshape(n_individuals, self.n_rooms, DAYS, HOURS_PER_DAY)
+
+        metrics = {
+            'completeness': self._completeness(class_occ),
+            'distribution': self._distribution(class_occ),
+            'teacher_load': self._teacher_load(teacher_occ),
+            'room_usage': self._room_usage(room_occ),
+            'constraints': self._constraints(class_occ, teacher_occ, room_occ)
+        }
+        has_plan = np.bincount(individual, minlength=n_individuals) > 0
+        return metrics, has_plan
+
+    def combine(self, metrics: Dict[str, np.ndarray]) -> np.ndarray:
+        """Łączy metryki w wynik — wagi, kary i nagrody jak w GeneticEvaluator"""
+        total_score = sum(metrics[metric] * self.weights[metric] for metric in self.METRICS)
+
+        completeness = metrics['completeness']
+        distribution = metrics['distribution']
+        teacher_load = metrics['teacher_load']
+
+        # Kary (GeneticEvaluator._calculate_penalties)
+        penalties = (
+            np.where(completeness < 90, (90 - completeness) * 0.5, 0.0) +
+            np.where(distribution < 70, (70 - distribution) * 0.3, 0.0) +
+            np.where(teacher_load < 80, (80 - teacher_load) * 0.4, 0.0)
+        )
+
+        # Nagrody (GeneticEvaluator._calculate_rewards)
+        rewards = (
+            np.where(completeness > 95, (completeness - 95) * 0.5, 0.0) +
+            np.where(distribution > 90, (distribution - 90) * 0.3, 0.0) +
+            np.where(teacher_load > 90, (teacher_load - 90) * 0.4, 0.0)
+        )
+
+        return np.maximum(0, np.minimum(100, total_score - penalties + rewards))
+
+    def combine_one(self, metrics: Dict[str, float]) -> float:
+        """Jak combine, dla metryk jednego planu (liczby Pythona, bez narzutu NumPy na skalarach)"""
+        total_score = sum(metrics[metric] * self.weights[metric] for metric in self.METRICS)
+
+        completeness = metrics['completeness']
+        distribution = metrics['distribution']
+        teacher_load = metrics['teacher_load']
+
+        penalties = (
+            ((90 - completeness) * 0.5 if completeness < 90 else 0.0) +
+            ((70 - distribution) * 0.3 if distribution < 70 else 0.0) +
+            ((80 - teacher_load) * 0.4 if teacher_load < 80 else 0.0)
+        )
+        rewards = (
+            ((completeness - 95) * 0.5 if completeness > 95 else 0.0) +
+            ((distribution - 90) * 0.3 if distribution > 90 else 0.0) +
+            ((teacher_load - 90) * 0.4 if teacher_load > 90 else 0.0)
+        )
+
+        return float(max(0, min(100, total_score - penalties + rewards)))
+
+    def _decode_batch(self, genes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Zwraca pary (indeks osobnika, indeks genu) lekcji, które trafiają do planu.
+
+        Odpowiednik convert_to_schedule: pomija puste i niepoprawne geny oraz lekcje w nieodpowiednich
+        salach, a pozostałe dodaje w kolejności (dzień, godzina), odrzucając te kolidujące z już dodanymi.
+
+        Konflikty występują tylko w obrębie jednego slotu (osobnik, dzień, godzina), więc zachłanne
+        dodawanie wykonujemy falami: w fali r rozpatrujemy r-tą lekcję każdego slotu jednocześnie.
+        """
+        n_individuals = genes.shape[0]
+        n_slots = DAYS * HOURS_PER_DAY
+        day, hour = genes[..., DAY], genes[..., HOUR]
+        class_idx, subject_idx = genes[..., CLASS], genes[..., SUBJECT]
+        teacher_idx, room_idx = genes[..., TEACHER], genes[..., ROOM]
+
+        valid = (
+            (day >= 0) & (day < DAYS) & (hour >= 0) & (hour < HOURS_PER_DAY) &
+            (class_idx >= 0) & (class_idx < self.n_classes) &
+            (subject_idx >= 0) & (subject_idx < self.n_subjects) &
+            (teacher_idx >= 0) & (teacher_idx < self.n_teachers) &
+            (room_idx >= 0) & (room_idx < self.n_rooms)
+        )
+        valid &= self.room_suitable[np.where(valid, subject_idx, 0), np.where(valid, room_idx, 0)]
+
+        # Kandydaci posortowani stabilnie po (osobnik, dzień, godzina), w slocie — w kolejności genów
+        individual, gene = np.nonzero(valid)
+        group = individual * n_slots + day[individual, gene] * HOURS_PER_DAY + hour[individual, gene]
+        order = np.argsort(group, kind='stable')
+        individual, gene, group = individual[order], gene[order], group[order]
+
+        if len(group) == 0:
+            return individual, gene
+
+        # Pozycja lekcji w obrębie jej slotu
+        positions = np.arange(len(group))
+        starts = np.ones(len(group), dtype=bool)
+        starts[1:] = group[1:] != group[:-1]
+        rank = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+
+        class_keys = group * self.n_classes + class_idx[individual, gene]
+        teacher_keys = group * self.n_teachers + teacher_idx[individual, gene]
+        room_keys = group * self.n_rooms + room_idx[individual, gene]
+
+        used_classes = np.zeros(n_individuals * n_slots * self.n_classes, dtype=bool)
+        used_teachers = np.zeros(n_individuals * n_slots * self.n_teachers, dtype=bool)
+        used_rooms = np.zeros(n_individuals * n_slots * self.n_rooms, dtype=bool)
+        accepted = np.zeros(len(group), dtype=bool)
+
+        by_rank = np.argsort(rank, kind='stable')
+        for wave in np.split(by_rank, np.cumsum(np.bincount(rank))[:-1]):
+            class_key, teacher_key, room_key = class_keys[wave], teacher_keys[wave], room_keys[wave]
+            free = ~(used_classes[class_key] | used_teachers[teacher_key] | used_rooms[room_key])
+
+            used_classes[class_key[free]] = True
+            used_teachers[teacher_key[free]] = True
+            used_rooms[room_key[free]] = True
+            accepted[wave[free]] = True
+
+        return individual[accepted], gene[accepted]
+
+    def _completeness(self, class_occ: np.ndarray) -> np.ndarray:
+        """Odpowiednik GeneticEvaluator._evaluate_completeness"""
+        scheduled = class_occ.sum(axis=(2, 3))
+        required = self.required_hours
+
+        # Dramatyczna kara za puste klasy (dodatkowa dla klas pierwszych)
+        penalties = np.where(scheduled == 0, 50.0 + 20.0 * self.first_year, 0.0)
+
+        # Kara za wypełnienie poniżej 80%
+        safe_required = np.where(required > 0, required, 1)
+        completion = np.where(required > 0, scheduled / safe_required, 0.0)
+        penalties = penalties + np.where(completion < 0.8, (0.8 - completion) * 100, 0.0)
+
+        score = 100.0 - penalties.sum(axis=1)
+        total_required = required.sum()
+        overall = scheduled.sum(axis=1) / total_required * 100 if total_required > 0 else 0.0
+        return np.maximum(0, np.minimum(score, overall))
+
+    @staticmethod
+    def _distribution(class_occ: np.ndarray) -> np.ndarray:
+        """Odpowiednik GeneticEvaluator._evaluate_distribution"""
+        occupied = class_occ > 0
+        counts = class_occ.sum(axis=3)
+
+        first = occupied.argmax(axis=3)
+        last = HOURS_PER_DAY - 1 - occupied[..., ::-1].argmax(axis=3)
+        gaps = last - first + 1 - counts
+
+        penalties = (
+            np.where(gaps > 0, 15 * gaps, 0) +
+            np.where(first > 2, 10, 0) +
+            np.where(last > 6, 10, 0)
+        )
+        penalties = np.where(counts > 0, penalties, 0).sum(axis=(1, 2))
+        return np.maximum(0, 100.0 - penalties)
+
+    def _teacher_load(self, teacher_occ: np.ndarray) -> np.ndarray:
+        """Odpowiednik GeneticEvaluator._evaluate_teacher_load"""
+        daily = teacher_occ.sum(axis=3)
+        weekly = daily.sum(axis=2)
+
+        over_daily = np.maximum(daily - self.max_hours_per_day[None, :, None], 0)
+        penalties = 10 * over_daily.sum(axis=(1, 2))
+
+        over_weekly = weekly - self.max_hours_per_week
+        penalties = penalties + np.where(
+            over_weekly > 0, 15 * over_weekly,
+            np.where(weekly < self.max_hours_per_week * 0.5, 10, 0)
+        ).sum(axis=1)
+
+        return np.maximum(0, 100.0 - penalties)
+
+    @staticmethod
+    def _room_usage(room_occ: np.ndarray) -> np.ndarray:
+        """Odpowiednik GeneticEvaluator._evaluate_room_usage"""
+        usage = room_occ.sum(axis=(2, 3)) / ROOM_TOTAL_SLOTS * 100
+
+        penalties = np.where(usage < 30, 10, np.where(usage > 90, 5, 0)).sum(axis=1)
+        rewards = np.where((usage >= 60) & (usage <= 80), 5, 0).sum(axis=1)
+
+        return np.maximum(0, np.minimum(100, 100.0 + rewards - penalties))
+
+    @staticmethod
+    def _constraints(class_occ: np.ndarray, teacher_occ: np.ndarray, room_occ: np.ndarray) -> np.ndarray:
+        """Odpowiednik GeneticEvaluator._evaluate_constraints — każda nadmiarowa lekcja w slocie to konflikt"""
+        conflicts = sum(
+            np.maximum(occ - 1, 0).sum(axis=(1, 2, 3))
+            for occ in (teacher_occ, room_occ, class_occ)
+        )
+        return np.maximum(0, 100.0 - 20 * conflicts)
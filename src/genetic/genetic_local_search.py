@@ -0,0 +1,300 @@
+# src/genetic/genetic_local_search.py
+
+"""
+Przeszukiwanie lokalne (etap memetyczny) najlepszych osobników generacji.
+
+Po ocenie potomków najlepsze osobniki poprawiane są metodą pierwszej poprawy: losowy ruch
+(przeniesienie lekcji do innego slotu albo zamiana slotów dwóch lekcji tej samej klasy)
+jest przyjmowany, jeśli poprawia ocenę, a w przeciwnym razie cofany. Ruchy dotyczą
+najczęściej lekcji odrzuconych przy dekodowaniu (konflikt w slocie). Z tego samego sąsiedztwa
+(NeighbourhoodMoves) korzysta wyżarzanie (genetic_annealing).
+
+Każdy ruch zmienia jeden lub dwa geny, więc ocena jest przyrostowa (DeltaEvaluator), a ruch
+odrzucony jest wycofywany z zapisu zmian stanu (StateUndo) zamiast ponownej oceny.
+Hasz Zobrista nie jest aktualizowany przy każdym ruchu (koszt porównywalny z samą oceną) —
+po zmianie osobnika jest unieważniany i przeliczany dopiero przy potrzebie.
+Wynik 0-100 jest obcinany, dlatego przy remisie decyduje nieobcięta suma kar
+(DeltaEvaluator.penalty) — bez tego plan z metryką rozkładu równą 0 nie miałby kierunku poprawy.
+Budżet etapu to liczba ocen ('local_search_evaluations') i opcjonalnie czas w milisekundach
+('local_search_ms') na generację.
+"""
+
+import random
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.genetic.genetic_delta import DeltaEvaluator, EvaluationState, N_SLOTS, StateUndo
+from src.genetic.genetic_encoding import DAYS, HOURS_PER_DAY
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+if TYPE_CHECKING:
+    from src.genetic.genetic_evaluator import GeneticEvaluator
+
+# Prawdopodobieństwo wyboru lekcji odrzuconej przy dekodowaniu (jeśli takie są)
+REJECTED_PROBABILITY = 0.5
+
+# Prawdopodobieństwo zamiany slotów zamiast przeniesienia dla lekcji przyjętej do planu
+SWAP_PROBABILITY = 0.5
+
+# Liczba losowanych slotów docelowych przy szukaniu slotu wolnego dla klasy
+SLOT_TRIES = 8
+
+# Tolerancja porównań wyników
+EPSILON = 1e-9
+
+# Ruch: lista (indeks genu, nowy gen)
+Move = List[Tuple[int, Tuple[int, ...]]]
+
+
+class NeighbourhoodMoves:
+    """
+    Sąsiedztwo planu: przeniesienie lekcji do innego slotu i zamiana slotów dwóch lekcji tej samej klasy.
+    Ruchy losowane są na podstawie EvaluationState osobnika, bez przeglądania całego chromosomu.
+    """
+
+    def __init__(self, school: School):
+        # Nauczyciele i sale odpowiednie dla każdego przedmiotu
+        self.subject_teachers: List[List[int]] = [
+            [school.teacher_index[teacher.id] for teacher in school.subject_teachers[subject.name]]
+            for subject in school.subject_list
+        ]
+        self.subject_rooms: List[List[int]] = [
+            [school.classroom_index[room.id] for room in school.subject_rooms[subject.name]]
+            for subject in school.subject_list
+        ]
+
+    def propose(self, genes: np.ndarray, state: EvaluationState) -> Optional[Move]:
+        """Losuje ruch; None, gdy plan nie zawiera żadnej lekcji"""
+        if random.random() < REJECTED_PROBABILITY:
+            index = self._rejected_gene(state)
+            if index is not None:
+                return self.relocate(genes, state, index)
+
+        # Losowa lekcja przyjęta do planu — losowy slot z lekcjami, a w nim losowa lekcja
+        if not state.occupied:
+            index = self._rejected_gene(state)
+            return self.relocate(genes, state, index) if index is not None else None
+        index = random.choice(state.slot_accepted[random.choice(state.occupied)])[0]
+
+        if random.random() < SWAP_PROBABILITY:
+            move = self.swap(genes, state, index)
+            if move is not None:
+                return move
+        return self.relocate(genes, state, index)
+
+    def relocate(self, genes: np.ndarray, state: EvaluationState, index: int) -> Move:
+        """
+        Przenosi lekcję do losowego slotu, w miarę możliwości wolnego dla klasy i nauczyciela.
+        Nauczyciel lub sala zajęci w nowym slocie zastępowani są wolnymi odpowiednimi dla przedmiotu.
+        """
+        day, hour, class_idx, subject_idx, teacher_idx, room_idx = genes[index].tolist()
+        current = day * HOURS_PER_DAY + hour
+
+        # Zajętość klasy sprawdzana maską godzin dnia, nauczyciela — w lekcjach przyjętych w slocie
+        slot = None
+        class_row = class_idx * DAYS
+        for _ in range(SLOT_TRIES):
+            tried = random.randrange(N_SLOTS)
+            if tried == current:
+                continue
+            slot = tried
+            tried_day, tried_hour = divmod(tried, HOURS_PER_DAY)
+            if state.class_hours[class_row + tried_day] >> tried_hour & 1:
+                continue
+            if all(entry[2] != teacher_idx for entry in state.slot_accepted[tried]):
+                break
+        if slot is None:
+            slot = (current + random.randrange(1, N_SLOTS)) % N_SLOTS
+        busy = state.slot_accepted[slot]
+
+        teachers = {entry[2] for entry in busy}
+        if teacher_idx in teachers:
+            free = [teacher for teacher in self.subject_teachers[subject_idx] if teacher not in teachers]
+            if free:
+                teacher_idx = random.choice(free)
+
+        rooms = {entry[3] for entry in busy}
+        suitable = self.subject_rooms[subject_idx]
+        if room_idx in rooms or room_idx not in suitable:
+            free = [room for room in suitable if room not in rooms]
+            if free or suitable:
+                room_idx = random.choice(free or suitable)
+
+        new_day, new_hour = divmod(slot, HOURS_PER_DAY)
+        return [(index, (new_day, new_hour, class_idx, subject_idx, teacher_idx, room_idx))]
+
+    @staticmethod
+    def swap(genes: np.ndarray, state: EvaluationState, index: int) -> Optional[Move]:
+        """Zamienia sloty lekcji z inną lekcją tej samej klasy (nauczyciele i sale bez zmian)"""
+        first = genes[index].tolist()
+        class_idx = first[2]
+        current = first[0] * HOURS_PER_DAY + first[1]
+
+        offset = random.randrange(N_SLOTS)
+        for step in range(N_SLOTS):
+            slot = (offset + step) % N_SLOTS
+            if slot == current:
+                continue
+            for other, other_class, _, _ in state.slot_accepted[slot]:
+                if other_class == class_idx:
+                    second = genes[other].tolist()
+                    return [
+                        (index, (second[0], second[1], *first[2:])),
+                        (other, (first[0], first[1], *second[2:]))
+                    ]
+        return None
+
+    @staticmethod
+    def undo(genes: np.ndarray, move: Move) -> Move:
+        """Ruch przywracający geny sprzed wykonania move"""
+        return [(index, genes[index].copy()) for index, _ in move]
+
+    @staticmethod
+    def apply(individual: np.ndarray, genes: np.ndarray, move: Move):
+        """Zapisuje geny ruchu i zgłasza je stanowi oceny przyrostowej (bez aktualizacji hasza)"""
+        changed = individual.eval_state.changed
+        for index, gene in move:
+            genes[index] = gene
+            changed.add(index)
+
+    def evaluate(self, delta: DeltaEvaluator, individual: np.ndarray, genes: np.ndarray,
+                 move: Move) -> Tuple[Move, StateUndo]:
+        """
+        Wykonuje ruch i aktualizuje stan osobnika.
+
+        Returns:
+            Para (ruch przywracający geny, zapis zmian stanu) — argumenty reject
+        """
+        previous = self.undo(genes, move)
+        self.apply(individual, genes, move)
+        undo = StateUndo()
+        delta.update(genes, individual.eval_state, undo)
+        return previous, undo
+
+    @staticmethod
+    def reject(delta: DeltaEvaluator, individual: np.ndarray, genes: np.ndarray, previous: Move, undo: StateUndo):
+        """Cofa ruch wykonany przez evaluate: przywraca geny i wycofuje zmiany stanu bez ponownej oceny"""
+        for index, gene in previous:
+            genes[index] = gene
+        delta.revert(individual.eval_state, undo)
+
+    @staticmethod
+    def _rejected_gene(state: EvaluationState) -> Optional[int]:
+        """Losowa lekcja odrzucona przy dekodowaniu (konflikt w slocie) albo None"""
+        offset = random.randrange(N_SLOTS)
+        for step in range(N_SLOTS):
+            slot = (offset + step) % N_SLOTS
+            members = state.slot_members[slot]
+            if len(members) > len(state.slot_accepted[slot]):
+                accepted = {entry[0] for entry in state.slot_accepted[slot]}
+                return random.choice([index for index in members if index not in accepted])
+        return None
+
+
+class LocalSearch:
+    """Poprawia najlepsze osobniki generacji ruchami pierwszej poprawy z oceną przyrostową"""
+
+    def __init__(self, school: School, evaluator: 'GeneticEvaluator', params: Dict):
+        """
+        Args:
+            school: Szkoła, dla której generujemy plan
+            evaluator: Ewaluator algorytmu (wymaga backendu 'numpy')
+            params: Parametry 'local_search_top_k', 'local_search_evaluations', 'local_search_ms'
+
+        Raises:
+            ValueError: Gdy ewaluator nie ma kernela NumPy
+        """
+        if evaluator.kernel is None:
+            raise ValueError("Local search requires the numpy evaluator backend")
+
+        self.logger = GPLLogger(__name__)
+        self.moves = NeighbourhoodMoves(school)
+
+        # Stan oceny przyrostowej pozostaje na osobniku tylko, gdy ewaluator sam z niego korzysta
+        self.shared_state = evaluator.delta is not None
+        self.delta = evaluator.delta if self.shared_state else DeltaEvaluator(evaluator.kernel)
+
+        self.top_k = max(1, int(params.get('local_search_top_k', 2)))
+        self.max_evaluations = max(1, int(params.get('local_search_evaluations', 1000)))
+        time_limit_ms = params.get('local_search_ms')
+        self.time_limit = float(time_limit_ms) / 1000 if time_limit_ms else None
+
+    def improve_population(self, population: Sequence) -> Dict[str, float]:
+        """
+        Poprawia 'local_search_top_k' najlepszych osobników (w miejscu, z aktualizacją fitness).
+        Budżet ocen dzielony jest po równo, a limit czasu jest wspólny.
+
+        Returns:
+            Słownik z czasem etapu ('time', w sekundach), łącznym przyrostem fitness ('gain'),
+            liczbą ocen ('evaluations') i liczbą poprawionych osobników ('improved')
+        """
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+
+        candidates = [individual for individual in population if individual.fitness.valid]
+        best = sorted(candidates, key=lambda individual: individual.fitness.values[0], reverse=True)[:self.top_k]
+
+        gain, evaluations, improved = 0.0, 0, 0
+        if best:
+            budget = max(1, self.max_evaluations // len(best))
+            for individual in best:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                individual_gain, individual_evaluations = self.improve(individual, budget, deadline)
+                gain += individual_gain
+                evaluations += individual_evaluations
+                improved += individual_gain > EPSILON
+
+        return {
+            'time': time.perf_counter() - start,
+            'gain': gain,
+            'evaluations': evaluations,
+            'improved': improved
+        }
+
+    def improve(self, individual: np.ndarray, budget: int, deadline: Optional[float] = None) -> Tuple[float, int]:
+        """
+        Poprawia jednego osobnika.
+
+        Args:
+            individual: Osobnik (modyfikowany w miejscu)
+            budget: Maksymalna liczba ocen
+            deadline: Chwila (time.perf_counter), po której etap się kończy
+
+        Returns:
+            Para (przyrost fitness, liczba wykonanych ocen)
+        """
+        genes = np.asarray(individual)
+        score, state = self.delta.fitness(genes, getattr(individual, 'eval_state', None))
+        individual.eval_state = state
+        start_score = best_score = score
+        best_penalty = self.delta.penalty(state)
+
+        evaluations = 0
+        moved = False
+        while evaluations < budget and (deadline is None or time.perf_counter() < deadline):
+            move = self.moves.propose(genes, state)
+            if move is None:
+                break
+
+            previous, undo = self.moves.evaluate(self.delta, individual, genes, move)
+            score, penalty = self.delta.score(state), self.delta.penalty(state)
+            evaluations += 1
+
+            if score > best_score + EPSILON or (score > best_score - EPSILON and penalty < best_penalty - EPSILON):
+                best_score, best_penalty = score, penalty
+                moved = True
+                continue
+
+            # Brak poprawy — przywróć poprzednie geny i stan
+            self.moves.reject(self.delta, individual, genes, previous, undo)
+
+        if moved:
+            individual.zhash = None
+        individual.fitness.values = (best_score,)
+        if not self.shared_state:
+            del individual.eval_state
+        return best_score - start_score, evaluations
@@ -2,9 +2,15 @@
 
 import random
 from collections import defaultdict
-from typing import List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional
+
+import numpy as np
 
 from src.genetic.creator import get_individual_class
+from src.genetic.genetic_encoding import (
+    DAY, HOUR, CLASS, TEACHER, ROOM, EMPTY, DAYS, HOURS_PER_DAY, decode_gene, encode_lesson, inherit_tracking,
+    set_gene, set_genes_at
+)
 from src.models.classroom import Classroom
 from src.models.lesson import Lesson
 from src.models.schedule import Schedule
@@ -12,21 +18,43 @@ from src.models.school import School
 from src.models.teacher import Teacher
 from src.utils.logger import GPLLogger
 
+# Progi średniej odległości Hamminga (calculate_population_diversity) dla update_adaptive_rates.
+# Świeża populacja (losowa lub DSATUR) ma ok. 0.67, zbieżna 0.01-0.1 — stąd progi w tym zakresie
+LOW_DIVERSITY = 0.05
+HIGH_DIVERSITY = 0.25
+
+
+def _replace_or_add_lesson(individual: np.ndarray, slot: Tuple, new_lesson: Tuple,
+                           free_genes: Optional[List[int]] = None) -> bool:
+    """
+    Zastępuje lub dodaje nową lekcję w odpowiednim miejscu.
 
-def _replace_or_add_lesson(individual: List, slot: Tuple, new_lesson: Tuple):
-    """Zastępuje lub dodaje nową lekcję w odpowiednim miejscu."""
-    day, hour, class_group = slot
+    Chromosom ma stałą szerokość, więc nowa lekcja trafia w miejsce pustego genu,
+    a gdy takiego nie ma — genu odrzuconego przy dekodowaniu (free_genes).
+    """
+    day, hour, class_idx = slot
 
     # Najpierw próbujemy znaleźć i zastąpić istniejącą lekcję
-    for i, lesson in enumerate(individual):
-        if (lesson[0] == day and
-                lesson[1] == hour and
-                lesson[2] == class_group):
-            individual[i] = new_lesson
-            return
+    matches = np.flatnonzero(
+        (individual[:, DAY] == day) &
+        (individual[:, HOUR] == hour) &
+        (individual[:, CLASS] == class_idx)
+    )
+    if len(matches):
+        set_gene(individual, int(matches[0]), new_lesson)
+        return True
+
+    # Jeśli nie znaleziono istniejącej lekcji, wykorzystujemy pusty gen
+    empty = np.flatnonzero(individual[:, DAY] == EMPTY)
+    if len(empty):
+        set_gene(individual, int(empty[0]), new_lesson)
+        return True
+
+    if free_genes:
+        set_gene(individual, free_genes.pop(), new_lesson)
+        return True
 
-    # Jeśli nie znaleziono istniejącej lekcji, dodajemy nową
-    individual.append(new_lesson)
+    return False
 
 
 class GeneticOperators:
@@ -35,8 +63,8 @@ class GeneticOperators:
         self.logger = GPLLogger(__name__)
         self.schedule = Schedule(school=self.school)
 
-        self.DAYS = 5
-        self.HOURS_PER_DAY = 8
+        self.DAYS = DAYS
+        self.HOURS_PER_DAY = HOURS_PER_DAY
 
         # Parametry adaptacyjne
         self.adaptive_rates = {
@@ -52,34 +80,25 @@ class GeneticOperators:
             }
         }
 
-    def random_lesson_slot(self) -> tuple[int, int, Any, Any, Any, Any] | None:
+    def random_lesson_slot(self) -> tuple[int, int, int, int, int, int] | None:
         """
         Generuje losowy slot lekcyjny z uwzględnieniem ograniczeń.
+
+        Returns:
+            Gen (dzień, godzina, indeks klasy, indeks przedmiotu, indeks nauczyciela, indeks sali)
         """
         max_attempts = 100  # Zwiększamy liczbę prób
 
         for attempt in range(max_attempts):
             try:
                 # Losuj klasę i przedmiot
-                class_group = random.choice(self.school.class_groups)
+                class_idx = random.randrange(len(self.school.class_groups))
+                class_group = self.school.class_groups[class_idx]
                 subject = random.choice(class_group.subjects)
 
-                # Znajdź dostępnych nauczycieli i sale
-                available_teachers = [
-                    t for t in self.school.teachers.values()
-                    if subject.name in t.subjects
-                ]
-                suitable_rooms = [
-                    r for r in self.school.classrooms.values()
-                    if self.is_room_suitable(Lesson(
-                        subject=subject,
-                        teacher=None,
-                        classroom=r,
-                        class_group=class_group.name,
-                        day=0,  # tymczasowe wartości
-                        hour=0
-                    ))
-                ]
+                # Nauczyciele i sale z tabel dopasowań szkoły
+                available_teachers = self.school.subject_teachers[subject.name]
+                suitable_rooms = self.school.subject_rooms[subject.name]
 
                 if not available_teachers or not suitable_rooms:
                     continue
@@ -96,21 +115,28 @@ class GeneticOperators:
                         classroom = random.choice(suitable_rooms)
 
                         if self.is_slot_available(day, hour, teacher, classroom, class_group.name):
-                            return day, hour, class_group.name, subject.name, teacher.id, classroom.id
+                            return (day, hour, class_idx,
+                                    self.school.subject_index[subject.name],
+                                    self.school.teacher_index[teacher.id],
+                                    self.school.classroom_index[classroom.id])
 
             except Exception as e:
                 self.logger.warning(
-                    f"Attempt {attempt + 1} failed: {str(e)}",
-                    cache_key=f"random_slot_attempt_{attempt}"
+                    "Attempt %d failed: %s", attempt + 1, e,
+                    cache_key=('random_slot_attempt', attempt)
                 )
 
-        self.logger.warning(f"Failed to generate valid lesson slot after {max_attempts} attempts")
+        self.logger.warning("Failed to generate valid lesson slot after %d attempts", max_attempts)
         # Zwróć None, zamiast rzucać wyjątek — pozwoli to na lepszą obsługę
         return None
 
-    def crossover(self, ind1: List, ind2: List) -> Tuple[List, List]:
+    def crossover(self, ind1: np.ndarray, ind2: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Operator krzyżowania wykorzystujący segmenty bez konfliktów.
+        Wymieniane są segmenty jednej klasy, dzień za dniem — inaczej potomek traci lekcje jednej
+        klasy i dostaje zdublowane lekcje innej. Segmenty są przycinane do równej liczby genów,
+        więc osobniki zachowują szerokość. Lekcje, które po wymianie kolidują z innymi klasami,
+        są przenoszone przez _repair.
 
         Args:
             ind1: Pierwszy rodzic
@@ -125,15 +151,27 @@ class GeneticOperators:
             good_segments2 = self._find_good_segments(ind2)
 
             individual = get_individual_class()
-            child1 = individual(ind1.copy())
-            child2 = individual(ind2.copy())
-
-            # Wymiana segmentów
-            for (start1, end1), (start2, end2) in zip(good_segments1, good_segments2):
-                if random.random() < self.adaptive_rates['crossover']['current']:
-                    temp = child1[start1:end1]
-                    child1[start1:end1] = child2[start2:end2]
-                    child2[start2:end2] = temp
+            child1 = individual(ind1)
+            child2 = individual(ind2)
+            inherit_tracking(child1, ind1)
+            inherit_tracking(child2, ind2)
+
+            # Wymiana segmentów jednej, losowej klasy — wspólne dni tej klasy przechodzą razem
+            shared = [key for key in good_segments1 if key in good_segments2]
+            if shared:
+                class_group = random.choice(shared)[0]
+                for key in shared:
+                    if key[0] != class_group:
+                        continue
+                    length = min(len(good_segments1[key]), len(good_segments2[key]))
+                    segment1, segment2 = good_segments1[key][:length], good_segments2[key][:length]
+                    temp = child1[segment1].copy()
+                    set_genes_at(child1, segment1, child2[segment2].copy())
+                    set_genes_at(child2, segment2, temp)
+
+                # Wymienione lekcje mogą kolidować z nauczycielami i salami innych klas
+                self._repair(child1)
+                self._repair(child2)
 
             return child1, child2
 
@@ -141,7 +179,7 @@ class GeneticOperators:
             self.logger.error(f"Crossover failed: {str(e)}")
             return ind1, ind2
 
-    def mutation(self, individual: List) -> List:
+    def mutation(self, individual: np.ndarray) -> np.ndarray:
         """
         Operator mutacji z inteligentnym wypełnianiem dziur.
 
@@ -159,22 +197,29 @@ class GeneticOperators:
 
             # Użyj get_individual_class zamiast creator.Individual
             Individual = get_individual_class()
-            mutant = Individual(individual[:])
+            mutant = Individual(individual)
+            inherit_tracking(mutant, individual)
 
-            # Wypełnianie dziur
-            schedule = self.convert_to_schedule(mutant)
+            # Naprawa i wypełnianie dziur
+            schedule, accepted, free_slots = self._repair(mutant)
 
             # Tylko jeśli mamy poprawny harmonogram
             if schedule:
-                empty_slots = self._find_empty_slots(schedule)
+                empty_slots = [(day, hour, class_name)
+                               for class_name, slots in free_slots.items() for day, hour in slots]
 
                 if empty_slots and random.random() < 0.7:
+                    # Geny odrzucone przy dekodowaniu nie wnoszą nic do planu — można je nadpisać
+                    free_genes = [i for i in range(len(mutant)) if i not in accepted]
+                    random.shuffle(free_genes)
+
                     # Wybierz do 3 losowych dziur do wypełnienia
                     slot_count = min(len(empty_slots), 3)
-                    for slot in random.sample(empty_slots, slot_count):
-                        new_lesson = self._generate_filling_lesson(*slot)
+                    for day, hour, class_name in random.sample(empty_slots, slot_count):
+                        new_lesson = self._generate_filling_lesson(day, hour, class_name)
                         if new_lesson:
-                            _replace_or_add_lesson(mutant, slot, new_lesson)
+                            class_idx = self.school.class_index[class_name]
+                            _replace_or_add_lesson(mutant, (day, hour, class_idx), new_lesson, free_genes)
 
             # Standardowa mutacja - wybierz punkty do mutacji
             mutation_points = self._select_mutation_points(mutant)
@@ -190,10 +235,10 @@ class GeneticOperators:
                         # Generuj nowy slot lekcyjny
                         new_slot = self.random_lesson_slot()
                         if new_slot:  # Upewnij się, że slot został wygenerowany
-                            mutant[i] = new_slot
+                            set_gene(mutant, i, new_slot)
                     except ValueError as e:
                         # Cichsze logowanie
-                        self.logger.debug(f"Failed to generate new lesson for mutation: {e}")
+                        self.logger.debug("Failed to generate new lesson for mutation: %s", e)
 
             return mutant
 
@@ -201,7 +246,7 @@ class GeneticOperators:
             self.logger.error(f"Mutation failed: {str(e)}")
             return individual  # W przypadku błędu zwróć oryginalny osobnik
 
-    def _select_mutation_points(self, individual: List) -> List[int]:
+    def _select_mutation_points(self, individual: np.ndarray) -> List[int]:
         """
         Wybiera punkty do mutacji, preferując problematyczne miejsca i klasy z małą liczbą lekcji.
 
@@ -223,50 +268,51 @@ class GeneticOperators:
 
         # Licz lekcje per klasa
         class_lesson_counts = {}
-        for class_group in self.school.class_groups:
+        for class_idx, class_group in enumerate(self.school.class_groups):
             count = len(schedule.get_class_lessons(class_group.name))
-            class_lesson_counts[class_group.name] = count
+            class_lesson_counts[class_idx] = count
 
         # Znajdź puste i niedostatecznie wypełnione klasy
-        empty_classes = [name for name, count in class_lesson_counts.items() if count == 0]
-        underfilled_classes = [name for name, count in class_lesson_counts.items()
-                               if 0 < count < 15]  # Minimum ~15 lekcji tygodniowo
+        empty_classes = {idx for idx, count in class_lesson_counts.items() if count == 0}
+        underfilled_classes = {idx for idx, count in class_lesson_counts.items()
+                               if 0 < count < 15}  # Minimum ~15 lekcji tygodniowo
 
-        # Znajdź konflikty w planie
-        for i, lesson1 in enumerate(individual):
-            if lesson1 is None:
+        genes = individual.tolist()
+
+        # Grupuj lekcje po (dzień, godzina, zasób) — konflikt to co najmniej dwie lekcje w grupie
+        slot_groups = defaultdict(list)
+
+        for i, lesson in enumerate(genes):
+            if lesson[DAY] == EMPTY:
                 problem_points.append(i)
                 continue
 
             # Dodaj punkty dla lekcji w pustych/niedowypełnionych klasach
-            if lesson1[2] in empty_classes:
+            if lesson[CLASS] in empty_classes:
                 problem_points.append(i)
                 continue
 
-            if lesson1[2] in underfilled_classes:
+            if lesson[CLASS] in underfilled_classes:
                 # 50% szans na dodanie punktu dla niedowypełnionych klas
                 if random.random() < 0.5:
                     problem_points.append(i)
                     continue
 
-            # Sprawdź konflikty
-            for j, lesson2 in enumerate(individual[i + 1:], i + 1):
-                if lesson2 is None:
-                    continue
-
-                if self._check_conflict(lesson1, lesson2):
-                    problem_points.extend([i, j])
+            day, hour = lesson[DAY], lesson[HOUR]
+            slot_groups[(day, hour, 'teacher', lesson[TEACHER])].append(i)
+            slot_groups[(day, hour, 'room', lesson[ROOM])].append(i)
+            slot_groups[(day, hour, 'class', lesson[CLASS])].append(i)
 
-        # Dodaj punkty dla lekcji None (nieprawidłowych)
-        for i, lesson in enumerate(individual):
-            if lesson is None:
-                problem_points.append(i)
+        # Sprawdź konflikty
+        for members in slot_groups.values():
+            if len(members) > 1:
+                problem_points.extend(members)
 
         # Dodaj punkty z dziurami w planie
         if schedule:
             empty_slots = self._find_empty_slots(schedule)
             if empty_slots:
-                related_lessons = self._find_lessons_near_gaps(individual, empty_slots)
+                related_lessons = self._find_lessons_near_gaps(genes, empty_slots)
                 problem_points.extend(related_lessons)
 
         # Jeśli nie znaleziono problemów lub mamy za dużo punktów, optymalizuj
@@ -279,7 +325,7 @@ class GeneticOperators:
             # Za dużo punktów, wybierz najważniejsze
             # Priorytetyzuj punkty związane z pustymi klasami
             empty_class_points = [p for p in problem_points
-                                  if individual[p] is not None and individual[p][2] in empty_classes]
+                                  if genes[p][DAY] != EMPTY and genes[p][CLASS] in empty_classes]
 
             if empty_class_points:
                 # Wybierz wszystkie punkty dla pustych klas + kilka losowych
@@ -301,72 +347,96 @@ class GeneticOperators:
         if lesson1 is None or lesson2 is None:
             return False
 
-        if lesson1[0] != lesson2[0] or lesson1[1] != lesson2[1]:
+        if lesson1[DAY] == EMPTY or lesson2[DAY] == EMPTY:
             return False
 
-        return (lesson1[4] == lesson2[4] or  # ten sam nauczyciel
-                lesson1[5] == lesson2[5] or  # ta sama sala
-                lesson1[2] == lesson2[2])  # ta sama klasa
+        if lesson1[DAY] != lesson2[DAY] or lesson1[HOUR] != lesson2[HOUR]:
+            return False
 
-    @staticmethod
-    def _find_lessons_near_gaps(individual: List, empty_slots: List[Tuple]) -> List[int]:
+        return (lesson1[TEACHER] == lesson2[TEACHER] or  # ten sam nauczyciel
+                lesson1[ROOM] == lesson2[ROOM] or  # ta sama sala
+                lesson1[CLASS] == lesson2[CLASS])  # ta sama klasa
+
+    def _find_lessons_near_gaps(self, genes: List, empty_slots: List[Tuple]) -> List[int]:
         """Znajduje lekcje sąsiadujące z dziurami w planie."""
+        gaps = {
+            (self.school.class_index[class_group], day, hour)
+            for day, hour, class_group in empty_slots
+        }
         nearby_lessons = []
 
-        for day, hour, class_group in empty_slots:
-            for i, lesson in enumerate(individual):
-                if (lesson[2] == class_group and  # ta sama klasa
-                        lesson[0] == day and  # ten sam dzień
-                        abs(lesson[1] - hour) <= 1):  # sąsiednia godzina
+        for i, lesson in enumerate(genes):
+            if lesson[DAY] == EMPTY:
+                continue
+            class_idx, day, hour = lesson[CLASS], lesson[DAY], lesson[HOUR]
+            # ta sama klasa, ten sam dzień, sąsiednia godzina
+            for gap_hour in (hour - 1, hour, hour + 1):
+                if (class_idx, day, gap_hour) in gaps:
                     nearby_lessons.append(i)
 
         return nearby_lessons
 
-    def convert_to_schedule(self, individual: List) -> Optional[Schedule]:
+    def convert_to_schedule(self, individual: np.ndarray) -> Optional[Schedule]:
         """Konwertuje chromosom na obiekt Schedule, zachowując ograniczenia."""
-        schedule = Schedule(school=self.school)
+        schedule, _ = self._decode(individual)
+        return schedule
 
-        # Filtracja przed przetwarzaniem
-        valid_indices = [i for i, lesson_data in enumerate(individual) if lesson_data is not None]
+    def _decode(self, individual: np.ndarray) -> Tuple[Optional[Schedule], set]:
+        """
+        Dekoduje chromosom do planu.
+
+        Returns:
+            Para (plan lub None, zbiór indeksów genów, które trafiły do planu)
+        """
+        schedule = Schedule(school=self.school)
 
         # Przygotowanie wszystkich lekcji przed sprawdzeniami konfliktów
         potential_lessons = []
 
-        for idx in valid_indices:
-            lesson_data = individual[idx]
-            try:
-                teacher = self.school.teachers.get(lesson_data[4])
-                classroom = self.school.classrooms.get(lesson_data[5])
-                subject = next(
-                    s for s in self.school.subjects.values()
-                    if s.name == lesson_data[3]
-                )
-
-                lesson = Lesson(
-                    subject=subject,
-                    teacher=teacher,
-                    classroom=classroom,
-                    class_group=lesson_data[2],
-                    day=lesson_data[0],
-                    hour=lesson_data[1]
-                )
-
-                # Dodaj tylko jeśli sala jest odpowiednia
-                if self.is_room_suitable(lesson):
-                    potential_lessons.append(lesson)
+        for idx, lesson_data in enumerate(individual.tolist()):
+            lesson = decode_gene(self.school, lesson_data)
 
-            except Exception as e:
-                # Cichsze logowanie
-                pass
+            # Dodaj tylko jeśli sala jest odpowiednia
+            if lesson is not None and self.is_room_suitable(lesson):
+                potential_lessons.append((idx, lesson))
 
         # Sortuj lekcje dla deterministycznej kolejności dodawania
-        sorted_lessons = sorted(potential_lessons, key=lambda x: (x.day, x.hour))
+        sorted_lessons = sorted(potential_lessons, key=lambda x: (x[1].day, x[1].hour))
 
         # Dodaj lekcje do planu
-        for lesson in sorted_lessons:
-            schedule.add_lesson(lesson)
+        accepted = set()
+        for idx, lesson in sorted_lessons:
+            if schedule.add_lesson(lesson):
+                accepted.add(idx)
+
+        return (schedule if schedule.lessons else None), accepted
+
+    def _repair(self, individual: np.ndarray) -> Tuple[Optional[Schedule], set, Dict[str, List[Tuple[int, int]]]]:
+        """
+        Naprawa: lekcje odrzucone przy dekodowaniu przenosi w wolne sloty ich klas.
+        Chromosom ma stałą szerokość, więc to jedyny ruch, który pewnie dokłada lekcje do planu.
 
-        return schedule if schedule.lessons else None
+        Returns:
+            Trójka (plan po naprawie lub None, indeksy genów w planie, wolne sloty per klasa)
+        """
+        schedule, accepted = self._decode(individual)
+        free_slots = defaultdict(list)
+        if not schedule:
+            return schedule, accepted, free_slots
+
+        for day, hour, class_name in self._find_empty_slots(schedule):
+            free_slots[class_name].append((day, hour))
+
+        rejected = [i for i in range(len(individual)) if i not in accepted and individual[i, DAY] != EMPTY]
+        random.shuffle(rejected)
+        relocations = {}
+        for i in rejected:
+            relocated = self._relocate_lesson(schedule, individual[i], free_slots)
+            if relocated:
+                relocations[i] = relocated
+        set_genes_at(individual, list(relocations), list(relocations.values()))
+        accepted.update(relocations)
+        return schedule, accepted, free_slots
 
     def _find_empty_slots(self, schedule: Schedule) -> List[Tuple[int, int, str]]:
         """
@@ -377,7 +447,10 @@ class GeneticOperators:
         """
         empty_slots = []
 
-        for class_group in schedule.class_groups:
+        # Kolejność klas ze szkoły (nie ze zbioru) — przebieg nie zależy od losowania haszy
+        for class_group in self.school.class_names:
+            if class_group not in schedule.class_groups:
+                continue
             class_lessons = schedule.get_class_lessons(class_group)
             used_slots = {(lesson.day, lesson.hour) for lesson in class_lessons}
 
@@ -388,35 +461,83 @@ class GeneticOperators:
 
         return empty_slots
 
-    def _find_good_segments(self, individual: List) -> List[Tuple[int, int]]:
+    def _relocate_lesson(self, schedule: Schedule, gene: np.ndarray,
+                         free_slots: Dict[str, List[Tuple[int, int]]]) -> Optional[Tuple]:
+        """
+        Przenosi lekcję odrzuconą przy dekodowaniu w wolny slot jej klasy.
+
+        Szuka slotu z free_slots, w którym wolny jest nauczyciel lekcji (albo inny nauczyciel
+        przedmiotu) i odpowiednia sala. Przeniesiona lekcja trafia do planu, a slot znika z free_slots,
+        więc kolejne przeniesienia jej nie kolidują. Lekcje z planu nie tracą miejsca — ruch zawsze
+        zwiększa liczbę lekcji w planie o jedną.
+
+        Returns:
+            Nowy gen albo None, jeśli żaden wolny slot klasy nie pasuje
+        """
+        lesson = decode_gene(self.school, gene)
+        if lesson is None:
+            return None
+        slots = free_slots.get(lesson.class_group)
+        if not slots:
+            return None
+
+        # Najpierw nauczyciel i sala z genu (powtórzone później na liście przedmiotu — to nie szkodzi)
+        subject = lesson.subject.name
+        teachers = (lesson.teacher, *self.school.subject_teachers[subject])
+        rooms = self.school.subject_rooms[subject]
+        if self.is_room_suitable(lesson):
+            rooms = (lesson.classroom, *rooms)
+
+        # Sloty od losowej pozycji, żeby przeniesione lekcje nie skupiały się na początku tygodnia
+        start = random.randrange(len(slots))
+        for offset in range(len(slots)):
+            position = (start + offset) % len(slots)
+            day, hour = slots[position]
+            teacher = next((t for t in teachers if schedule.is_slot_free(day, hour, teacher=t)), None)
+            if teacher is None:
+                continue
+            room = next((r for r in rooms if schedule.is_slot_free(day, hour, classroom=r)), None)
+            if room is None:
+                continue
+
+            relocated = Lesson(lesson.subject, teacher, room, lesson.class_group, day, hour)
+            schedule.add_lesson(relocated)
+            slots[position] = slots[-1]
+            slots.pop()
+            return encode_lesson(self.school, relocated)
+
+        return None
+
+    def _find_good_segments(self, individual: np.ndarray) -> Dict[Tuple[int, int], List[int]]:
         """
-        Znajduje segmenty planu bez konfliktów i dziur.
+        Znajduje segmenty planu bez konfliktów i dziur: dni klas z lekcjami w kolejnych godzinach.
 
         Returns:
-            Lista par (początek, koniec) indeksów
+            Słownik (indeks klasy, dzień) -> indeksy genów segmentu w kolejności godzin
+            (geny dnia klasy mogą leżeć w dowolnych miejscach chromosomu)
         """
         if individual is None:
-            return []
+            return {}
 
-        segments = []
+        segments = {}
 
         try:
             class_day_lessons = defaultdict(lambda: defaultdict(list))
 
-            for i, lesson in enumerate(individual):
-                if lesson is None:
+            for i, lesson in enumerate(individual.tolist()):
+                if lesson[DAY] == EMPTY:
                     continue
 
-                class_day_lessons[lesson[2]][lesson[0]].append((i, lesson))
+                class_day_lessons[lesson[CLASS]][lesson[DAY]].append((i, lesson))
 
             for class_group, days in class_day_lessons.items():
                 for day, lessons in days.items():
                     if len(lessons) > 1:
-                        sorted_lessons = sorted(lessons, key=lambda x: x[1][1])
+                        sorted_lessons = sorted(lessons, key=lambda x: x[1][HOUR])
 
                         # Sprawdź ciągłość godzin i brak konfliktów
                         valid_segment = True
-                        lesson_hours = [lesson_data[1][1] for lesson_data in sorted_lessons]
+                        lesson_hours = [lesson_data[1][HOUR] for lesson_data in sorted_lessons]
 
                         for i in range(len(lesson_hours) - 1):
                             if lesson_hours[i + 1] - lesson_hours[i] > 1:
@@ -424,46 +545,34 @@ class GeneticOperators:
                                 break
 
                         if valid_segment:
-                            start_idx = sorted_lessons[0][0]
-                            end_idx = sorted_lessons[-1][0]
-                            segments.append((start_idx, end_idx + 1))
+                            segments[(class_group, day)] = [index for index, _ in sorted_lessons]
 
             return segments
 
         except Exception as e:
             self.logger.warning(f"Error finding good segments: {str(e)}")
-            return []
+            return {}
 
     def _generate_filling_lesson(self, day: int, hour: int, class_group: str) -> Optional[Tuple]:
-        """Generuje lekcję dla pustego slotu"""
+        """Generuje lekcję (zakodowany gen) dla pustego slotu"""
         max_attempts = 50
 
         try:
-            class_obj = next(c for c in self.school.class_groups if c.name == class_group)
+            class_obj = self.school.class_groups[self.school.class_index[class_group]]
 
             for attempt in range(max_attempts):
                 subject = random.choice(class_obj.subjects)
 
                 # Znajdź odpowiednie sale najpierw
-                suitable_rooms = [
-                    r for r in self.school.classrooms.values()
-                    if self.is_room_suitable(Lesson(
-                        subject=subject,
-                        teacher=None,  # Tymczasowo None
-                        classroom=r,
-                        class_group=class_group,
-                        day=day,
-                        hour=hour
-                    ))
-                ]
+                suitable_rooms = self.school.subject_rooms[subject.name]
 
                 if not suitable_rooms:
                     continue
 
                 # Teraz szukaj nauczycieli
                 available_teachers = [
-                    t for t in self.school.teachers.values()
-                    if subject.name in t.subjects and self._teacher_available(t, day, hour)
+                    t for t in self.school.subject_teachers[subject.name]
+                    if self._teacher_available(t, day, hour)
                 ]
 
                 if not available_teachers:
@@ -472,7 +581,10 @@ class GeneticOperators:
                 teacher = random.choice(available_teachers)
                 classroom = random.choice(suitable_rooms)
 
-                return day, hour, class_group, subject.name, teacher.id, classroom.id
+                return (day, hour, self.school.class_index[class_group],
+                        self.school.subject_index[subject.name],
+                        self.school.teacher_index[teacher.id],
+                        self.school.classroom_index[classroom.id])
 
             return None
 
@@ -482,39 +594,21 @@ class GeneticOperators:
 
     @staticmethod
     def is_room_suitable(lesson: 'Lesson') -> bool:
-        """Sprawdza, czy sala jest odpowiednia dla przedmiotu i dostępna"""
-        room = lesson.classroom
-
-        # Sprawdź, czy przedmiot wymaga specjalnej sali
-        if lesson.subject.requires_special_classroom:
-            if room.room_type != lesson.subject.special_classroom_type:
-                return False
-
-        # Specjalne wymagania dla WF
-        if lesson.subject.name == 'wf' and room.room_type != 'sala_gimnastyczna':
-            return False
-
-        # Specjalne wymagania dla informatyki
-        if lesson.subject.name in ['informatyka', 'informatyka_rozszerzony'] and room.room_type != 'sala_komputerowa':
-            return False
-
-        return True
+        """Sprawdza, czy sala jest odpowiednia dla przedmiotu (reguły w School.room_fits_subject)"""
+        return School.room_fits_subject(lesson.subject, lesson.classroom)
 
     def _teacher_available(self, teacher: 'Teacher', day: int, hour: int) -> bool:
         """
         Sprawdza, czy nauczyciel jest dostępny w danym terminie.
         """
         try:
-            # Sprawdź lekcje nauczyciela w tym dniu
-            teacher_lessons = [
-                lesson for lesson in self.schedule.lessons
-                if lesson.teacher.id == teacher.id
-            ]
-
             # Sprawdź czy nauczyciel nie ma już lekcji w tym czasie
-            if any(lesson.day == day and lesson.hour == hour for lesson in teacher_lessons):
+            if not self.schedule.is_slot_free(day, hour, teacher=teacher):
                 return False
 
+            # Lekcje nauczyciela z indeksu planu
+            teacher_lessons = self.schedule.get_teacher_lessons(teacher)
+
             # Policz godziny w danym dniu
             daily_hours = sum(1 for lesson in teacher_lessons if lesson.day == day)
             if daily_hours >= teacher.max_hours_per_day:
@@ -531,27 +625,15 @@ class GeneticOperators:
             self.logger.error(f"Error checking teacher availability: {str(e)}")
             return False
 
-
     def is_slot_available(self, day: int, hour: int, teacher: 'Teacher', classroom: 'Classroom',
                           class_group: str) -> bool:
         """
         Sprawdza, czy dany slot czasowy jest dostępny dla wszystkich zasobów.
         """
         try:
-            # Sprawdź, czy sala jest dostępna w tym czasie
-            for lesson in self.schedule.lessons:
-                if lesson.day == day and lesson.hour == hour:
-                    # Ten sam nauczyciel nie może prowadzić dwóch lekcji
-                    if lesson.teacher.id == teacher.id:
-                        return False
-                    # Ta sama klasa nie może mieć dwóch lekcji
-                    if lesson.class_group == class_group:
-                        return False
-                    # Ta sama sala nie może być używana przez dwie lekcje
-                    if lesson.classroom.id == classroom.id:
-                        return False
-
-            return True
+            # Nauczyciel, klasa i sala nie mogą mieć dwóch lekcji w tym samym slocie
+            return self.schedule.is_slot_free(day, hour, teacher=teacher, classroom=classroom,
+                                              class_group=class_group)
 
         except Exception as e:
             self.logger.error(f"Error checking slot availability: {str(e)}")
@@ -592,12 +674,8 @@ class GeneticOperators:
                 if not self._validate_lesson_tuple(lesson2):
                     return True
 
-                if lesson1[0] == lesson2[0] and lesson1[1] == lesson2[1]:
-                    # Ten sam czas — sprawdź kolizje
-                    if (lesson1[4] == lesson2[4] or  # ten sam nauczyciel
-                            lesson1[5] == lesson2[5] or  # ta sama sala
-                            lesson1[2] == lesson2[2]):  # ta sama klasa
-                        return True
+                if self._check_conflict(lesson1, lesson2):
+                    return True
         return False
 
     def _validate_lesson_tuple(self, lesson: Tuple) -> bool:
@@ -605,7 +683,7 @@ class GeneticOperators:
         Sprawdza poprawność struktury krotki reprezentującej lekcję.
 
         Args:
-            lesson: Krotka (dzień, godzina, klasa, przedmiot, id_nauczyciela, id_sali)
+            lesson: Gen (dzień, godzina, indeks klasy, indeks przedmiotu, indeks nauczyciela, indeks sali)
 
         Returns:
             bool: True, jeśli struktura jest poprawna
@@ -614,30 +692,22 @@ class GeneticOperators:
             if len(lesson) != 6:
                 return False
 
-            day, hour, class_name, subject_name, teacher_id, classroom_id = lesson
+            day, hour, class_idx, subject_idx, teacher_idx, room_idx = (int(value) for value in lesson)
 
-            # Sprawdź typy i zakresy
-            if not (isinstance(day, int) and 0 <= day < self.DAYS):
+            # Sprawdź zakresy
+            if not 0 <= day < self.DAYS:
                 return False
-            if not (isinstance(hour, int) and 0 <= hour < self.HOURS_PER_DAY):
-                return False
-            if not isinstance(class_name, str):
-                return False
-            if not isinstance(subject_name, str):
-                return False
-            if not isinstance(teacher_id, int):
-                return False
-            if not isinstance(classroom_id, int):
+            if not 0 <= hour < self.HOURS_PER_DAY:
                 return False
 
             # Sprawdź, czy referencje istnieją
-            if not self.school.teachers.get(teacher_id):
+            if not 0 <= class_idx < len(self.school.class_names):
                 return False
-            if not self.school.classrooms.get(classroom_id):
+            if not 0 <= subject_idx < len(self.school.subject_list):
                 return False
-            if not any(c.name == class_name for c in self.school.class_groups):
+            if not 0 <= teacher_idx < len(self.school.teacher_list):
                 return False
-            if not any(s.name == subject_name for s in self.school.subjects.values()):
+            if not 0 <= room_idx < len(self.school.classroom_list):
                 return False
 
             return True
@@ -650,18 +720,21 @@ class GeneticOperators:
         """
         Aktualizuje współczynniki adaptacyjne na podstawie różnorodności populacji.
 
+        Sygnałem jest surowa średnia odległość Hamminga, a progi LOW_DIVERSITY / HIGH_DIVERSITY
+        są skalibrowane do jej typowych wartości (nie jest normalizowana ani łączona z entropią).
+
         Args:
-            population_diversity: Miara różnorodności populacji (0-1)
+            population_diversity: Średnia odległość Hamminga w populacji (0-1)
         """
         try:
             # Aktualizacja współczynnika mutacji
-            if population_diversity < 0.3:
+            if population_diversity < LOW_DIVERSITY:
                 # Zwiększ mutację przy małej różnorodności
                 self.adaptive_rates['mutation']['current'] = min(
                     self.adaptive_rates['mutation']['current'] * 1.5,
                     self.adaptive_rates['mutation']['max_rate']
                 )
-            elif population_diversity > 0.7:
+            elif population_diversity > HIGH_DIVERSITY:
                 # Zmniejsz mutację przy dużej różnorodności
                 self.adaptive_rates['mutation']['current'] = max(
                     self.adaptive_rates['mutation']['current'] * 0.75,
@@ -669,13 +742,13 @@ class GeneticOperators:
                 )
 
             # Aktualizacja współczynnika krzyżowania
-            if population_diversity < 0.3:
+            if population_diversity < LOW_DIVERSITY:
                 # Zwiększ krzyżowanie przy małej różnorodności
                 self.adaptive_rates['crossover']['current'] = min(
                     self.adaptive_rates['crossover']['current'] * 1.2,
                     self.adaptive_rates['crossover']['max_rate']
                 )
-            elif population_diversity > 0.7:
+            elif population_diversity > HIGH_DIVERSITY:
                 # Zmniejsz krzyżowanie przy dużej różnorodności
                 self.adaptive_rates['crossover']['current'] = max(
                     self.adaptive_rates['crossover']['current'] * 0.9,
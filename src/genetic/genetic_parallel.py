@@ -0,0 +1,93 @@
+# src/genetic/genetic_parallel.py
+
+"""
+Równoległa ocena osobników w puli procesów.
+
+Do procesów roboczych trafia wyłącznie FitnessKernel (bez loggera, w pełni serializowalny) —
+przekazywany raz, przez initializer puli. Osobniki wysyłane są jako surowe tablice genów
+w paczkach, a wyniki składane w kolejności wejścia, więc przebieg z ustalonym ziarnem
+pozostaje deterministyczny.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from src.genetic.genetic_kernel import FitnessKernel
+from src.utils.logger import GPLLogger
+
+# Kernel procesu roboczego (ustawiany przez _init_worker)
+_worker_kernel: Optional[FitnessKernel] = None
+
+
+def _init_worker(kernel: FitnessKernel):
+    """Initializer puli — zapamiętuje kernel w procesie roboczym"""
+    global _worker_kernel
+    _worker_kernel = kernel
+
+
+def _fitness_chunk(genes: np.ndarray) -> np.ndarray:
+    """Ocenia paczkę osobników (osobniki × geny × pola) w procesie roboczym"""
+    return _worker_kernel.fitness_batch(genes)
+
+
+class ParallelEvaluator:
+    """Pula procesów oceniająca osobniki za pomocą FitnessKernel"""
+
+    def __init__(self, kernel: FitnessKernel, workers: int, chunk_size: Optional[int] = None):
+        """
+        Args:
+            kernel: Kernel przekazywany do procesów roboczych
+            workers: Liczba procesów roboczych
+            chunk_size: Liczba osobników w paczce (domyślnie dobierana do liczby procesów)
+        """
+        self.kernel = kernel
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.logger = GPLLogger(__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Pula procesów tworzona przy pierwszym użyciu"""
+        if self._executor is None:
+            self.logger.info(f"Starting evaluation pool with {self.workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.kernel,)
+            )
+        return self._executor
+
+    def _chunk_size_for(self, count: int) -> int:
+        """Rozmiar paczki — domyślnie po kilka paczek na proces, aby wyrównać obciążenie"""
+        if self.chunk_size:
+            return max(1, int(self.chunk_size))
+        return max(1, math.ceil(count / (self.workers * 4)))
+
+    def fitness_batch(self, genes: np.ndarray) -> np.ndarray:
+        """
+        Odpowiednik FitnessKernel.fitness_batch rozłożony na procesy robocze.
+
+        Args:
+            genes: Tablica (osobniki × geny × pola)
+
+        Returns:
+            Tablica wyników w kolejności osobników
+        """
+        size = self._chunk_size_for(len(genes))
+        if len(genes) <= size:
+            # Jedna paczka — szybciej policzyć na miejscu niż wysyłać do puli
+            return self.kernel.fitness_batch(genes)
+
+        chunks = [genes[start:start + size] for start in range(0, len(genes), size)]
+        return np.concatenate(list(self.executor.map(_fitness_chunk, chunks)))
+
+    def close(self):
+        """Zamyka pulę procesów (zostanie utworzona ponownie przy kolejnym użyciu)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self.logger.debug("Evaluation pool closed")
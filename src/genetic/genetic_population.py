@@ -3,18 +3,29 @@
 import random
 import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Generator, List, Dict, Optional, Tuple, TYPE_CHECKING
 
 import numpy as np
 from deap import base
 from deap import tools
 
 from src.genetic.creator import get_individual_class
+from src.genetic.genetic_checkpoint import Checkpoint, save_checkpoint
+from src.genetic.genetic_local_search import LocalSearch
 from src.genetic.genetic_operators import GeneticOperators
-from src.genetic.genetic_utils import GenerationStats, EvolutionResult, calculate_population_diversity
+from src.genetic.genetic_utils import (
+    GenerationStats, GenerationResult, EvolutionResult, PhaseTimer, calculate_population_diversity,
+    run_to_completion, summarize_local_search, summarize_phases
+)
 from src.models.school import School
 from src.utils.logger import GPLLogger
 
+if TYPE_CHECKING:
+    from src.genetic.genetic_evaluator import GeneticEvaluator
+
+# Domyślna liczba najlepszych osobników przechodzących bez zmian do następnej generacji (parametr 'elite_size')
+DEFAULT_ELITE_SIZE = 2
+
 
 def _should_stop(record: Dict, generation: int, prev_best: List[float]) -> bool:
     """Sprawdza, czy należy zatrzymać ewolucję"""
@@ -40,8 +51,9 @@ def _should_stop(record: Dict, generation: int, prev_best: List[float]) -> bool:
 class PopulationManager:
     """Zarządza populacją i procesem ewolucji"""
 
-    def __init__(self, school: School):
+    def __init__(self, school: School, evaluator: Optional['GeneticEvaluator'] = None):
         self.school = school
+        self.evaluator = evaluator
         self.logger = GPLLogger(__name__)
         self.params = {}
 
@@ -53,11 +65,26 @@ class PopulationManager:
         self.stats.register("max", np.max)
 
         # Hall of Fame — przechowuje najlepsze znalezione rozwiązania
-        self.hall_of_fame = tools.HallOfFame(5)
+        # (osobniki to tablice, więc porównujemy je przez np.array_equal)
+        self.hall_of_fame = tools.HallOfFame(5, similar=np.array_equal)
+
+        # Pomiar czasu faz generacji (domyślnie wyłączony)
+        self.phase_timer = PhaseTimer()
+
+        # Przeszukiwanie lokalne najlepszych potomków (parametr 'local_search', domyślnie wyłączone)
+        self.local_search: Optional[LocalSearch] = None
 
     def set_params(self, params: Dict):
         """Ustawia parametry ewolucji"""
         self.params = params
+        self.phase_timer = PhaseTimer(bool(params.get('phase_timing', False)))
+
+        self.local_search = None
+        if params.get('local_search', False):
+            if self.evaluator is None or self.evaluator.kernel is None:
+                self.logger.warning("Local search requires the numpy evaluator backend, skipping it")
+            else:
+                self.local_search = LocalSearch(self.school, self.evaluator, params)
 
     def initialize_population(
             self,
@@ -86,9 +113,9 @@ class PopulationManager:
 
             # Oblicz ile osobników losowych wygenerować
             num_random = pop_size
-            if best_known:
+            if best_known is not None:
                 num_random -= 1
-            if basic_individual:
+            if basic_individual is not None:
                 num_random -= 1
 
             # Upewnij się, że generujemy co najmniej jednego osobnika
@@ -102,12 +129,12 @@ class PopulationManager:
                 raise
 
             # Dodaj podstawowy osobnik
-            if basic_individual:
+            if basic_individual is not None:
                 try:
                     self.logger.info("Adding basic schedule to initial population")
                     Individual = get_individual_class()
                     basic = Individual(basic_individual)
-                    if not isinstance(basic, list):
+                    if not isinstance(basic, np.ndarray):
                         raise TypeError(f"Invalid basic individual type: {type(basic)}")
                     population.append(basic)
                 except Exception as e:
@@ -115,12 +142,12 @@ class PopulationManager:
                     # Kontynuuj bez podstawowego osobnika
 
             # Dodaj najlepsze znane rozwiązanie
-            if best_known:
+            if best_known is not None:
                 try:
                     self.logger.info("Adding best known solution to initial population")
                     Individual = get_individual_class()
                     best_individual = Individual(best_known)
-                    if not isinstance(best_individual, list):
+                    if not isinstance(best_individual, np.ndarray):
                         raise TypeError(f"Invalid best known solution type: {type(best_individual)}")
                     population.append(best_individual)
                 except Exception as e:
@@ -136,7 +163,7 @@ class PopulationManager:
             invalid_ind = [ind for ind in population if not ind.fitness.valid]
 
             try:
-                fitnesses = list(map(toolbox.evaluate, invalid_ind))
+                fitnesses = self._evaluate_all(invalid_ind, toolbox)
 
                 # Sprawdź czy wyniki są poprawne (krotki)
                 for i, fit in enumerate(fitnesses):
@@ -167,63 +194,76 @@ class PopulationManager:
             toolbox: 'base.Toolbox',
             operators: 'GeneticOperators',
             params: Dict,
-            progress_callback=None
+            progress_callback=None,
+            checkpoint: Optional[Checkpoint] = None
     ) -> EvolutionResult:
         """
-        Przeprowadza proces ewolucji populacji.
+        Przeprowadza proces ewolucji populacji do końca (patrz evolve_iter).
+
+        Returns:
+            EvolutionResult z wynikami ewolucji
+        """
+        return run_to_completion(
+            self.evolve_iter(population, toolbox, operators, params, progress_callback, checkpoint)
+        )
+
+    def evolve_iter(
+            self,
+            population: List,
+            toolbox: 'base.Toolbox',
+            operators: 'GeneticOperators',
+            params: Dict,
+            progress_callback=None,
+            checkpoint: Optional[Checkpoint] = None
+    ) -> Generator[GenerationResult, None, EvolutionResult]:
+        """
+        Przeprowadza ewolucję populacji, zwracając wynik każdej generacji.
+
+        Co 'checkpoint_interval' generacji (oraz na końcu lub przy zamknięciu generatora)
+        stan ewolucji zapisywany jest do pliku 'checkpoint_path', jeśli ten parametr jest ustawiony.
 
         Args:
-            population: Początkowa populacja
+            population: Początkowa populacja (ignorowana przy wznawianiu z checkpointu)
             toolbox: Toolbox z DEAP
             operators: Operatory genetyczne
             params: Parametry algorytmu
             progress_callback: Funkcja do raportowania postępu
+            checkpoint: Checkpoint, od którego należy wznowić ewolucję
+
+        Yields:
+            GenerationResult po każdej generacji (bez najlepszego osobnika)
 
         Returns:
-            EvolutionResult z wynikami ewolucji
+            EvolutionResult z wynikami ewolucji (wartość StopIteration)
         """
         try:
             start_time = time.time()
-            generation_times = []
+            start_generation = 0
+            elapsed_before = 0.0
             progress_history = []
-            prev_best = []
+
+            if checkpoint is not None:
+                population = checkpoint.restore_population()
+                checkpoint.restore(self.hall_of_fame, operators)
+                start_generation = checkpoint.generation
+                elapsed_before = checkpoint.elapsed_time
+                progress_history = list(checkpoint.progress_history)
+                self.logger.info(f"Resuming evolution from generation {start_generation}")
+
+            generation_times = [progress['generation_time'] for progress in progress_history]
+            prev_best = [progress['best_fitness'] for progress in progress_history]
 
             # Parametry
             n_generations = params.get('iterations', 1000)
+            checkpoint_path = params.get('checkpoint_path')
+            checkpoint_interval = max(1, int(params.get('checkpoint_interval', 50)))
+            record = None
 
             # Główna pętla ewolucyjna
-            for gen in range(n_generations):
+            for gen in range(start_generation, n_generations):
                 gen_start = time.time()
 
-                # Aktualizacja współczynników adaptacyjnych
-                try:
-                    diversity = calculate_population_diversity(population)
-                    operators.update_adaptive_rates(diversity)
-                except Exception as e:
-                    self.logger.warning(f"Error calculating diversity: {str(e)}, using default value")
-                    diversity = 0.5  # Wartość domyślna
-                    operators.update_adaptive_rates(diversity)
-
-                # Selekcja rodziców
-                offspring = self._select_parents(population, toolbox)
-
-                # Krzyżowanie
-                offspring = self._apply_crossover(offspring, operators)
-
-                # Mutacja
-                offspring = self._apply_mutation(offspring, operators)
-
-                # Ocena nowego pokolenia
-                offspring = self._evaluate_offspring(offspring, toolbox)
-
-                # Aktualizacja populacji
-                population[:] = offspring
-
-                # Aktualizacja hall of fame
-                self.hall_of_fame.update(population)
-
-                # Zbieranie statystyk
-                record = self.stats.compile(population)
+                record = self.evolve_generation(population, toolbox, operators)
                 gen_time = time.time() - gen_start
                 generation_times.append(gen_time)
 
@@ -235,23 +275,61 @@ class PopulationManager:
 
                 # Sprawdzenie warunku zatrzymania
                 prev_best.append(record['max'])
-                if _should_stop(record, gen, prev_best):
+                stop = _should_stop(record, gen, prev_best)
+
+                # Punkt kontrolny (zawsze także po ostatniej generacji)
+                saved = False
+                if checkpoint_path and (stop or (gen + 1) % checkpoint_interval == 0 or gen + 1 == n_generations):
+                    self._save_checkpoint(
+                        checkpoint_path, gen + 1, population, operators, progress_history,
+                        elapsed_before + time.time() - start_time
+                    )
+                    saved = True
+
+                try:
+                    yield GenerationResult(
+                        generation=gen,
+                        best_fitness=record['max'],
+                        avg_fitness=record['avg'],
+                        time=gen_time,
+                        stats=record,
+                        progress=progress
+                    )
+                except GeneratorExit:
+                    # Konsument przerwał ewolucję — zapisz stan, aby można było ją wznowić
+                    self.logger.info(f"Evolution closed by consumer after generation {gen}")
+                    if checkpoint_path and not saved:
+                        self._save_checkpoint(
+                            checkpoint_path, gen + 1, population, operators, progress_history,
+                            elapsed_before + time.time() - start_time
+                        )
+                    raise
+
+                if stop:
                     self.logger.info(
                         f"Stopping early at generation {gen} - achieved desired fitness"
                     )
                     break
 
+            if record is None:
+                # Checkpoint pochodzi z zakończonego przebiegu — brak generacji do wykonania
+                record = self.stats.compile(population)
+            if not generation_times:
+                generation_times = [0.0]
+
             # Przygotowanie wyników
-            total_time = time.time() - start_time
+            total_time = elapsed_before + time.time() - start_time
             stats = GenerationStats(
                 total_time=total_time,
                 avg_generation_time=np.mean(generation_times),
                 min_generation_time=min(generation_times),
                 max_generation_time=max(generation_times),
-                total_generations=len(generation_times),
+                total_generations=len(progress_history),
                 best_fitness=self.hall_of_fame[0].fitness.values[0],
                 avg_fitness=record['avg'],
-                timestamp=datetime.now()
+                timestamp=datetime.now(),
+                phase_times=summarize_phases(progress_history),
+                local_search=summarize_local_search(progress_history)
             )
 
             return EvolutionResult(
@@ -265,10 +343,104 @@ class PopulationManager:
             self.logger.error(f"Error during evolution: {str(e)}")
             raise
 
+    def _save_checkpoint(self, path: str, generation: int, population: List, operators: 'GeneticOperators',
+                         progress_history: List[Dict], elapsed_time: float):
+        """Zapisuje checkpoint; błąd zapisu jest logowany, ale nie przerywa ewolucji"""
+        try:
+            save_checkpoint(path, Checkpoint.capture(
+                generation, population, self.hall_of_fame, operators, progress_history, elapsed_time
+            ))
+            self.logger.debug(f"Checkpoint saved at generation {generation}: {path}")
+        except Exception as e:
+            self.logger.error(f"Error saving checkpoint: {str(e)}")
+
+    def evolve_generation(
+            self,
+            population: List,
+            toolbox: 'base.Toolbox',
+            operators: 'GeneticOperators'
+    ) -> Dict:
+        """
+        Przeprowadza jedną generację: selekcję, krzyżowanie, mutację i ocenę.
+        Populacja jest podmieniana w miejscu, a hall of fame aktualizowany. 'elite_size' najlepszych
+        osobników poprzedniej populacji zastępuje najsłabszych potomków, więc najlepszy wynik nie spada.
+
+        Returns:
+            Dict: Statystyki populacji po generacji (avg, std, min, max, 'phases'
+                z czasami faz, jeśli włączono parametr 'phase_timing', oraz 'local_search'
+                z czasem i przyrostem fitness etapu przeszukiwania lokalnego, jeśli jest włączony)
+        """
+        timer = self.phase_timer
+        timer.start()
+
+        # Aktualizacja współczynników adaptacyjnych
+        try:
+            diversity = calculate_population_diversity(
+                population, self.params.get('diversity_sample_size', 100)
+            )
+            operators.update_adaptive_rates(diversity)
+        except Exception as e:
+            self.logger.warning(f"Error calculating diversity: {str(e)}, using default value")
+            diversity = 0.5  # Wartość domyślna
+            operators.update_adaptive_rates(diversity)
+        timer.lap('diversity')
+
+        # Elita poprzedniej populacji — potomkowie są kopiami, więc oryginały pozostają nienaruszone
+        elite = tools.selBest(population, min(int(self.params.get('elite_size', DEFAULT_ELITE_SIZE)), len(population)))
+
+        # Selekcja rodziców (mierzona osobno od klonowania)
+        offspring = self._select_parents(population, toolbox)
+        timer.lap('clone')
+
+        # Krzyżowanie
+        offspring = self._apply_crossover(offspring, operators)
+        timer.lap('crossover')
+
+        # Mutacja
+        offspring = self._apply_mutation(offspring, operators)
+        timer.lap('mutation')
+
+        # Ocena nowego pokolenia (wraz z dekodowaniem)
+        offspring = self._evaluate_offspring(offspring, toolbox)
+        timer.lap('evaluation')
+
+        # Przeszukiwanie lokalne najlepszych potomków
+        local_search = self._apply_local_search(offspring)
+        if local_search is not None:
+            timer.lap('local_search')
+
+        # Aktualizacja populacji
+        self._keep_elite(offspring, elite)
+        population[:] = offspring
+
+        # Aktualizacja hall of fame
+        self.hall_of_fame.update(population)
+        timer.lap('hall_of_fame')
+
+        # Zbieranie statystyk
+        record = self.stats.compile(population)
+        timer.lap('statistics')
+
+        if timer.enabled:
+            record['phases'] = dict(timer.phases)
+        if local_search is not None:
+            record['local_search'] = local_search
+        return record
+
+    @staticmethod
+    def _keep_elite(offspring: List, elite: List):
+        """Zastępuje najsłabszych potomków osobnikami elity"""
+        if not elite:
+            return
+        weakest = sorted(range(len(offspring)), key=lambda i: offspring[i].fitness.values[0])[:len(elite)]
+        for index, individual in zip(weakest, elite):
+            offspring[index] = individual
+
     def _select_parents(self, population: List, toolbox: 'base.Toolbox') -> List:
         """Wybiera rodziców do następnego pokolenia"""
         try:
             offspring = toolbox.select(population, len(population))
+            self.phase_timer.lap('selection')
             offspring = list(map(toolbox.clone, offspring))
             return offspring
         except Exception as e:
@@ -307,7 +479,7 @@ class PopulationManager:
         """Ocenia nowe pokolenie"""
         try:
             invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = toolbox.map(toolbox.evaluate, invalid_ind)
+            fitnesses = self._evaluate_all(invalid_ind, toolbox)
             for ind, fit in zip(invalid_ind, fitnesses):
                 ind.fitness.values = fit
             return offspring
@@ -315,6 +487,30 @@ class PopulationManager:
             self.logger.error(f"Error evaluating offspring: {str(e)}")
             raise
 
+    def _apply_local_search(self, offspring: List) -> Optional[Dict[str, float]]:
+        """Poprawia najlepsze osobniki przeszukiwaniem lokalnym; zwraca statystyki etapu (None, gdy wyłączone)"""
+        if self.local_search is None:
+            return None
+        try:
+            result = self.local_search.improve_population(offspring)
+            self.logger.debug(
+                "Local search: gain=%.3f, evaluations=%d, time=%.4fs",
+                result['gain'], result['evaluations'], result['time']
+            )
+            return result
+        except Exception as e:
+            self.logger.error(f"Error applying local search: {str(e)}")
+            raise
+
+    @staticmethod
+    def _evaluate_all(individuals: List, toolbox: 'base.Toolbox') -> List[Tuple[float]]:
+        """Ocenia osobniki jedną partią, jeśli toolbox ma evaluate_population, w przeciwnym razie pojedynczo"""
+        if not individuals:
+            return []
+        if hasattr(toolbox, 'evaluate_population'):
+            return list(toolbox.evaluate_population(individuals))
+        return list(toolbox.map(toolbox.evaluate, individuals))
+
     def _record_progress(
             self,
             gen: int,
@@ -332,6 +528,10 @@ class PopulationManager:
             'generation_time': gen_time,
             'progress_percent': (gen + 1) / self.params['iterations'] * 100
         }
+        if 'phases' in record:
+            progress['phases'] = record['phases']
+        if 'local_search' in record:
+            progress['local_search'] = record['local_search']
 
         if callback:
             callback(progress)
@@ -0,0 +1,683 @@
+# src/genetic/genetic_tabu.py
+
+"""
+Przeszukiwanie tabu z ruchami łańcuchów Kempego.
+
+Plan przechowywany jest bez konfliktów: lekcje przyjęte przy dekodowaniu osobnika są
+rozmieszczone, a odrzucone czekają na wstawienie. Indeksy zajętości (klasa, nauczyciel
+i sala × slot → lekcja) pozwalają w O(1) sprawdzić, kto zajmuje zasób w danym slocie.
+
+Ruchy:
+- łańcuch Kempego między slotami s1 i s2 — lekcja przechodzi z s1 do s2, a lekcje, z którymi
+  koliduje (ta sama klasa lub nauczyciel), przechodzą z s2 do s1, rekurencyjnie; gdy s2 to slot
+  innej lekcji tej samej klasy, jest to zamiana dwóch lekcji klasy. Kolizje sal rozwiązywane są
+  zmianą sali, a w ostateczności dołączeniem lekcji do łańcucha — plan po ruchu jest bez konfliktów,
+- zmiana nauczyciela lub sali lekcji na wolnych w jej slocie i odpowiednich dla przedmiotu,
+- wstawienie lekcji nierozmieszczonej do slotu wolnego dla klasy (z wolnym nauczycielem i salą)
+  i usunięcie lekcji z planu (gdy np. nauczyciele przekraczają limity godzin).
+
+Ocena ruchu nie zmienia planu: liczniki dotkniętych klas, dni, nauczycieli i sal liczone są
+w słownikach nadpisań, a składniki kar tymi samymi wzorami co w DeltaEvaluator — koszt zależy
+od liczby przenoszonych lekcji, nie od rozmiaru planu. W każdej iteracji losowana jest próbka
+ruchów i wykonywany najlepszy dozwolony, także gorszy od bieżącego planu. Powrót lekcji do
+opuszczonego slotu (albo do poprzedniego nauczyciela lub sali) jest zakazany przez kadencję
+tabu; kryterium aspiracji dopuszcza ruch zakazany, który daje plan lepszy od najlepszego.
+Kadencja rośnie ze stagnacją i wraca do bazowej po poprawie, a po długiej stagnacji
+przeszukiwanie wraca do najlepszego planu.
+
+Ruch w próbce wybierany jest jak w wyżarzaniu — według energii (nieobcięta suma kar minus wynik),
+bo wynik 0-100 bywa płaski (np. przy metryce obciążenia nauczycieli równej 0). Najlepszy plan
+i aspiracja porównywane są jak w przeszukiwaniu lokalnym: wynik, przy remisie suma kar.
+Budżetem jest czas ('tabu_time_limit', w sekundach). Postęp raportowany jest jak
+w PopulationManager: krok ('tabu_step_iterations' iteracji) to jedna „generacja”.
+"""
+
+import random
+import time
+from datetime import datetime
+from typing import Dict, Generator, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from src.genetic.creator import get_individual_class
+from src.genetic.genetic_delta import DAY_PENALTY, DeltaEvaluator, N_SLOTS
+from src.genetic.genetic_encoding import DAYS, HOURS_PER_DAY
+from src.genetic.genetic_local_search import EPSILON
+from src.genetic.genetic_utils import EvolutionResult, GenerationResult, GenerationStats, run_to_completion
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+if TYPE_CHECKING:
+    from src.genetic.genetic_evaluator import GeneticEvaluator
+
+# Prawdopodobieństwo próby wstawienia lekcji nierozmieszczonej (jeśli takie są)
+INSERT_PROBABILITY = 0.3
+
+# Prawdopodobieństwa zmiany nauczyciela i zmiany sali zamiast łańcucha Kempego
+TEACHER_PROBABILITY = 0.1
+ROOM_PROBABILITY = 0.1
+
+# Prawdopodobieństwo usunięcia lekcji z planu (staje się nierozmieszczona)
+REMOVE_PROBABILITY = 0.05
+
+# Prawdopodobieństwo, że drugim slotem łańcucha jest slot innej lekcji tej samej klasy
+CLASS_SWAP_PROBABILITY = 0.5
+
+# Liczba losowanych slotów przy szukaniu miejsca dla lekcji nierozmieszczonej
+SLOT_TRIES = 8
+
+# Co tyle iteracji bez poprawy kadencja rośnie o 1 (do czterokrotności bazowej)
+TENURE_STEP = 50
+MAX_TENURE_FACTOR = 4
+
+# Wynik, po którego osiągnięciu przeszukiwanie kończy się wcześniej (jak w _should_stop)
+TARGET_FITNESS = 95
+
+# Zmiana planu: (lekcja, nowy slot lub -1 przy usunięciu z planu, nowy nauczyciel, nowa sala)
+Change = Tuple[int, int, int, int]
+
+
+class TabuSearch:
+    """Optymalizuje jeden plan przeszukiwaniem tabu z łańcuchami Kempego i adaptacyjną kadencją"""
+
+    def __init__(self, school: School, evaluator: 'GeneticEvaluator', params: Dict,
+                 time_limit: Optional[float] = None):
+        """
+        Args:
+            school: Szkoła, dla której generujemy plan
+            evaluator: Ewaluator algorytmu (wymaga backendu 'numpy')
+            params: Parametry 'tabu_time_limit', 'tabu_tenure', 'tabu_candidates',
+                'tabu_restart_iterations', 'tabu_step_iterations'
+            time_limit: Budżet czasu w sekundach (nadpisuje 'tabu_time_limit', np. przy intensyfikacji)
+
+        Raises:
+            ValueError: Gdy ewaluator nie ma kernela NumPy
+        """
+        if evaluator.kernel is None:
+            raise ValueError("Tabu search requires the numpy evaluator backend")
+
+        self.logger = GPLLogger(__name__)
+        self.delta = evaluator.delta if evaluator.delta is not None else DeltaEvaluator(evaluator.kernel)
+
+        self.time_limit = float(time_limit if time_limit is not None else params.get('tabu_time_limit', 30))
+        self.base_tenure = max(1, int(params.get('tabu_tenure', 10)))
+        self.candidates = max(1, int(params.get('tabu_candidates', 50)))
+        self.restart_iterations = max(1, int(params.get('tabu_restart_iterations', 2000)))
+        self.step_iterations = max(1, int(params.get('tabu_step_iterations', 100)))
+
+        # Nauczyciele i sale odpowiednie dla każdego przedmiotu
+        self.subject_teachers: List[List[int]] = [
+            [school.teacher_index[teacher.id] for teacher in school.subject_teachers[subject.name]]
+            for subject in school.subject_list
+        ]
+        self.subject_rooms: List[List[int]] = [
+            [school.classroom_index[room.id] for room in school.subject_rooms[subject.name]]
+            for subject in school.subject_list
+        ]
+
+        # Lekcje (indeksy genów osobnika początkowego); slot -1 oznacza lekcję nierozmieszczoną
+        self.genes: Optional[np.ndarray] = None
+        self.lessons: List[int] = []
+        self.class_of: Dict[int, int] = {}
+        self.subject_of: Dict[int, int] = {}
+        self.slot_of: Dict[int, int] = {}
+        self.teacher_of: Dict[int, int] = {}
+        self.room_of: Dict[int, int] = {}
+        self.unplaced: List[int] = []
+        self.placed: List[int] = []
+
+        # Najlepszy dotąd plan: (sloty, nauczyciele, sale) lekcji, wynik i kara
+        self.best_plan: Optional[Tuple[Dict[int, int], Dict[int, int], Dict[int, int]]] = None
+        self.best_fitness = 0.0
+        self.best_penalty = 0.0
+
+    def best(self):
+        """Kopia najlepszego dotąd osobnika (lub None przed rozpoczęciem przeszukiwania)"""
+        if self.best_plan is None:
+            return None
+        individual = get_individual_class()(self._encode(*self.best_plan))
+        individual.fitness.values = (self.best_fitness,)
+        return individual
+
+    def search(self, individual: np.ndarray, progress_callback=None) -> EvolutionResult:
+        """Przeprowadza przeszukiwanie do końca (patrz search_iter)"""
+        return run_to_completion(self.search_iter(individual, progress_callback))
+
+    def search_iter(self, individual: np.ndarray, progress_callback=None,
+                    first_step: int = 0) -> Generator[GenerationResult, None, EvolutionResult]:
+        """
+        Przeszukuje sąsiedztwo planu, zwracając wynik każdego kroku.
+
+        Args:
+            individual: Plan początkowy (nie jest modyfikowany)
+            progress_callback: Funkcja do raportowania postępu
+            first_step: Numer pierwszego kroku (ciągła numeracja po innym optymalizatorze)
+
+        Yields:
+            GenerationResult po każdym kroku ('generation' to numer kroku)
+
+        Returns:
+            EvolutionResult z najlepszym planem (wartość StopIteration)
+        """
+        try:
+            start_time = time.time()
+            self._load(np.asarray(individual))
+            totals = self._totals()
+            score, penalty = self.delta.score_from_totals(*totals), self.delta.penalty_from_totals(*totals)
+            self._store_best(score, penalty)
+            self.logger.info(
+                "Tabu search started: fitness=%.2f, lessons=%d (unplaced %d), time limit=%.0fs",
+                score, len(self.lessons), len(self.unplaced), self.time_limit
+            )
+
+            progress_history: List[Dict] = []
+            step_times = []
+            tabu_until: Dict[Tuple[int, int], int] = {}
+            iteration = 0
+            stagnation = 0
+            restarts = 0
+            tenure = self.base_tenure
+            step = first_step
+
+            while True:
+                step_start = time.time()
+
+                for _ in range(self.step_iterations):
+                    iteration += 1
+                    chosen = None
+                    for _ in range(self.candidates):
+                        changes = self._propose()
+                        if changes is None:
+                            continue
+                        new_score, new_penalty, updates = self._evaluate(changes)
+                        aspiration = self._better(new_score, new_penalty, self.best_fitness, self.best_penalty)
+                        if not aspiration and self._is_tabu(changes, tabu_until, iteration):
+                            continue
+                        energy = new_penalty - new_score
+                        if chosen is None or energy < chosen[0]:
+                            chosen = (energy, new_score, new_penalty, changes, updates)
+                    if chosen is None:
+                        stagnation += 1
+                        continue
+
+                    _, score, penalty, changes, updates = chosen
+                    # Zakaz powrotu lekcji do opuszczonych slotów, nauczycieli i sal
+                    tenure = min(
+                        self.base_tenure * MAX_TENURE_FACTOR, self.base_tenure + stagnation // TENURE_STEP
+                    ) + random.randrange(self.base_tenure // 2 + 1)
+                    for attribute in self._attributes(changes)[1]:
+                        tabu_until[attribute] = iteration + tenure
+                    self._commit(changes, updates)
+
+                    if self._better(score, penalty, self.best_fitness, self.best_penalty):
+                        self._store_best(score, penalty)
+                        stagnation = 0
+                    else:
+                        stagnation += 1
+
+                    # Restart od najlepszego planu po długiej stagnacji
+                    if stagnation >= self.restart_iterations:
+                        self._restore(*self.best_plan)
+                        score, penalty = self.best_fitness, self.best_penalty
+                        tabu_until.clear()
+                        stagnation = 0
+                        restarts += 1
+                        self.logger.debug("Tabu search restarted from the best plan at iteration %d", iteration)
+
+                    if self.best_fitness >= TARGET_FITNESS:
+                        break
+
+                elapsed = time.time() - start_time
+                fraction = min(1.0, elapsed / self.time_limit) if self.time_limit > 0 else 1.0
+
+                step_time = time.time() - step_start
+                step_times.append(step_time)
+                progress = self._record_progress(
+                    step, score, step_time, fraction, tenure, iteration, progress_callback
+                )
+                progress_history.append(progress)
+
+                yield GenerationResult(
+                    generation=step,
+                    best_fitness=self.best_fitness,
+                    avg_fitness=score,
+                    time=step_time,
+                    stats={'avg': score, 'std': 0.0, 'min': score, 'max': self.best_fitness},
+                    progress=progress
+                )
+
+                step += 1
+                if fraction >= 1.0 or self.best_fitness >= TARGET_FITNESS:
+                    break
+
+            total_time = time.time() - start_time
+            self.logger.info(
+                "Tabu search finished: fitness=%.2f, iterations=%d (%.0f/s), restarts=%d",
+                self.best_fitness, iteration, iteration / max(total_time, EPSILON), restarts
+            )
+
+            stats = GenerationStats(
+                total_time=total_time,
+                avg_generation_time=np.mean(step_times),
+                min_generation_time=min(step_times),
+                max_generation_time=max(step_times),
+                total_generations=len(step_times),
+                best_fitness=self.best_fitness,
+                avg_fitness=score,
+                timestamp=datetime.now()
+            )
+
+            return EvolutionResult(
+                best_individual=self.best(),
+                best_fitness=self.best_fitness,
+                progress_history=progress_history,
+                stats=stats
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error during tabu search: {str(e)}")
+            raise
+
+    def _load(self, genes: np.ndarray):
+        """Buduje plan bez konfliktów z osobnika: lekcje przyjęte przy dekodowaniu są rozmieszczone"""
+        self.genes = genes.copy()
+        state = self.delta.build(self.genes)
+        slots, teachers, rooms = {}, {}, {}
+        self.lessons = []
+        self.class_of, self.subject_of = {}, {}
+
+        for index, gene in enumerate(self.genes.tolist()):
+            day, hour, class_idx, subject_idx, teacher_idx, room_idx = gene
+            if not (0 <= class_idx < self.delta.n_classes and 0 <= subject_idx < self.delta.n_subjects):
+                continue
+            self.lessons.append(index)
+            self.class_of[index] = class_idx
+            self.subject_of[index] = subject_idx
+            slots[index], teachers[index], rooms[index] = -1, teacher_idx, room_idx
+
+        for slot, accepted in enumerate(state.slot_accepted):
+            for index, _, _, _ in accepted:
+                slots[index] = slot
+
+        self._restore(slots, teachers, rooms)
+
+    def _restore(self, slots: Dict[int, int], teachers: Dict[int, int], rooms: Dict[int, int]):
+        """Odtwarza plan, indeksy zajętości i liczniki z rozmieszczenia lekcji"""
+        self.slot_of, self.teacher_of, self.room_of = dict(slots), dict(teachers), dict(rooms)
+
+        delta = self.delta
+        self.class_at = [-1] * (delta.n_classes * N_SLOTS)
+        self.teacher_at = [-1] * (delta.n_teachers * N_SLOTS)
+        self.room_at = [-1] * (delta.n_rooms * N_SLOTS)
+        self.class_count = [0] * delta.n_classes
+        self.class_hours = [0] * (delta.n_classes * DAYS)
+        self.teacher_day = [0] * (delta.n_teachers * DAYS)
+        self.teacher_week = [0] * delta.n_teachers
+        self.room_count = [0] * delta.n_rooms
+        self.placed, self.unplaced = [], []
+
+        for lesson in self.lessons:
+            slot = self.slot_of[lesson]
+            if slot < 0:
+                self.unplaced.append(lesson)
+                continue
+            self.placed.append(lesson)
+            class_idx, teacher_idx, room_idx = self.class_of[lesson], self.teacher_of[lesson], self.room_of[lesson]
+            day, hour = divmod(slot, HOURS_PER_DAY)
+            self.class_at[class_idx * N_SLOTS + slot] = lesson
+            self.teacher_at[teacher_idx * N_SLOTS + slot] = lesson
+            self.room_at[room_idx * N_SLOTS + slot] = lesson
+            self.class_count[class_idx] += 1
+            self.class_hours[class_idx * DAYS + day] |= 1 << hour
+            self.teacher_day[teacher_idx * DAYS + day] += 1
+            self.teacher_week[teacher_idx] += 1
+            self.room_count[room_idx] += 1
+
+        self.class_penalty = [delta.class_penalty(index, count) for index, count in enumerate(self.class_count)]
+        self.teacher_penalty = [
+            delta.teacher_penalty(index, self.teacher_day[index * DAYS:(index + 1) * DAYS], weekly)
+            for index, weekly in enumerate(self.teacher_week)
+        ]
+        self.room_score = [delta.room_score(count) for count in self.room_count]
+        self.class_total = sum(self.class_penalty)
+        self.distribution_total = sum(DAY_PENALTY[mask] for mask in self.class_hours)
+        self.teacher_total = sum(self.teacher_penalty)
+        self.room_total = sum(self.room_score)
+        self.scheduled_total = len(self.placed)
+
+    def _totals(self) -> Tuple[float, int, int, int, int]:
+        """Sumy składników kar bieżącego planu (argumenty DeltaEvaluator.metrics_from_totals)"""
+        return (self.class_total, self.scheduled_total, self.distribution_total,
+                self.teacher_total, self.room_total)
+
+    def _store_best(self, score: float, penalty: float):
+        """Zapamiętuje bieżący plan jako najlepszy"""
+        self.best_plan = (dict(self.slot_of), dict(self.teacher_of), dict(self.room_of))
+        self.best_fitness, self.best_penalty = score, penalty
+
+    def _encode(self, slots: Dict[int, int], teachers: Dict[int, int], rooms: Dict[int, int]) -> np.ndarray:
+        """
+        Zapisuje plan jako geny: najpierw lekcje rozmieszczone (dekodowanie przyjmie je wszystkie),
+        potem nierozmieszczone w slocie zajętym przez ich klasę (zostaną odrzucone), na końcu puste geny
+        """
+        genes = np.full_like(self.genes, -1)
+        placed = [lesson for lesson in self.lessons if slots[lesson] >= 0]
+        class_slots: Dict[int, int] = {}
+        for lesson in placed:
+            class_slots.setdefault(self.class_of[lesson], slots[lesson])
+
+        position = 0
+        for lesson in placed + [lesson for lesson in self.lessons if slots[lesson] < 0]:
+            slot = slots[lesson]
+            if slot < 0:
+                slot = class_slots.get(self.class_of[lesson], 0)
+            day, hour = divmod(slot, HOURS_PER_DAY)
+            genes[position] = (day, hour, self.class_of[lesson], self.subject_of[lesson],
+                               teachers[lesson], rooms[lesson])
+            position += 1
+        return genes
+
+    @staticmethod
+    def _better(score: float, penalty: float, other_score: float, other_penalty: float) -> bool:
+        """Czy plan (score, penalty) jest lepszy od drugiego: wynik, przy remisie mniejsza kara"""
+        return score > other_score + EPSILON or (score > other_score - EPSILON and penalty < other_penalty - EPSILON)
+
+    def _attributes(self, changes: List[Change]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Atrybuty tabu ruchu: przyjmowane i opuszczane pary (lekcja, slot), (lekcja, N_SLOTS + sala)
+        i (lekcja, -1 - nauczyciel). Przy wstawieniu i usunięciu lekcji liczy się tylko slot.
+        """
+        entering, leaving = [], []
+        for lesson, slot, teacher_idx, room_idx in changes:
+            old_slot, old_teacher, old_room = self.slot_of[lesson], self.teacher_of[lesson], self.room_of[lesson]
+            if slot != old_slot:
+                if slot >= 0:
+                    entering.append((lesson, slot))
+                if old_slot >= 0:
+                    leaving.append((lesson, old_slot))
+            if old_slot < 0 or slot < 0:
+                continue
+            if teacher_idx != old_teacher:
+                entering.append((lesson, -1 - teacher_idx))
+                leaving.append((lesson, -1 - old_teacher))
+            if room_idx != old_room:
+                entering.append((lesson, N_SLOTS + room_idx))
+                leaving.append((lesson, N_SLOTS + old_room))
+        return entering, leaving
+
+    def _is_tabu(self, changes: List[Change], tabu_until: Dict[Tuple[int, int], int], iteration: int) -> bool:
+        """Czy ruch przywraca lekcji zakazany slot, nauczyciela lub salę"""
+        entering, _ = self._attributes(changes)
+        return any(tabu_until.get(attribute, 0) > iteration for attribute in entering)
+
+    def _propose(self) -> Optional[List[Change]]:
+        """Losuje ruch; None, gdy wylosowany ruch jest niewykonalny"""
+        if self.unplaced and random.random() < INSERT_PROBABILITY:
+            return self._insertion(random.choice(self.unplaced))
+        if not self.placed:
+            return None
+
+        lesson = random.choice(self.placed)
+        draw = random.random()
+        if draw < TEACHER_PROBABILITY:
+            return self._teacher_change(lesson)
+        if draw < TEACHER_PROBABILITY + ROOM_PROBABILITY:
+            return self._room_change(lesson)
+        if draw < TEACHER_PROBABILITY + ROOM_PROBABILITY + REMOVE_PROBABILITY:
+            return [(lesson, -1, self.teacher_of[lesson], self.room_of[lesson])]
+
+        source = self.slot_of[lesson]
+        target = None
+        if random.random() < CLASS_SWAP_PROBABILITY:
+            # Slot innej lekcji tej samej klasy — łańcuch zaczyna się od zamiany dwóch lekcji klasy
+            row = self.class_of[lesson] * N_SLOTS
+            offset = random.randrange(N_SLOTS)
+            for step in range(N_SLOTS):
+                slot = (offset + step) % N_SLOTS
+                if slot != source and self.class_at[row + slot] >= 0:
+                    target = slot
+                    break
+        if target is None:
+            target = (source + random.randrange(1, N_SLOTS)) % N_SLOTS
+        return self._kempe_chain(lesson, target)
+
+    def _kempe_chain(self, lesson: int, target: int) -> List[Change]:
+        """
+        Łańcuch Kempego lekcji między jej slotem a slotem target: składowa spójna grafu konfliktów
+        (wspólna klasa lub nauczyciel) w dwóch slotach, zawierająca lekcję. Lekcja, której sala jest
+        zajęta w nowym slocie, dostaje inną wolną salę odpowiednią dla przedmiotu, a gdy takiej nie ma,
+        lekcja zajmująca salę dołącza do łańcucha.
+        """
+        source = self.slot_of[lesson]
+        chain = {lesson: source}
+        queue = [lesson]
+        while True:
+            while queue:
+                current = queue.pop()
+                other = target if chain[current] == source else source
+                for occupant in (
+                    self.class_at[self.class_of[current] * N_SLOTS + other],
+                    self.teacher_at[self.teacher_of[current] * N_SLOTS + other]
+                ):
+                    if occupant >= 0 and occupant not in chain:
+                        chain[occupant] = other
+                        queue.append(occupant)
+
+            # Sale — najpierw pozostają te, które w nowym slocie są wolne lub zwalniane przez łańcuch
+            rooms = {}
+            taken = {source: set(), target: set()}
+            conflicts = []
+            for member, slot in chain.items():
+                other = target if slot == source else source
+                room_idx = self.room_of[member]
+                occupant = self.room_at[room_idx * N_SLOTS + other]
+                if occupant < 0 or occupant in chain:
+                    rooms[member] = room_idx
+                    taken[other].add(room_idx)
+                else:
+                    conflicts.append((member, other, occupant))
+
+            for member, other, occupant in conflicts:
+                for room_idx in self.subject_rooms[self.subject_of[member]]:
+                    holder = self.room_at[room_idx * N_SLOTS + other]
+                    if room_idx not in taken[other] and (holder < 0 or holder in chain):
+                        rooms[member] = room_idx
+                        taken[other].add(room_idx)
+                        break
+                else:
+                    chain[occupant] = other
+                    queue.append(occupant)
+            if not queue:
+                break
+
+        return [
+            (member, target if slot == source else source, self.teacher_of[member], rooms[member])
+            for member, slot in chain.items()
+        ]
+
+    def _teacher_change(self, lesson: int) -> Optional[List[Change]]:
+        """Przekazanie lekcji innemu nauczycielowi przedmiotu, wolnemu w jej slocie"""
+        slot, teacher_idx = self.slot_of[lesson], self.teacher_of[lesson]
+        free = [
+            teacher for teacher in self.subject_teachers[self.subject_of[lesson]]
+            if teacher != teacher_idx and self.teacher_at[teacher * N_SLOTS + slot] < 0
+        ]
+        if not free:
+            return None
+        return [(lesson, slot, random.choice(free), self.room_of[lesson])]
+
+    def _room_change(self, lesson: int) -> Optional[List[Change]]:
+        """Przeniesienie lekcji do innej wolnej sali odpowiedniej dla przedmiotu"""
+        slot, room_idx = self.slot_of[lesson], self.room_of[lesson]
+        free = [
+            room for room in self.subject_rooms[self.subject_of[lesson]]
+            if room != room_idx and self.room_at[room * N_SLOTS + slot] < 0
+        ]
+        if not free:
+            return None
+        return [(lesson, slot, self.teacher_of[lesson], random.choice(free))]
+
+    def _insertion(self, lesson: int) -> Optional[List[Change]]:
+        """Wstawienie lekcji nierozmieszczonej do losowego slotu wolnego dla klasy, nauczyciela i sali"""
+        class_row = self.class_of[lesson] * N_SLOTS
+        subject_idx = self.subject_of[lesson]
+        for _ in range(SLOT_TRIES):
+            slot = random.randrange(N_SLOTS)
+            if self.class_at[class_row + slot] >= 0:
+                continue
+
+            teacher_idx = self.teacher_of[lesson]
+            if not 0 <= teacher_idx < self.delta.n_teachers or self.teacher_at[teacher_idx * N_SLOTS + slot] >= 0:
+                free = [
+                    teacher for teacher in self.subject_teachers[subject_idx]
+                    if self.teacher_at[teacher * N_SLOTS + slot] < 0
+                ]
+                if not free:
+                    continue
+                teacher_idx = random.choice(free)
+
+            room_idx = self.room_of[lesson]
+            suitable = self.subject_rooms[subject_idx]
+            if room_idx not in suitable or self.room_at[room_idx * N_SLOTS + slot] >= 0:
+                free = [room for room in suitable if self.room_at[room * N_SLOTS + slot] < 0]
+                if not free:
+                    continue
+                room_idx = random.choice(free)
+
+            return [(lesson, slot, teacher_idx, room_idx)]
+        return None
+
+    def _evaluate(self, changes: List[Change]) -> Tuple[float, float, Tuple]:
+        """
+        Ocenia ruch bez zmiany planu — liczniki dotkniętych zasobów trafiają do słowników nadpisań.
+
+        Returns:
+            Krotka (wynik, kara, nadpisania do zapisania przez _commit)
+        """
+        hours: Dict[int, int] = {}
+        teacher_day: Dict[int, int] = {}
+        teacher_week: Dict[int, int] = {}
+        rooms: Dict[int, int] = {}
+        classes: Dict[int, int] = {}
+        scheduled = self.scheduled_total
+
+        for lesson, slot, teacher_idx, room_idx in changes:
+            class_idx = self.class_of[lesson]
+            old_slot = self.slot_of[lesson]
+            if old_slot >= 0:
+                day, hour = divmod(old_slot, HOURS_PER_DAY)
+                key = class_idx * DAYS + day
+                hours[key] = hours.get(key, self.class_hours[key]) ^ (1 << hour)
+                old_teacher, old_room = self.teacher_of[lesson], self.room_of[lesson]
+                key = old_teacher * DAYS + day
+                teacher_day[key] = teacher_day.get(key, self.teacher_day[key]) - 1
+                teacher_week[old_teacher] = teacher_week.get(old_teacher, self.teacher_week[old_teacher]) - 1
+                rooms[old_room] = rooms.get(old_room, self.room_count[old_room]) - 1
+            else:
+                classes[class_idx] = classes.get(class_idx, self.class_count[class_idx]) + 1
+                scheduled += 1
+            if slot < 0:
+                classes[class_idx] = classes.get(class_idx, self.class_count[class_idx]) - 1
+                scheduled -= 1
+                continue
+
+            day, hour = divmod(slot, HOURS_PER_DAY)
+            key = class_idx * DAYS + day
+            hours[key] = hours.get(key, self.class_hours[key]) ^ (1 << hour)
+            key = teacher_idx * DAYS + day
+            teacher_day[key] = teacher_day.get(key, self.teacher_day[key]) + 1
+            teacher_week[teacher_idx] = teacher_week.get(teacher_idx, self.teacher_week[teacher_idx]) + 1
+            rooms[room_idx] = rooms.get(room_idx, self.room_count[room_idx]) + 1
+
+        delta = self.delta
+        distribution = self.distribution_total
+        for key, mask in hours.items():
+            distribution += DAY_PENALTY[mask] - DAY_PENALTY[self.class_hours[key]]
+
+        teacher_penalties = {}
+        teacher_total = self.teacher_total
+        for teacher_idx, weekly in teacher_week.items():
+            row = teacher_idx * DAYS
+            penalty = delta.teacher_penalty(
+                teacher_idx, [teacher_day.get(row + day, self.teacher_day[row + day]) for day in range(DAYS)], weekly
+            )
+            teacher_penalties[teacher_idx] = penalty
+            teacher_total += penalty - self.teacher_penalty[teacher_idx]
+
+        room_scores = {}
+        room_total = self.room_total
+        for room_idx, count in rooms.items():
+            room_scores[room_idx] = delta.room_score(count)
+            room_total += room_scores[room_idx] - self.room_score[room_idx]
+
+        class_penalties = {}
+        class_total = self.class_total
+        for class_idx, count in classes.items():
+            class_penalties[class_idx] = delta.class_penalty(class_idx, count)
+            class_total += class_penalties[class_idx] - self.class_penalty[class_idx]
+
+        totals = (class_total, scheduled, distribution, teacher_total, room_total)
+        updates = (hours, teacher_day, teacher_week, rooms, classes,
+                   teacher_penalties, room_scores, class_penalties, totals)
+        return delta.score_from_totals(*totals), delta.penalty_from_totals(*totals), updates
+
+    def _commit(self, changes: List[Change], updates: Tuple):
+        """Wykonuje ruch: aktualizuje lekcje, indeksy zajętości i liczniki (nadpisania z _evaluate)"""
+        (hours, teacher_day, teacher_week, rooms, classes,
+         teacher_penalties, room_scores, class_penalties, totals) = updates
+
+        # Najpierw zwolnienie starych miejsc wszystkich lekcji ruchu, potem zajęcie nowych
+        for lesson, _, _, _ in changes:
+            slot = self.slot_of[lesson]
+            if slot < 0:
+                self.unplaced.remove(lesson)
+                self.placed.append(lesson)
+                continue
+            self.class_at[self.class_of[lesson] * N_SLOTS + slot] = -1
+            self.teacher_at[self.teacher_of[lesson] * N_SLOTS + slot] = -1
+            self.room_at[self.room_of[lesson] * N_SLOTS + slot] = -1
+        for lesson, slot, teacher_idx, room_idx in changes:
+            self.slot_of[lesson], self.teacher_of[lesson], self.room_of[lesson] = slot, teacher_idx, room_idx
+            if slot < 0:
+                self.placed.remove(lesson)
+                self.unplaced.append(lesson)
+                continue
+            self.class_at[self.class_of[lesson] * N_SLOTS + slot] = lesson
+            self.teacher_at[teacher_idx * N_SLOTS + slot] = lesson
+            self.room_at[room_idx * N_SLOTS + slot] = lesson
+
+        for values, target in ((hours, self.class_hours), (teacher_day, self.teacher_day),
+                               (teacher_week, self.teacher_week), (rooms, self.room_count),
+                               (classes, self.class_count), (teacher_penalties, self.teacher_penalty),
+                               (room_scores, self.room_score), (class_penalties, self.class_penalty)):
+            for key, value in values.items():
+                target[key] = value
+        self.class_total, self.scheduled_total, self.distribution_total, self.teacher_total, self.room_total = totals
+
+    def _record_progress(self, step: int, score: float, step_time: float, fraction: float, tenure: int,
+                         iterations: int, callback=None) -> Dict:
+        """Wpis historii postępu w formacie PopulationManager._record_progress"""
+        progress = {
+            'generation': step,
+            'best_fitness': self.best_fitness,
+            'avg_fitness': score,
+            'std_fitness': 0.0,
+            'min_fitness': score,
+            'generation_time': step_time,
+            'progress_percent': fraction * 100,
+            'tenure': tenure,
+            'iterations': iterations,
+            'unplaced': len(self.unplaced)
+        }
+
+        if callback:
+            callback(progress)
+
+        self.logger.info(
+            f"Step {step}: Best={self.best_fitness:.2f}, "
+            f"Current={score:.2f}, "
+            f"Tenure={tenure}, "
+            f"Time={step_time:.4f}s"
+        )
+
+        return progress
@@ -1,8 +1,14 @@
 # src/genetic/genetic_utils.py
 
-from dataclasses import dataclass
+import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict
+from typing import Generator, List, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.genetic.genetic_encoding import individual_hash, pack_genes
 
 
 @dataclass
@@ -16,6 +22,8 @@ class GenerationStats:
     best_fitness: float  # Najlepszy znaleziony wynik
     avg_fitness: float  # Średni wynik końcowej populacji
     timestamp: datetime  # Czas zakończenia generowania
+    phase_times: Dict[str, Dict[str, float]] = field(default_factory=dict)  # Faza -> p50/p95/max/total
+    local_search: Dict[str, float] = field(default_factory=dict)  # Sumy etapu przeszukiwania lokalnego
 
     def to_dict(self) -> Dict:
         """Konwertuje statystyki do słownika"""
@@ -27,7 +35,9 @@ class GenerationStats:
             'total_generations': self.total_generations,
             'best_fitness': self.best_fitness,
             'avg_fitness': self.avg_fitness,
-            'timestamp': self.timestamp.isoformat()
+            'timestamp': self.timestamp.isoformat(),
+            'phase_times': self.phase_times,
+            'local_search': self.local_search
         }
 
     @staticmethod
@@ -41,18 +51,77 @@ class GenerationStats:
             total_generations=data['total_generations'],
             best_fitness=data['best_fitness'],
             avg_fitness=data['avg_fitness'],
-            timestamp=datetime.fromisoformat(data['timestamp'])
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            phase_times=data.get('phase_times', {}),
+            local_search=data.get('local_search', {})
         )
 
 
+class PhaseTimer:
+    """
+    Stoper faz generacji (parametr 'phase_timing').
+    Wyłączony niczego nie mierzy — lap() kończy się od razu, więc koszt to samo wywołanie metody.
+    """
+
+    __slots__ = ('enabled', 'phases', '_last')
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: Dict[str, float] = {}
+        self._last = 0.0
+
+    def start(self):
+        """Rozpoczyna pomiar nowej generacji"""
+        if self.enabled:
+            self.phases = {}
+            self._last = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Dolicza czas od poprzedniego punktu do fazy phase"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+
+def summarize_phases(progress_history: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """Agreguje czasy faz z historii postępu: mediana, 95. percentyl, maksimum i suma (w sekundach)"""
+    samples: Dict[str, List[float]] = {}
+    for progress in progress_history:
+        for phase, duration in progress.get('phases', {}).items():
+            samples.setdefault(phase, []).append(duration)
+
+    return {
+        phase: {
+            'p50': float(np.percentile(durations, 50)),
+            'p95': float(np.percentile(durations, 95)),
+            'max': float(max(durations)),
+            'total': float(sum(durations))
+        }
+        for phase, durations in samples.items()
+    }
+
+
+def summarize_local_search(progress_history: List[Dict]) -> Dict[str, float]:
+    """Sumuje czas, przyrost fitness, liczbę ocen i poprawionych osobników etapu przeszukiwania lokalnego"""
+    totals: Dict[str, float] = {}
+    for progress in progress_history:
+        for key, value in progress.get('local_search', {}).items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
 @dataclass
 class GenerationResult:
-    """Wynik pojedynczej generacji"""
-    best_individual: List  # Najlepszy osobnik
-    best_fitness: float  # Jego ocena
-    avg_fitness: float  # Średnia ocena populacji
+    """Wynik pojedynczej generacji (migawka zwracana przez ScheduleGenerator.generate_iter)"""
     generation: int  # Numer generacji
+    best_fitness: float  # Najlepsza ocena w populacji
+    avg_fitness: float  # Średnia ocena populacji
     time: float  # Czas generacji w sekundach
+    stats: Dict[str, float]  # Statystyki populacji (avg, std, min, max)
+    progress: Dict  # Wpis historii postępu (jak w progress_callback)
+    best_individual: Optional[List] = None  # Najlepszy dotąd osobnik (tylko na żądanie)
 
 
 @dataclass
@@ -64,38 +133,101 @@ class EvolutionResult:
     stats: GenerationStats  # Statystyki końcowe
 
 
-def calculate_population_diversity(population: List) -> float:
+def run_to_completion(generator: Generator):
+    """Wyczerpuje generator ewolucji i zwraca jego wartość końcową (EvolutionResult)"""
+    while True:
+        try:
+            next(generator)
+        except StopIteration as finished:
+            return finished.value
+
+
+@dataclass
+class PopulationDiversity:
+    """Miary różnorodności populacji (wszystkie w zakresie 0-1)"""
+    entropy: float  # Średnia znormalizowana entropia wartości genów na każdej pozycji
+    hamming: float  # Średnia odległość Hamminga między parami osobników (odsetek różnych genów)
+    unique_ratio: float  # Odsetek unikalnych osobników
+
+
+def _column_value_counts(genes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Liczności wartości genów na każdej pozycji chromosomu.
+
+    Args:
+        genes: Tablica (osobniki × geny × pola)
+
+    Returns:
+        Para (indeks pozycji, liczność) — po jednym elemencie na każdą różną wartość na pozycji
+    """
+    n_individuals, n_genes = genes.shape[:2]
+
+    # Gen jako para słów uint64 (jak w haszu Zobrista); sortowanie leksykograficzne na każdej pozycji
+    low, high = pack_genes(genes)
+    order = np.lexsort((high.T, low.T), axis=-1)
+    low = np.take_along_axis(low.T, order, axis=1)
+    high = np.take_along_axis(high.T, order, axis=1)
+
+    starts = np.ones((n_genes, n_individuals), dtype=bool)
+    starts[:, 1:] = (low[:, 1:] != low[:, :-1]) | (high[:, 1:] != high[:, :-1])
+    run_starts = np.flatnonzero(starts)
+    counts = np.diff(np.append(run_starts, n_genes * n_individuals))
+    return run_starts // n_individuals, counts
+
+
+def population_diversity(population: List, sample_size: Optional[int] = None) -> PopulationDiversity:
     """
-    Oblicza różnorodność populacji.
+    Oblicza entropię genów, średnią odległość Hamminga i odsetek unikalnych osobników.
+
+    Obie miary wynikają z liczności wartości na każdej pozycji, więc nie wymagają porównywania par
+    (koszt O(P·G·log P)). Przy sample_size koszt jest ograniczony niezależnie od wielkości populacji.
+
+    Args:
+        population: Lista osobników (tablic genów o jednakowym kształcie)
+        sample_size: Maksymalna liczba losowanych osobników (None = cała populacja)
+
+    Returns:
+        PopulationDiversity
+    """
+    individuals = [ind for ind in population if ind is not None]
+    if sample_size is not None and len(individuals) > sample_size:
+        individuals = random.sample(individuals, sample_size)
+    if len(individuals) < 2:
+        return PopulationDiversity(entropy=0.0, hamming=0.0, unique_ratio=1.0 if individuals else 0.0)
+
+    unique_ratio = len({individual_hash(ind) for ind in individuals}) / len(individuals)
+
+    genes = np.stack([np.asarray(ind) for ind in individuals])
+    n_individuals, n_genes = genes.shape[:2]
+    positions, counts = _column_value_counts(genes)
+
+    # Entropia na pozycji, znormalizowana przez maksimum log(P)
+    probabilities = counts / n_individuals
+    entropy = np.bincount(positions, weights=-probabilities * np.log(probabilities), minlength=n_genes)
+    entropy = float(entropy.mean() / np.log(n_individuals))
+
+    # Pary z tą samą wartością na pozycji: suma n·(n-1) po wartościach
+    same_pairs = np.bincount(positions, weights=counts * (counts - 1.0), minlength=n_genes)
+    hamming = float(np.mean(1.0 - same_pairs / (n_individuals * (n_individuals - 1))))
+
+    return PopulationDiversity(entropy=entropy, hamming=hamming, unique_ratio=unique_ratio)
+
+
+def calculate_population_diversity(population: List, sample_size: Optional[int] = None) -> float:
+    """
+    Oblicza różnorodność populacji (sygnał dla update_adaptive_rates).
 
     Args:
         population: Lista osobników
+        sample_size: Maksymalna liczba losowanych osobników (None = cała populacja)
 
     Returns:
-        float: Wartość 0-1, gdzie 1 oznacza maksymalną różnorodność
+        float: Średnia odległość Hamminga, 0-1, gdzie 1 oznacza maksymalną różnorodność
     """
     if not population:
         return 0.0
 
-    # Zamieniamy każdy element osobnika na tuple, żeby był hashowalny
-    unique_individuals = set()
-
-    for ind in population:
-        if ind is None:
-            continue
-
-        # Bezpieczne tworzenie tupli z osobnika, obsługując None
-        try:
-            ind_tuple = tuple(
-                tuple(lesson) if lesson is not None else None
-                for lesson in ind
-            )
-            unique_individuals.add(ind_tuple)
-        except TypeError:
-            # Jeśli wystąpi błąd podczas tworzenia tuple, pomiń tego osobnika
-            continue
-
-    return len(unique_individuals) / len(population) if population else 0.0
+    return population_diversity(population, sample_size).hamming
 
 
 def format_time(seconds: float) -> str:
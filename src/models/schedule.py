@@ -1,7 +1,7 @@
 # src/models/schedule.py
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 
 from src.models.classroom import Classroom
 from src.models.lesson import Lesson
@@ -22,37 +22,64 @@ class Schedule:
         self.lessons = []
         self.class_groups = set()
         self.school = school
-        self.logger = GPLLogger(__name__)
+        self.logger = logger
+
+        # Indeksy slotów: (dzień, godzina, zasób) -> lekcja
+        self._slot_teachers: Dict[Tuple, Lesson] = {}
+        self._slot_rooms: Dict[Tuple, Lesson] = {}
+        self._slot_classes: Dict[Tuple, Lesson] = {}
+
+        # Indeksy zasobów: zasób -> lista lekcji
+        self._class_lessons: Dict[str, List[Lesson]] = defaultdict(list)
+        self._teacher_lessons: Dict[Teacher, List[Lesson]] = defaultdict(list)
+        self._room_lessons: Dict[Classroom, List[Lesson]] = defaultdict(list)
 
     def get_class_lessons(self, class_name: str) -> List[Lesson]:
         """Zwraca wszystkie lekcje dla danej klasy"""
-        return [lesson for lesson in self.lessons if lesson.class_group == class_name]
+        return list(self._class_lessons.get(class_name, ()))
+
+    def get_teacher_lessons(self, teacher: Teacher) -> List[Lesson]:
+        """Zwraca wszystkie lekcje danego nauczyciela"""
+        return list(self._teacher_lessons.get(teacher, ()))
+
+    def get_classroom_lessons(self, classroom: Classroom) -> List[Lesson]:
+        """Zwraca wszystkie lekcje w danej sali"""
+        return list(self._room_lessons.get(classroom, ()))
 
     def get_used_teachers(self) -> Set[Teacher]:
         """Zwraca zbiór wszystkich nauczycieli wykorzystanych w planie"""
-        return {lesson.teacher for lesson in self.lessons}
+        return {teacher for teacher, lessons in self._teacher_lessons.items() if lessons}
 
     def get_class_hours(self, class_group: str) -> Dict[str, int]:
         """Zwraca liczbę godzin dla danej klasy z podziałem na przedmioty"""
         subject_hours = defaultdict(int)
-        for lesson in self.get_class_lessons(class_group):
+        for lesson in self._class_lessons.get(class_group, ()):
             subject_hours[lesson.subject.name] += 1
         return dict(subject_hours)
 
     def get_teacher_hours(self, teacher: Teacher) -> Dict[str, int]:
         """Zwraca liczbę godzin nauczyciela (dziennie i tygodniowo)"""
         daily_hours = defaultdict(int)
-        weekly_total = 0
-        for lesson in self.lessons:
-            if lesson.teacher == teacher:
-                daily_hours[lesson.day] += 1
-                weekly_total += 1
+        teacher_lessons = self._teacher_lessons.get(teacher, ())
+        for lesson in teacher_lessons:
+            daily_hours[lesson.day] += 1
 
         return {
             'daily': dict(daily_hours),
-            'weekly': weekly_total
+            'weekly': len(teacher_lessons)
         }
 
+    def is_slot_free(self, day: int, hour: int, teacher: Teacher = None, classroom: Classroom = None,
+                     class_group: str = None) -> bool:
+        """Sprawdza, czy podane zasoby są wolne w danym slocie (pominięte zasoby nie są sprawdzane)"""
+        if teacher is not None and (day, hour, teacher) in self._slot_teachers:
+            return False
+        if classroom is not None and (day, hour, classroom) in self._slot_rooms:
+            return False
+        if class_group is not None and (day, hour, class_group) in self._slot_classes:
+            return False
+        return True
+
     def add_lesson(self, lesson: Lesson) -> bool:
         """Dodaje lekcję do planu, jeśli nie powoduje konfliktów"""
         if not isinstance(lesson, Lesson):
@@ -66,10 +93,40 @@ class Schedule:
         if not self._check_conflicts(lesson):
             self.lessons.append(lesson)
             self.class_groups.add(lesson.class_group)
+            self._index_lesson(lesson)
             return True
 
         return False
 
+    def remove_lesson(self, lesson: Lesson) -> bool:
+        """Usuwa lekcję z planu; zwraca False, jeśli lekcji nie ma w planie"""
+        slot_key = (lesson.day, lesson.hour, lesson.class_group)
+        if self._slot_classes.get(slot_key) != lesson:
+            return False
+
+        self.lessons.remove(lesson)
+        del self._slot_teachers[(lesson.day, lesson.hour, lesson.teacher)]
+        del self._slot_rooms[(lesson.day, lesson.hour, lesson.classroom)]
+        del self._slot_classes[slot_key]
+
+        self._teacher_lessons[lesson.teacher].remove(lesson)
+        self._room_lessons[lesson.classroom].remove(lesson)
+        class_lessons = self._class_lessons[lesson.class_group]
+        class_lessons.remove(lesson)
+        if not class_lessons:
+            self.class_groups.discard(lesson.class_group)
+        return True
+
+    def _index_lesson(self, lesson: Lesson):
+        """Dodaje lekcję do indeksów slotów i zasobów"""
+        self._slot_teachers[(lesson.day, lesson.hour, lesson.teacher)] = lesson
+        self._slot_rooms[(lesson.day, lesson.hour, lesson.classroom)] = lesson
+        self._slot_classes[(lesson.day, lesson.hour, lesson.class_group)] = lesson
+
+        self._class_lessons[lesson.class_group].append(lesson)
+        self._teacher_lessons[lesson.teacher].append(lesson)
+        self._room_lessons[lesson.classroom].append(lesson)
+
     @staticmethod
     def _conflict_reason(new_lesson: Lesson, existing_lesson: Lesson) -> str:
         """Zwraca powód konfliktu między lekcjami"""
@@ -89,17 +146,12 @@ class Schedule:
 
     def _check_conflicts(self, new_lesson: Lesson) -> bool:
         """Sprawdza, czy nowa lekcja nie powoduje konfliktów"""
-        day, hour = new_lesson.day, new_lesson.hour
-
-        # Sprawdź tylko lekcje o tej samej godzinie
-        for lesson in self.lessons:
-            if lesson.day == day and lesson.hour == hour:
-                if (lesson.teacher == new_lesson.teacher or
-                        lesson.classroom == new_lesson.classroom or
-                        lesson.class_group == new_lesson.class_group):
-                    return True
-
-        return False
+        return not self.is_slot_free(
+            new_lesson.day, new_lesson.hour,
+            teacher=new_lesson.teacher,
+            classroom=new_lesson.classroom,
+            class_group=new_lesson.class_group
+        )
 
     def to_dict(self) -> Dict:
         """Konwertuje plan do słownika do zapisu w JSON"""
@@ -129,10 +181,10 @@ class Schedule:
 
     def get_all_classrooms(self) -> Set[Classroom]:
         """Returns all classrooms used in the schedule"""
-        return {lesson.classroom for lesson in self.lessons}
+        return {classroom for classroom, lessons in self._room_lessons.items() if lessons}
 
     def get_classroom_usage(self, classroom: Classroom) -> float:
         """Calculates classroom usage percentage"""
-        usage = sum(1 for lesson in self.lessons if lesson.classroom == classroom)
+        usage = len(self._room_lessons.get(classroom, ()))
         total_slots = 40  # 8 hours * 5 days
         return (usage / total_slots) * 100
@@ -1,8 +1,10 @@
 # src/models/school.py
 
 import string
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Dict
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Tuple
 
 from src.models.classroom import Classroom
 from src.models.lesson import Lesson
@@ -12,6 +14,21 @@ from src.utils.logger import GPLLogger
 
 logger = GPLLogger(__name__)
 
+# Przedmioty podstawowe i ich tygodniowa liczba godzin (rozszerzenie to +1 godzina)
+BASIC_SUBJECT_HOURS: Mapping[str, int] = MappingProxyType({
+    "polski": 4,  # było 4
+    "matematyka": 3,  # było 4
+    "angielski": 3,
+    "fizyka": 1,  # było 2
+    "chemia": 1,  # było 2
+    "biologia": 1,  # było 2
+    "geografia": 1,  # było 2
+    "historia": 2,
+    "wos": 1,
+    "informatyka": 1,
+    "wf": 3
+})
+
 
 @dataclass
 class ClassGroup:
@@ -42,32 +59,73 @@ class School:
             }]
 
         # Inicjalizacja w odpowiedniej kolejności
-        self._initialize_basic_infrastructure()
+        self._initialize_basic_infrastructure(config)
         self.initialize_classes(config)
+        self._build_indexes()
+        self._build_eligibility()
 
         logger.info(f"Zainicjalizowano szkołę z {len(self.class_groups)} klasami")
 
-    def _initialize_basic_infrastructure(self):
-        """Inicjalizuje podstawowe zasoby szkoły"""
-        self._initialize_subjects()
-        self._initialize_classrooms()
-        self._initialize_teachers()
+    def _initialize_basic_infrastructure(self, config: Dict):
+        """
+        Inicjalizuje podstawowe zasoby szkoły. Listy 'subjects', 'classrooms' i 'teachers'
+        z konfiguracji (słowniki z polami Subject / Classroom / Teacher — dowolne iterowalne,
+        np. strumień wierszy pliku) zastępują domyślne przedmioty, sale i nauczycieli.
+        """
+        if config.get('subjects'):
+            self._load_subjects(config['subjects'])
+        else:
+            self._initialize_subjects()
+
+        if config.get('classrooms'):
+            self._load_classrooms(config['classrooms'])
+        else:
+            self._initialize_classrooms()
+
+        if config.get('teachers'):
+            self._load_teachers(config['teachers'])
+        else:
+            self._initialize_teachers()
+
+    def _load_subjects(self, subjects: Iterable[Dict]):
+        """Wczytuje przedmioty z konfiguracji (rozszerzenia muszą być podane jawnie jako '<nazwa>_rozszerzony')"""
+        for data in subjects:
+            subject = Subject(**data)
+            if subject.name in self.subjects:
+                raise ValueError(f"Duplicate subject name: {subject.name}")
+            self.subjects[subject.name] = subject
+
+        logger.debug(f"Loaded {len(self.subjects)} subjects from configuration")
+
+    def _load_classrooms(self, classrooms: Iterable[Dict]):
+        """Wczytuje sale z konfiguracji"""
+        for data in classrooms:
+            classroom = Classroom(**data)
+            if classroom.id in self.classrooms:
+                raise ValueError(f"Duplicate classroom id: {classroom.id}")
+            self.classrooms[classroom.id] = classroom
+
+        logger.debug(f"Loaded {len(self.classrooms)} classrooms from configuration")
+
+    def _load_teachers(self, teachers: Iterable[Dict]):
+        """Wczytuje nauczycieli z konfiguracji"""
+        for data in teachers:
+            teacher = Teacher(**data)
+            if teacher.id in self.teachers:
+                raise ValueError(f"Duplicate teacher id: {teacher.id}")
+            for subject_name in teacher.subjects:
+                if subject_name not in self.subjects:
+                    logger.warning(f"Teacher {teacher.name} has unknown subject: {subject_name}")
+            self.teachers[teacher.id] = teacher
+
+        logger.debug(f"Loaded {len(self.teachers)} teachers from configuration")
 
     def _initialize_subjects(self):
         """Inicjalizuje wszystkie przedmioty"""
         # Podstawowe przedmioty z prawidłową liczbą godzin
         basic_subjects = [
-            Subject(id=1, name="polski", hours_per_week=4),  # było 4
-            Subject(id=2, name="matematyka", hours_per_week=3),  # było 4
-            Subject(id=3, name="angielski", hours_per_week=3),
-            Subject(id=4, name="fizyka", hours_per_week=1),  # było 2
-            Subject(id=5, name="chemia", hours_per_week=1),  # było 2
-            Subject(id=6, name="biologia", hours_per_week=1),  # było 2
-            Subject(id=7, name="geografia", hours_per_week=1),  # było 2
-            Subject(id=8, name="historia", hours_per_week=2),
-            Subject(id=9, name="wos", hours_per_week=1),
-            Subject(id=10, name="informatyka", hours_per_week=1),
-            Subject(id=11, name="wf", hours_per_week=3)
+            Subject(id=subject_id, name=name, hours_per_week=hours)
+            for subject_id, (name, hours) in enumerate(BASIC_SUBJECT_HOURS.items(), 1)
         ]
 
         # Dodaj podstawowe przedmioty do słownika
@@ -193,6 +251,76 @@ class School:
                 self.class_groups.append(class_group)
                 logger.debug(f"Created class {class_group.name} with profile {profile['name']}")
 
+    def _build_indexes(self):
+        """
+        Nadaje klasom, przedmiotom, nauczycielom i salom małe indeksy całkowite.
+        Chromosom algorytmu genetycznego przechowuje te indeksy zamiast nazw i obiektów.
+        """
+        self.class_names: List[str] = [class_group.name for class_group in self.class_groups]
+        self.class_index: Dict[str, int] = {name: idx for idx, name in enumerate(self.class_names)}
+
+        self.subject_list: List[Subject] = list(self.subjects.values())
+        self.subject_index: Dict[str, int] = {
+            subject.name: idx for idx, subject in enumerate(self.subject_list)
+        }
+
+        self.teacher_list: List[Teacher] = list(self.teachers.values())
+        self.teacher_index: Dict[int, int] = {
+            teacher.id: idx for idx, teacher in enumerate(self.teacher_list)
+        }
+
+        self.classroom_list: List[Classroom] = list(self.classrooms.values())
+        self.classroom_index: Dict[int, int] = {
+            classroom.id: idx for idx, classroom in enumerate(self.classroom_list)
+        }
+
+        # Wyszukiwanie po nazwie (pierwszy obiekt o danej nazwie)
+        self.teacher_by_name: Dict[str, Teacher] = {}
+        for teacher in self.teacher_list:
+            self.teacher_by_name.setdefault(teacher.name, teacher)
+        self.classroom_by_name: Dict[str, Classroom] = {}
+        for classroom in self.classroom_list:
+            self.classroom_by_name.setdefault(classroom.name, classroom)
+
+    def _build_eligibility(self):
+        """
+        Kompiluje niezmienne tabele dopasowań używane przez operatory genetyczne:
+        przedmiot -> nauczyciele, przedmiot -> sale oraz klasa -> wymagane godziny przedmiotów.
+        """
+        self.subject_teachers: Mapping[str, Tuple[Teacher, ...]] = MappingProxyType({
+            name: tuple(teacher for teacher in self.teacher_list if name in teacher.subjects)
+            for name in self.subjects
+        })
+        self.subject_rooms: Mapping[str, Tuple[Classroom, ...]] = MappingProxyType({
+            name: tuple(room for room in self.classroom_list if self.room_fits_subject(subject, room))
+            for name, subject in self.subjects.items()
+        })
+
+        # Multizbiór wymaganych przedmiotów klasy: nazwa przedmiotu -> liczba godzin tygodniowo
+        self.class_required_subjects: Mapping[str, Mapping[str, int]] = MappingProxyType({
+            class_group.name: MappingProxyType(Counter(
+                {subject.name: subject.hours_per_week for subject in class_group.subjects}
+            ))
+            for class_group in self.class_groups
+        })
+
+    @staticmethod
+    def room_fits_subject(subject: Subject, room: Classroom) -> bool:
+        """Sprawdza, czy sala jest odpowiednia dla przedmiotu"""
+        # Sprawdź, czy przedmiot wymaga specjalnej sali
+        if subject.requires_special_classroom and room.room_type != subject.special_classroom_type:
+            return False
+
+        # Specjalne wymagania dla WF
+        if subject.name == 'wf' and room.room_type != 'sala_gimnastyczna':
+            return False
+
+        # Specjalne wymagania dla informatyki
+        if subject.name in ['informatyka', 'informatyka_rozszerzony'] and room.room_type != 'sala_komputerowa':
+            return False
+
+        return True
+
     def get_subject(self, name: str) -> Subject:
         """Zwraca przedmiot o danej nazwie"""
         subject = self.subjects.get(name)
@@ -224,6 +352,14 @@ class School:
         """Zwraca salę o danym id"""
         return self.classrooms.get(id)
 
+    def get_teacher_by_name(self, name: str) -> Teacher:
+        """Zwraca nauczyciela o danym nazwisku"""
+        return self.teacher_by_name.get(name)
+
+    def get_classroom_by_name(self, name: str) -> Classroom:
+        """Zwraca salę o danej nazwie"""
+        return self.classroom_by_name.get(name)
+
     def get_basic_subjects(self) -> List[Subject]:
         """Zwraca listę podstawowych (nierozszerzonych) przedmiotów"""
         return [
@@ -17,7 +17,7 @@ class Teacher:
     max_hours_per_week: int = 40
 
     def __post_init__(self):
-        logger.debug(f"Created teacher: {self.name} with subjects: {self.subjects}")
+        logger.debug("Created teacher: %s with subjects: %s", self.name, self.subjects)
 
     def can_teach(self, subject: str) -> bool:
         """Sprawdza czy nauczyciel może uczyć danego przedmiotu"""
@@ -0,0 +1,152 @@
+# src/repository/school_repository.py
+
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Union
+
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+
+def _to_bool(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'tak', 'yes', 't', 'y')
+
+
+def _to_list(value: str):
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+
+# Konwersja kolumn CSV (tekst) na pola modeli; puste komórki pomijamy (wartość domyślna modelu)
+CSV_FIELDS: Dict[str, Dict[str, Callable]] = {
+    'subjects': {
+        'id': int, 'name': str, 'hours_per_week': int,
+        'requires_special_classroom': _to_bool, 'special_classroom_type': str
+    },
+    'teachers': {
+        'id': int, 'name': str, 'subjects': _to_list,
+        'max_hours_per_day': int, 'max_hours_per_week': int
+    },
+    'classrooms': {
+        'id': int, 'name': str, 'capacity': int, 'room_type': str, 'equipment': _to_list
+    }
+}
+
+
+class SchoolRepository:
+    """
+    Wczytywanie definicji szkoły z plików.
+
+    Obsługiwane źródła:
+    - plik .json z konfiguracją (format GUI: 'class_counts', 'profiles'; opcjonalnie
+      listy 'subjects', 'teachers', 'classrooms'),
+    - katalog z plikiem school.json (format GUI) oraz plikami subjects / teachers /
+      classrooms w formacie .csv (nagłówek z nazwami pól, listy rozdzielane ';') lub
+      .jsonl (jeden obiekt JSON w wierszu).
+
+    Wiersze plików CSV i JSONL czytane są strumieniowo — School tworzy obiekty
+    w trakcie czytania, bez wczytywania całego pliku do pamięci.
+    """
+
+    ENTITIES = ('subjects', 'teachers', 'classrooms')
+    CONFIG_FILE = 'school.json'
+
+    def __init__(self, data_dir: str = 'data'):
+        self.data_dir = Path(data_dir)
+        self.logger = GPLLogger(__name__)
+
+    def load_school(self, source: Union[str, Path]) -> School:
+        """Tworzy szkołę z pliku konfiguracji lub katalogu z danymi"""
+        return School(self.load_config(source))
+
+    def load_config(self, source: Union[str, Path]) -> Dict:
+        """
+        Wczytuje konfigurację szkoły. Listy zasobów z plików CSV/JSONL są generatorami
+        (jednorazowymi) — konfigurację należy przekazać do School tylko raz.
+
+        Args:
+            source: Plik .json lub katalog (ścieżki względne liczone od data_dir, jeśli tam istnieją)
+
+        Raises:
+            FileNotFoundError: Gdy źródło nie istnieje
+            ValueError: Gdy format źródła jest nieobsługiwany
+        """
+        path = self._resolve(source)
+
+        try:
+            if path.is_dir():
+                config = self._load_directory(path)
+            elif path.suffix.lower() == '.json':
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            else:
+                raise ValueError(f"Unsupported school definition format: {path}")
+
+            self.logger.info(f"School definition loaded: {path}")
+            return config
+
+        except Exception as e:
+            self.logger.error(f"Error loading school definition {path}: {str(e)}")
+            raise
+
+    def _resolve(self, source: Union[str, Path]) -> Path:
+        """Ścieżka źródła — bezwzględna, względna do katalogu roboczego lub do data_dir"""
+        path = Path(source)
+        if not path.exists() and (self.data_dir / path).exists():
+            path = self.data_dir / path
+        if not path.exists():
+            raise FileNotFoundError(f"School definition not found: {source}")
+        return path
+
+    def _load_directory(self, directory: Path) -> Dict:
+        """Konfiguracja z katalogu: school.json + pliki zasobów"""
+        config_path = directory / self.CONFIG_FILE
+        # Bez school.json szkoła ma jedną klasę pierwszą o domyślnym profilu
+        config = {'class_counts': {'first_year': 1}, 'profiles': []}
+        if config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+
+        for entity in self.ENTITIES:
+            records = self._entity_records(directory, entity)
+            if records is not None:
+                config[entity] = records
+
+        return config
+
+    def _entity_records(self, directory: Path, entity: str) -> Optional[Iterator[Dict]]:
+        """Generator rekordów zasobu z pliku CSV lub JSONL (None, jeśli brak pliku)"""
+        csv_path = directory / f"{entity}.csv"
+        if csv_path.exists():
+            return self.iter_csv(csv_path, CSV_FIELDS[entity])
+
+        jsonl_path = directory / f"{entity}.jsonl"
+        if jsonl_path.exists():
+            return self.iter_jsonl(jsonl_path)
+
+        return None
+
+    @staticmethod
+    def iter_csv(path: Path, fields: Dict[str, Callable]) -> Iterator[Dict]:
+        """Strumieniowo czyta plik CSV, konwertując kolumny według fields (nieznane kolumny są pomijane)"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for line_number, row in enumerate(csv.DictReader(f), 2):
+                try:
+                    yield {
+                        name: convert(row[name]) for name, convert in fields.items()
+                        if row.get(name) not in (None, '')
+                    }
+                except ValueError as e:
+                    raise ValueError(f"{path.name}, line {line_number}: {str(e)}")
+
+    @staticmethod
+    def iter_jsonl(path: Path) -> Iterator[Dict]:
+        """Strumieniowo czyta plik JSON Lines (puste wiersze są pomijane)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path.name}, line {line_number}: {str(e)}")
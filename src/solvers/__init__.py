@@ -0,0 +1,9 @@
+"""
+Alternatywne (niegenetyczne) metody układania planu lekcji.
+"""
+
+from src.solvers.milp_solver import MILPSolver
+
+__all__ = [
+    'MILPSolver'
+]
@@ -0,0 +1,413 @@
+# src/solvers/milp_solver.py
+
+"""
+Dokładny solver planu lekcji jako zadanie programowania całkowitoliczbowego (PuLP + CBC).
+
+Zmienne decyzyjne x[klasa-przedmiot, nauczyciel, dzień, godzina] są binarne. Ograniczenia
+twarde odpowiadają Schedule._check_conflicts: klasa, nauczyciel i sala najwyżej raz w slocie.
+Sale nie mają osobnych zmiennych — dla każdego zbioru sal odpowiednich dla przedmiotu
+liczba lekcji w slocie nie może przekroczyć jego wielkości, a konkretne sale przydzielane
+są po rozwiązaniu (skojarzenie w grafie dwudzielnym w każdym slocie). Dla zbiorów sal
+wyznaczanych przez School.room_fits_subject (wszystkie sale albo sale jednego typu) takie
+skojarzenie zawsze istnieje. Sale są przy tym zapełniane po kolei do docelowego
+wykorzystania (80% slotów), bo _evaluate_room_usage nagradza sale zajęte w 60-80%
+i karze sale zajęte poniżej 30%; na koniec sale tuż poniżej progów są dopełniane
+lekcjami z sal, którym ich ubytek nie obniża wkładu.
+
+Cel zawiera tylko część składników GeneticEvaluator — z wagami kar i metryk evaluatora:
+brakujące lekcje (kara dominująca), okienka, późne rozpoczęcie i zakończenie dnia,
+przekroczenia limitów nauczycieli oraz niedociążenie nauczyciela (poniżej połowy limitu
+tygodniowego). Wykorzystanie sal jest uwzględniane dopiero przy przydziale sal, a progi,
+przycięcie wyników do zakresu 0-100 oraz kary i nagrody zależne od wartości metryk
+pozostają poza modelem — wynik 0 solvera nie oznacza więc maksymalnego fitness.
+"""
+
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import pulp
+
+from src.genetic.genetic_delta import DeltaEvaluator
+from src.genetic.genetic_encoding import DAYS, HOURS_PER_DAY
+from src.genetic.genetic_kernel import ROOM_TOTAL_SLOTS
+from src.models.lesson import Lesson
+from src.models.schedule import Schedule
+from src.models.school import School
+from src.utils.logger import GPLLogger
+
+
+class MILPSolver:
+    """Układa plan lekcji, rozwiązując model MILP solverem CBC z limitem czasu"""
+
+    # Domyślny limit czasu solvera w sekundach (parametr 'solver_time_limit')
+    DEFAULT_TIME_LIMIT = 60
+
+    # Kara za każdą nieprzydzieloną godzinę — większa od wszystkich kar miękkich jednej lekcji
+    MISSING_LESSON_PENALTY = 100.0
+
+    # Kary miękkie jak w GeneticEvaluator (kara składnika × waga metryki)
+    GAP_PENALTY = 15 * 0.2  # okienko (distribution)
+    LATE_START_PENALTY = 10 * 0.2  # pierwsza lekcja po 3. godzinie (distribution)
+    LATE_END_PENALTY = 10 * 0.2  # lekcja po 7. godzinie (distribution)
+    DAILY_OVERLOAD_PENALTY = 10 * 0.2  # godzina ponad dzienny limit nauczyciela (teacher_load)
+    WEEKLY_OVERLOAD_PENALTY = 15 * 0.2  # godzina ponad tygodniowy limit nauczyciela (teacher_load)
+    UNDERUSED_TEACHER_PENALTY = 10 * 0.2  # nauczyciel poniżej połowy limitu tygodniowego (teacher_load)
+
+    # Docelowa liczba lekcji w sali przy przydziale sal (80% slotów, górna granica nagrody w _evaluate_room_usage)
+    TARGET_ROOM_LESSONS = int(0.8 * DAYS * HOURS_PER_DAY)
+
+    # Najpóźniejsza godzina rozpoczęcia i zakończenia bez kary (jak w _evaluate_distribution)
+    LAST_START_HOUR = 2
+    LAST_END_HOUR = 6
+
+    def __init__(self, school: School, params: Optional[Dict] = None):
+        self.school = school
+        self.params = params or {}
+        self.logger = GPLLogger(__name__)
+
+        # Statystyki ostatniego rozwiązania (solve)
+        self.stats: Dict = {}
+
+    def solve(self) -> Schedule:
+        """
+        Buduje i rozwiązuje model.
+
+        Returns:
+            Najlepszy znaleziony plan (bez konfliktów; lekcje, których nie udało się
+            przydzielić, są pominięte)
+
+        Raises:
+            RuntimeError: Gdy solver nie znalazł żadnego rozwiązania
+        """
+        start_time = time.time()
+
+        try:
+            problem, x, missing = self._build_model()
+            build_time = time.time() - start_time
+            self.logger.info(
+                f"MILP model built: {len(problem.variables())} variables, "
+                f"{len(problem.constraints())} constraints in {build_time:.2f}s"
+            )
+
+            problem.solve(self._solver())
+
+            if problem.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                raise RuntimeError(f"Solver found no solution: {pulp.LpSolution[problem.sol_status]}")
+
+            schedule = self._extract_schedule(x)
+            missing_lessons = int(round(sum(variable.value() or 0 for variable in missing.values())))
+
+            self.stats = {
+                'status': pulp.LpSolution[problem.sol_status],
+                'optimal': problem.sol_status == pulp.LpSolutionOptimal,
+                'objective': pulp.value(problem.objective),
+                'lessons': len(schedule.lessons),
+                'missing_lessons': missing_lessons,
+                'variables': len(problem.variables()),
+                'constraints': len(problem.constraints()),
+                'build_time': build_time,
+                'total_time': time.time() - start_time
+            }
+            self.logger.info(
+                f"MILP solved ({self.stats['status']}, optimal: {self.stats['optimal']}) in "
+                f"{self.stats['total_time']:.2f}s: {len(schedule.lessons)} lessons, {missing_lessons} missing"
+            )
+            return schedule
+
+        except Exception as e:
+            self.logger.error(f"MILP solver failed: {str(e)}")
+            raise
+
+    def _solver(self) -> pulp.LpSolver:
+        """
+        Solver CBC z limitem czasu z parametrów: zainstalowany osobno (COIN_CMD, np. pulp[cbc]),
+        a gdy go brak — dołączony do PuLP (PULP_CBC_CMD, dostępny do PuLP 4.0)
+        """
+        options = dict(
+            msg=bool(self.params.get('solver_verbose', False)),
+            timeLimit=self.params.get('solver_time_limit', self.DEFAULT_TIME_LIMIT),
+            gapRel=self.params.get('solver_gap'),
+            threads=self.params.get('solver_threads')
+        )
+        solver = pulp.COIN_CMD(**options)
+        if solver.available():
+            return solver
+        return pulp.PULP_CBC_CMD(**options)
+
+    def _requirements(self) -> List[Tuple[int, str]]:
+        """Pary (indeks klasy, nazwa przedmiotu), które trzeba zaplanować"""
+        return [
+            (class_idx, subject.name)
+            for class_idx, class_group in enumerate(self.school.class_groups)
+            for subject in class_group.subjects
+            if subject.hours_per_week > 0
+        ]
+
+    def _room_sets(self) -> Dict[str, FrozenSet[int]]:
+        """Przedmiot -> zbiór indeksów odpowiednich sal"""
+        return {
+            name: frozenset(self.school.classroom_index[room.id] for room in rooms)
+            for name, rooms in self.school.subject_rooms.items()
+        }
+
+    def _build_model(self):
+        """
+        Tworzy model MILP.
+
+        Returns:
+            Krotka (problem, zmienne x[(klasa, przedmiot, nauczyciel, dzień, godzina)],
+            zmienne brakujących godzin [(klasa, przedmiot)])
+        """
+        school = self.school
+        slots = [(day, hour) for day in range(DAYS) for hour in range(HOURS_PER_DAY)]
+        room_sets = self._room_sets()
+
+        problem = pulp.LpProblem('schedule', pulp.LpMinimize)
+        x = {}
+        missing = {}
+
+        # Lekcje w slocie według klasy, nauczyciela i zbioru sal
+        class_slot = defaultdict(list)
+        teacher_slot = defaultdict(list)
+        room_set_slot = defaultdict(list)
+        teacher_day = defaultdict(list)
+
+        for class_idx, subject_name in self._requirements():
+            subject = school.subjects[subject_name]
+            teachers = school.subject_teachers[subject_name]
+            rooms = room_sets[subject_name]
+
+            missing[class_idx, subject_name] = problem.add_variable(
+                f"missing_{class_idx}_{subject.id}", lowBound=0, upBound=subject.hours_per_week
+            )
+            if not teachers or not rooms:
+                self.logger.warning(f"No teacher or room for {subject_name} - it cannot be scheduled")
+                problem += missing[class_idx, subject_name] == subject.hours_per_week
+                continue
+
+            scheduled = []
+            for teacher in teachers:
+                teacher_idx = school.teacher_index[teacher.id]
+                for day, hour in slots:
+                    variable = problem.add_variable(
+                        f"x_{class_idx}_{subject.id}_{teacher_idx}_{day}_{hour}", cat=pulp.LpBinary
+                    )
+                    x[class_idx, subject_name, teacher_idx, day, hour] = variable
+                    scheduled.append(variable)
+                    class_slot[class_idx, day, hour].append(variable)
+                    teacher_slot[teacher_idx, day, hour].append(variable)
+                    room_set_slot[rooms, day, hour].append(variable)
+                    teacher_day[teacher_idx, day].append(variable)
+
+            # Każda godzina przedmiotu jest zaplanowana albo liczona jako brakująca
+            problem += pulp.lpSum(scheduled) + missing[class_idx, subject_name] == subject.hours_per_week
+
+        # Konflikty klas i nauczycieli
+        for variables in class_slot.values():
+            problem += pulp.lpSum(variables) <= 1
+        for variables in teacher_slot.values():
+            problem += pulp.lpSum(variables) <= 1
+
+        # Pojemność sal: lekcje, które mieszczą się tylko w salach ze zbioru, nie przekraczają jego wielkości
+        distinct_sets = {rooms for rooms, _, _ in room_set_slot}
+        for rooms in distinct_sets:
+            subsets = [other for other in distinct_sets if other <= rooms]
+            for day, hour in slots:
+                variables = [v for other in subsets for v in room_set_slot.get((other, day, hour), ())]
+                if len(variables) > len(rooms):
+                    problem += pulp.lpSum(variables) <= len(rooms)
+
+        penalties = [self.MISSING_LESSON_PENALTY * pulp.lpSum(missing.values())]
+        penalties.extend(self._teacher_load_penalties(problem, teacher_day))
+        penalties.extend(self._distribution_penalties(problem, class_slot))
+
+        problem += pulp.lpSum(penalties)
+        return problem, x, missing
+
+    def _teacher_load_penalties(self, problem: pulp.LpProblem, teacher_day: Dict) -> List:
+        """Zmienne przekroczeń i niedociążenia limitów nauczycieli oraz ich kary"""
+        penalties = []
+        teacher_week = defaultdict(list)
+
+        for (teacher_idx, day), variables in teacher_day.items():
+            teacher = self.school.teacher_list[teacher_idx]
+            teacher_week[teacher_idx].extend(variables)
+            if len(variables) <= teacher.max_hours_per_day:
+                continue
+            over = problem.add_variable(f"day_over_{teacher_idx}_{day}", lowBound=0)
+            problem += pulp.lpSum(variables) - over <= teacher.max_hours_per_day
+            penalties.append(self.DAILY_OVERLOAD_PENALTY * over)
+
+        for teacher_idx, variables in teacher_week.items():
+            teacher = self.school.teacher_list[teacher_idx]
+            over = problem.add_variable(f"week_over_{teacher_idx}", lowBound=0)
+            problem += pulp.lpSum(variables) - over <= teacher.max_hours_per_week
+            penalties.append(self.WEEKLY_OVERLOAD_PENALTY * over)
+
+            # Niedociążenie: underused = 0 wymusza co najmniej połowę limitu tygodniowego
+            underused = problem.add_variable(f"week_under_{teacher_idx}", cat=pulp.LpBinary)
+            problem += pulp.lpSum(variables) >= teacher.max_hours_per_week * 0.5 * (1 - underused)
+            penalties.append(self.UNDERUSED_TEACHER_PENALTY * underused)
+
+        return penalties
+
+    def _distribution_penalties(self, problem: pulp.LpProblem, class_slot: Dict) -> List:
+        """Zmienne okienek oraz późnego rozpoczęcia i zakończenia dnia klasy oraz ich kary"""
+        penalties = []
+
+        for class_idx in range(len(self.school.class_groups)):
+            for day in range(DAYS):
+                occupied = [pulp.lpSum(class_slot.get((class_idx, day, hour), ())) for hour in range(HOURS_PER_DAY)]
+
+                # Pierwsza i ostatnia zajęta godzina; okienka = rozpiętość dnia - liczba lekcji
+                first = problem.add_variable(f"first_{class_idx}_{day}", lowBound=0, upBound=HOURS_PER_DAY)
+                last = problem.add_variable(f"last_{class_idx}_{day}", lowBound=0, upBound=HOURS_PER_DAY - 1)
+                gaps = problem.add_variable(f"gaps_{class_idx}_{day}", lowBound=0)
+                for hour, lessons in enumerate(occupied):
+                    problem += last >= hour * lessons
+                    problem += first <= hour + HOURS_PER_DAY * (1 - lessons)
+                problem += gaps >= last - first + 1 - pulp.lpSum(occupied)
+                penalties.append(self.GAP_PENALTY * gaps)
+
+                # Dzień z lekcjami, ale bez żadnej z pierwszych godzin
+                late_start = problem.add_variable(f"late_start_{class_idx}_{day}", lowBound=0)
+                early = pulp.lpSum(occupied[:self.LAST_START_HOUR + 1])
+                for lessons in occupied[self.LAST_START_HOUR + 1:]:
+                    problem += late_start >= lessons - early
+                penalties.append(self.LATE_START_PENALTY * late_start)
+
+                penalties.append(self.LATE_END_PENALTY * pulp.lpSum(occupied[self.LAST_END_HOUR + 1:]))
+
+        return penalties
+
+    def _extract_schedule(self, x: Dict) -> Schedule:
+        """Odczytuje lekcje z rozwiązania i przydziela im sale"""
+        school = self.school
+        room_sets = self._room_sets()
+
+        by_slot = defaultdict(list)
+        for (class_idx, subject_name, teacher_idx, day, hour), variable in x.items():
+            if (variable.value() or 0) > 0.5:
+                by_slot[day, hour].append((class_idx, subject_name, teacher_idx))
+
+        # Przydział sal: [klasa, przedmiot, nauczyciel, sala] dla każdego slotu
+        room_usage = [0] * len(school.classroom_list)
+        assigned = {}
+        for (day, hour), lessons in sorted(by_slot.items()):
+            rooms = self._assign_rooms([room_sets[subject_name] for _, subject_name, _ in lessons], room_usage)
+
+            assigned[day, hour] = []
+            for (class_idx, subject_name, teacher_idx), room_idx in zip(lessons, rooms):
+                if room_idx is None:
+                    self.logger.warning(f"No free room for {subject_name} on day {day}, hour {hour} - skipping")
+                    continue
+                room_usage[room_idx] += 1
+                assigned[day, hour].append([class_idx, subject_name, teacher_idx, room_idx])
+
+        self._top_up_rooms(assigned, room_sets, room_usage)
+
+        schedule = Schedule(school=school)
+        for (day, hour), lessons in assigned.items():
+            for class_idx, subject_name, teacher_idx, room_idx in lessons:
+                schedule.add_lesson(Lesson(
+                    subject=school.subjects[subject_name],
+                    teacher=school.teacher_list[teacher_idx],
+                    classroom=school.classroom_list[room_idx],
+                    class_group=school.class_names[class_idx],
+                    day=day,
+                    hour=hour
+                ))
+
+        return schedule
+
+    @staticmethod
+    def _top_up_rooms(assigned: Dict[Tuple[int, int], List[List]], room_sets: Dict[str, FrozenSet[int]],
+                      room_usage: List[int]):
+        """
+        Przenosi lekcje (w obrębie ich slotów) do sal, którym brakuje kilku lekcji do wyższego
+        wkładu w _evaluate_room_usage (np. powyżej progu 30%). Lekcje zabierane są tylko z sal,
+        których wkład przez to nie maleje, a przeniesienia wykonywane są jedynie wtedy,
+        gdy sala osiąga wyższy wkład — wynik wykorzystania sal nigdy nie spada.
+
+        Args:
+            assigned: Lekcje slotów jako [klasa, przedmiot, nauczyciel, sala] (modyfikowane w miejscu)
+            room_sets: Przedmiot -> zbiór indeksów odpowiednich sal
+            room_usage: Liczba lekcji w każdej sali (aktualizowana)
+        """
+        room_score = DeltaEvaluator.room_score
+        improved = True
+        while improved:
+            improved = False
+            for room in sorted(range(len(room_usage)), key=lambda index: room_usage[index]):
+                current = room_score(room_usage[room])
+                goal = next((count for count in range(room_usage[room] + 1, ROOM_TOTAL_SLOTS + 1)
+                             if room_score(count) > current), None)
+                if goal is None:
+                    continue
+
+                # Zbieranie przeniesień do osiągnięcia celu na kopii liczników
+                usage = list(room_usage)
+                transfers = []
+                for lessons in assigned.values():
+                    if usage[room] >= goal:
+                        break
+                    if any(lesson[3] == room for lesson in lessons):
+                        continue
+                    for lesson in lessons:
+                        donor = lesson[3]
+                        if room in room_sets[lesson[1]] and usage[donor] - 1 > usage[room] and \
+                                room_score(usage[donor] - 1) >= room_score(usage[donor]):
+                            usage[donor] -= 1
+                            usage[room] += 1
+                            transfers.append(lesson)
+                            break
+
+                if usage[room] >= goal:
+                    for lesson in transfers:
+                        lesson[3] = room
+                    room_usage[:] = usage
+                    improved = True
+
+    @classmethod
+    def _assign_rooms(cls, room_sets: List[FrozenSet[int]], room_usage: List[int]) -> List[Optional[int]]:
+        """
+        Skojarzenie lekcji w jednym slocie z salami (ścieżki powiększające).
+
+        Każda lekcja próbuje najpierw sal poniżej docelowego wykorzystania — od najbardziej
+        zajętej, żeby kolejne sale dochodziły do progów _evaluate_room_usage zamiast dzielić
+        lekcje po równo — a dopiero potem sal zapełnionych, od najmniej zajętej.
+
+        Args:
+            room_sets: Zbiory sal odpowiednich dla kolejnych lekcji slotu
+            room_usage: Liczba lekcji przydzielonych dotąd każdej sali
+
+        Returns:
+            Indeks sali dla każdej lekcji (None, jeśli nie dało się jej przydzielić)
+        """
+        room_owner: Dict[int, int] = {}
+
+        def preference(room: int) -> Tuple[bool, int, int]:
+            usage = room_usage[room]
+            if usage < cls.TARGET_ROOM_LESSONS:
+                return False, -usage, room
+            return True, usage, room
+
+        def augment(lesson: int, visited: set) -> bool:
+            for room in sorted(room_sets[lesson], key=preference):
+                if room in visited:
+                    continue
+                visited.add(room)
+                if room not in room_owner or augment(room_owner[room], visited):
+                    room_owner[room] = lesson
+                    return True
+            return False
+
+        # Najpierw lekcje o najmniejszym wyborze sal
+        for lesson in sorted(range(len(room_sets)), key=lambda index: len(room_sets[index])):
+            augment(lesson, set())
+
+        assignment: List[Optional[int]] = [None] * len(room_sets)
+        for room, lesson in room_owner.items():
+            assignment[lesson] = room
+        return assignment
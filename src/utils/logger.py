@@ -1,12 +1,17 @@
 # src/utils/logger.py
 
+import atexit
 import logging
 import logging.handlers
+import multiprocessing.util
+import os
+import queue
 import sys
 import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, Hashable, Optional, Union
 
 # Importujemy colorama do kolorowania wyjścia
 from colorama import init, Fore, Style
@@ -14,6 +19,9 @@ from colorama import init, Fore, Style
 # Inicjalizacja colorama
 init(autoreset=True)
 
+# Komunikat logu: tekst lub funkcja budująca tekst dopiero, gdy komunikat zostanie zapisany
+LogMessage = Union[str, Callable[[], str]]
+
 
 class ColoredFormatter(logging.Formatter):
     """Niestandardowy formatter dodający kolory do całego logu"""
@@ -41,6 +49,80 @@ class ColoredFormatter(logging.Formatter):
         return formatted_msg
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler, który nie opróżnia bufora pliku po każdym rekordzie.
+    Bufor opróżnia BatchQueueListener po każdej porcji rekordów oraz zamknięcie handlera.
+    """
+
+    def flush(self):
+        pass
+
+    def flush_buffer(self):
+        """Zapisuje bufor pliku na dysk"""
+        super().flush()
+
+    def close(self):
+        self.flush_buffer()
+        super().close()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, który nie formatuje rekordu w wątku wywołującym.
+
+    Standardowy QueueHandler.prepare składa komunikat przed włożeniem do kolejki (z myślą
+    o kolejkach międzyprocesowych). Kolejka GPLLogger jest wewnątrzprocesowa, więc
+    składanie komunikatu z argumentów i formatowanie linii odbywa się dopiero w wątku zapisu.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener zapisujący rekordy porcjami: pobiera z kolejki wszystko, co jest dostępne
+    (najwyżej MAX_BATCH rekordów), przekazuje handlerom i dopiero wtedy opróżnia bufory plików.
+    """
+
+    MAX_BATCH = 512
+
+    def _monitor(self):
+        record = None
+        while True:
+            if record is None:
+                record = self.dequeue(True)
+
+            for _ in range(self.MAX_BATCH):
+                if record is self._sentinel:
+                    self.flush_handlers()
+                    return
+                self.handle(record)
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    record = None
+                    break
+
+            # Przy pełnej porcji ostatni pobrany rekord rozpoczyna następną
+            self.flush_handlers()
+
+    def flush_handlers(self):
+        """Opróżnia bufory handlerów, pomijając te z zamkniętym strumieniem (np. przy zamykaniu interpretera)"""
+        for handler in self.handlers:
+            stream = getattr(handler, 'stream', None)
+            if stream is not None and getattr(stream, 'closed', False):
+                continue
+            try:
+                if isinstance(handler, BufferedFileHandler):
+                    handler.flush_buffer()
+                else:
+                    handler.flush()
+            except Exception as e:
+                print(f"Error flushing log handler: {e}", file=sys.stderr)
+
+
 class GPLLogger:
     """
     Zaawansowany logger z kolorowym formatowaniem, organizacją według poziomów,
@@ -71,10 +153,27 @@ class GPLLogger:
         logging.CRITICAL: logging.CRITICAL  # critical.log zawiera tylko CRITICAL
     }
 
+    # Nazwy poziomów używane przez metody GPLLogger
+    LEVELS = {
+        'debug': logging.DEBUG,
+        'info': logging.INFO,
+        'warning': logging.WARNING,
+        'error': logging.ERROR,
+        'critical': logging.CRITICAL
+    }
+
+    # Maksymalna liczba zapamiętanych kluczy cache_key (najdawniej użyte są usuwane)
+    LOG_CACHE_SIZE = 4096
+
     # Root handler kontrolujący wszystkie logi
     _root_logger = None
     # Folder dla bieżącej sesji logowania
     _session_folder = None
+    # Handlery plików i konsoli (obsługiwane przez wątek zapisu)
+    _handlers = []
+    # Handler kolejki na głównym loggerze i wątek zapisujący rekordy z kolejki
+    _queue_handler = None
+    _listener = None
 
     @classmethod
     def setup_root_logger(cls):
@@ -100,23 +199,35 @@ class GPLLogger:
         console_formatter = ColoredFormatter(cls.LOG_FORMAT, cls.DATE_FORMAT)
 
         # Utwórz handlery dla każdego poziomu logowania
+        cls._handlers = []
         for level, filename in cls.LEVEL_FILES.items():
             min_level = cls.LEVEL_MINIMUMS[level]
 
-            file_handler = logging.FileHandler(
+            file_handler = BufferedFileHandler(
                 cls._session_folder / filename,
                 mode='a',
                 encoding='utf-8'
             )
             file_handler.setLevel(min_level)
             file_handler.setFormatter(file_formatter)
-            cls._root_logger.addHandler(file_handler)
+            cls._handlers.append(file_handler)
 
         # Dodaj handler dla konsoli
         console_handler = logging.StreamHandler()
         console_handler.setLevel(cls.DEFAULT_CONSOLE_LEVEL)
         console_handler.setFormatter(console_formatter)
-        cls._root_logger.addHandler(console_handler)
+        cls._handlers.append(console_handler)
+
+        # Wątki wywołujące tylko wkładają rekordy do kolejki; formatowanie i zapis
+        # do plików i konsoli wykonuje wątek BatchQueueListener
+        cls._start_listener()
+        atexit.register(cls.shutdown)
+        os.register_at_fork(
+            before=cls._before_fork,
+            after_in_parent=cls._after_fork_in_parent,
+            after_in_child=cls._restart_after_fork
+        )
+        multiprocessing.util.register_after_fork(cls, cls._register_finalizer)
 
         # Utwórz plik z informacją o sesji
         with open(cls._session_folder / "session_info.txt", "w", encoding="utf-8") as f:
@@ -124,6 +235,59 @@ class GPLLogger:
             f.write(f"Python version: {sys.version}\n")
             f.write(f"Platform: {sys.platform}\n")
 
+    @classmethod
+    def _start_listener(cls):
+        """Tworzy kolejkę rekordów i uruchamia wątek zapisu"""
+        log_queue = queue.SimpleQueue()
+        if cls._queue_handler is not None:
+            cls._root_logger.removeHandler(cls._queue_handler)
+        cls._queue_handler = LazyQueueHandler(log_queue)
+        cls._root_logger.addHandler(cls._queue_handler)
+
+        cls._listener = BatchQueueListener(log_queue, *cls._handlers, respect_handler_level=True)
+        cls._listener.start()
+
+    @classmethod
+    def _before_fork(cls):
+        """
+        Przed fork opróżniamy bufory plików pod blokadami handlerów — inaczej proces potomny
+        odziedziczyłby niezapisaną część bufora i zapisał ją drugi raz.
+        """
+        for handler in cls._handlers:
+            handler.acquire()
+        for handler in cls._handlers:
+            if isinstance(handler, BufferedFileHandler):
+                handler.flush_buffer()
+
+    @classmethod
+    def _after_fork_in_parent(cls):
+        for handler in cls._handlers:
+            handler.release()
+
+    @classmethod
+    def _restart_after_fork(cls):
+        """
+        W procesie potomnym (fork) wątek zapisu nie istnieje — uruchamiamy nowy
+        (blokady handlerów odnawia moduł logging).
+        """
+        if cls._root_logger is not None:
+            cls._start_listener()
+
+    @staticmethod
+    def _register_finalizer(cls):
+        """
+        Procesy multiprocessing kończą się przez os._exit, z pominięciem atexit, więc
+        zatrzymanie wątku zapisu (i zapis kolejki) rejestrujemy jako finalizer multiprocessing.
+        """
+        multiprocessing.util.Finalize(None, cls.shutdown, exitpriority=0)
+
+    @classmethod
+    def shutdown(cls):
+        """Zapisuje rekordy oczekujące w kolejce i zatrzymuje wątek zapisu"""
+        listener, cls._listener = cls._listener, None
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+
     def __init__(self, name: str):
         """Inicjalizuje logger dla konkretnego modułu"""
         # Upewnij się, że główny logger jest skonfigurowany
@@ -133,63 +297,86 @@ class GPLLogger:
         self.name = name
         self.logger = logging.getLogger(name)
 
-        # Cache dla unikania duplikacji logów
-        self._log_cache = set()
+        # Cache dla unikania duplikacji logów (ograniczony do LOG_CACHE_SIZE kluczy)
+        self._log_cache: OrderedDict = OrderedDict()
 
-        # Lock dla bezpieczeństwa wątków
+        # Lock chroniący cache (pobierany tylko dla logów z cache_key)
         self._lock = threading.RLock()
 
         # Loguj inicjalizację
-        self.debug(f"Logger initialized: {name}")
+        self.debug("Logger initialized: %s", name)
 
-    def debug(self, msg: str, *args, **kwargs):
+    def debug(self, msg: LogMessage, *args, **kwargs):
         """Log na poziomie DEBUG"""
         self._log('debug', msg, *args, **kwargs)
 
-    def info(self, msg: str, *args, **kwargs):
+    def info(self, msg: LogMessage, *args, **kwargs):
         """Log na poziomie INFO"""
         self._log('info', msg, *args, **kwargs)
 
-    def warning(self, msg: str, *args, **kwargs):
+    def warning(self, msg: LogMessage, *args, **kwargs):
         """Log na poziomie WARNING"""
         self._log('warning', msg, *args, **kwargs)
 
-    def error(self, msg: str, *args, **kwargs):
+    def error(self, msg: LogMessage, *args, **kwargs):
         """Log na poziomie ERROR"""
         self._log('error', msg, *args, **kwargs)
 
-    def critical(self, msg: str, *args, **kwargs):
+    def critical(self, msg: LogMessage, *args, **kwargs):
         """Log na poziomie CRITICAL"""
         self._log('critical', msg, *args, **kwargs)
 
-    def exception(self, msg: str, *args, exc_info=True, **kwargs):
+    def exception(self, msg: LogMessage, *args, exc_info=True, **kwargs):
         """Log z informacją o wyjątku"""
         self._log('error', msg, *args, exc_info=exc_info, **kwargs)
 
-    def _log(self, level: str, msg: str, *args, cache_key: Optional[str] = None, **kwargs):
+    def is_enabled(self, level: Union[int, str]) -> bool:
         """
-        Logowanie z cache'owaniem, aby uniknąć duplikacji
+        Sprawdza, czy komunikat na danym poziomie zostanie zapisany.
+        Tania kontrola przed kosztownym budowaniem komunikatu.
         """
-        with self._lock:
-            # Sprawdzenie cache'a
-            if cache_key:
-                if cache_key in self._log_cache:
-                    return
-                self._log_cache.add(cache_key)
+        if isinstance(level, str):
+            level = self.LEVELS[level.lower()]
 
-            # W wątkach nie-głównych pozwalamy tylko na logi INFO i wyżej
-            if threading.current_thread() != threading.main_thread():
-                if level == 'debug':
-                    return
+        # W wątkach nie-głównych pozwalamy tylko na logi INFO i wyżej
+        if level <= logging.DEBUG and threading.current_thread() is not threading.main_thread():
+            return False
 
-            # Logowanie
-            try:
-                log_func = getattr(self.logger, level)
-                log_func(msg, *args, **kwargs)
-            except Exception as e:
-                # Awaryjne wypisanie na konsolę w przypadku problemów
-                print(f"Error logging message: {e}")
-                print(f"Original message: {level.upper()} - {msg}")
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: str, msg: LogMessage, *args,
+             cache_key: Optional[Hashable] = None, **kwargs):
+        """
+        Logowanie z cache'owaniem, aby uniknąć duplikacji.
+
+        Komunikat może być gotowym tekstem, szablonem z argumentami w stylu % (składany
+        dopiero w wątku zapisu, więc argumenty nie powinny być potem modyfikowane) albo
+        funkcją bez argumentów wywoływaną tylko wtedy, gdy komunikat zostanie zapisany.
+        Rekord trafia do kolejki — zapis wykonuje wątek BatchQueueListener.
+        """
+        levelno = self.LEVELS[level]
+        if not self.is_enabled(levelno):
+            return
+
+        # Sprawdzenie cache'a
+        if cache_key is not None:
+            with self._lock:
+                if cache_key in self._log_cache:
+                    self._log_cache.move_to_end(cache_key)
+                    return
+                self._log_cache[cache_key] = None
+                if len(self._log_cache) > self.LOG_CACHE_SIZE:
+                    self._log_cache.popitem(last=False)
+
+        # Logowanie
+        try:
+            if callable(msg):
+                msg = msg()
+            self.logger.log(levelno, msg, *args, **kwargs)
+        except Exception as e:
+            # Awaryjne wypisanie na konsolę w przypadku problemów
+            print(f"Error logging message: {e}")
+            print(f"Original message: {level.upper()} - {msg}")
 
     def set_level(self, level: Union[int, str]):
         """Zmienia poziom logowania dla tego loggera"""
@@ -0,0 +1,233 @@
+# src/utils/school_generator.py
+
+"""
+Generator syntetycznych szkół do testów skalowania algorytmu genetycznego.
+
+Na podstawie ziarna i parametrów rozmiaru tworzy konfigurację szkoły (zgodną z School
+i z plikami konfiguracji CLI): klasy rozłożone na roczniki, profile z przedmiotami
+rozszerzonymi, nauczycieli z realistycznymi zestawami przedmiotów i limitami godzin
+oraz sale — w tym kilka sal specjalnych każdego typu, w liczbie zależnej od zapotrzebowania.
+"""
+
+import math
+import random
+from typing import Dict, List, Optional
+
+from src.models.classroom import Classroom
+from src.models.school import BASIC_SUBJECT_HOURS, School
+from src.models.subject import Subject
+
+YEAR_KEYS = ('first_year', 'second_year', 'third_year', 'fourth_year')
+
+# Litery klas to A-Z, więc rocznik może mieć najwyżej 26 klas
+MAX_CLASSES_PER_YEAR = 26
+
+# Liczba godzin lekcyjnych w tygodniu (5 dni × 8 godzin)
+WEEKLY_SLOTS = 40
+
+PROFILES = (
+    {'name': 'mat-fiz', 'extended_subjects': ['matematyka', 'fizyka']},
+    {'name': 'mat-inf', 'extended_subjects': ['matematyka', 'informatyka']},
+    {'name': 'biol-chem', 'extended_subjects': ['biologia', 'chemia']},
+    {'name': 'human', 'extended_subjects': ['polski', 'historia']},
+    {'name': 'lingwistyczny', 'extended_subjects': ['angielski', 'polski']},
+    {'name': 'geo-eko', 'extended_subjects': ['geografia', 'matematyka']},
+    {'name': 'prawniczy', 'extended_subjects': ['wos', 'historia']}
+)
+
+# Typowe pary przedmiotów uczonych przez jednego nauczyciela
+RELATED_SUBJECTS = {
+    'matematyka': ('fizyka', 'informatyka'),
+    'fizyka': ('matematyka',),
+    'chemia': ('biologia',),
+    'biologia': ('chemia', 'geografia'),
+    'geografia': ('biologia',),
+    'historia': ('wos', 'polski'),
+    'wos': ('historia',),
+    'polski': ('historia',),
+    'informatyka': ('matematyka',),
+    'angielski': (),
+    'wf': ()
+}
+
+SURNAMES = (
+    'Nowak', 'Kowalski', 'Wiśniewski', 'Wójcik', 'Kowalczyk', 'Kamiński', 'Lewandowski', 'Zieliński',
+    'Szymański', 'Woźniak', 'Dąbrowski', 'Kozłowski', 'Jankowski', 'Mazur', 'Kwiatkowski', 'Krawczyk',
+    'Piotrowski', 'Grabowski', 'Nowakowski', 'Pawłowski', 'Michalski', 'Król', 'Wieczorek', 'Jabłoński'
+)
+
+# Tygodniowe pensum nauczyciela (pełny etat i nadgodziny)
+WEEKLY_HOUR_LIMITS = (18, 18, 18, 22, 27)
+
+# Sale specjalne bez przedmiotów wymagających danego typu (dodawane w proporcji do liczby klas)
+OPTIONAL_ROOM_TYPES = ('lab_fizyczne', 'lab_chemiczne')
+CLASSES_PER_OPTIONAL_ROOM = 10
+
+
+def _required_room_types() -> Dict[str, List[str]]:
+    """Typ sali specjalnej -> przedmioty podstawowe, które mogą odbywać się tylko w niej"""
+    regular = Classroom(id=0, name='', capacity=30)
+    room_types = ('sala_gimnastyczna', 'sala_komputerowa') + OPTIONAL_ROOM_TYPES
+
+    required = {}
+    for name, hours in BASIC_SUBJECT_HOURS.items():
+        subject = Subject(id=0, name=name, hours_per_week=hours)
+        if School.room_fits_subject(subject, regular):
+            continue
+        for room_type in room_types:
+            if School.room_fits_subject(subject, Classroom(id=0, name='', capacity=30, room_type=room_type)):
+                required.setdefault(room_type, []).append(name)
+    return required
+
+
+def _class_counts(class_count: int) -> Dict[str, int]:
+    """Rozkłada klasy równo na roczniki"""
+    per_year, remainder = divmod(class_count, len(YEAR_KEYS))
+    return {key: per_year + (1 if index < remainder else 0) for index, key in enumerate(YEAR_KEYS)}
+
+
+def _subject_demand(class_count: int, profiles: List[Dict]) -> Dict[str, int]:
+    """Tygodniowa liczba godzin każdego przedmiotu podstawowego (wraz z rozszerzeniami) w całej szkole"""
+    demand = {name: hours * class_count for name, hours in BASIC_SUBJECT_HOURS.items()}
+    # School.initialize_classes przydziela profile po kolei w obrębie rocznika — tu w przybliżeniu w całej szkole
+    for index in range(class_count):
+        for name in profiles[index % len(profiles)]['extended_subjects']:
+            demand[name] += 1
+    return demand
+
+
+def _allocate(total: int, weights: Dict[str, float], minimum: int = 1) -> Dict[str, int]:
+    """Dzieli total między klucze proporcjonalnie do wag (metoda największych reszt), każdemu co najmniej minimum"""
+    allocation = {key: minimum for key in weights}
+    remaining = total - minimum * len(weights)
+    weight_sum = sum(weights.values())
+
+    shares = {key: remaining * weight / weight_sum for key, weight in weights.items()}
+    for key, share in shares.items():
+        allocation[key] += int(share)
+
+    leftover = total - sum(allocation.values())
+    for key in sorted(shares, key=lambda key: shares[key] - int(shares[key]), reverse=True)[:leftover]:
+        allocation[key] += 1
+    return allocation
+
+
+def _generate_teachers(rng: random.Random, teacher_count: int, demand: Dict[str, int],
+                       second_subject_probability: float) -> List[Dict]:
+    """Nauczyciele przydzieleni do przedmiotów proporcjonalnie do zapotrzebowania na godziny"""
+    if teacher_count < len(demand):
+        raise ValueError(f"At least {len(demand)} teachers are needed, got {teacher_count}")
+
+    per_subject = _allocate(teacher_count, demand)
+    teachers = []
+    for subject_name, count in per_subject.items():
+        for _ in range(count):
+            subjects = [subject_name, f"{subject_name}_rozszerzony"]
+            related = RELATED_SUBJECTS.get(subject_name, ())
+            if related and rng.random() < second_subject_probability:
+                second = rng.choice(related)
+                subjects.extend([second, f"{second}_rozszerzony"])
+
+            teacher_id = len(teachers) + 1
+            surname = SURNAMES[(teacher_id - 1) % len(SURNAMES)]
+            if teacher_id > len(SURNAMES):
+                surname = f"{surname} {(teacher_id - 1) // len(SURNAMES) + 1}"
+
+            teachers.append({
+                'id': teacher_id,
+                'name': surname,
+                'subjects': subjects,
+                'max_hours_per_day': rng.randint(6, 8),
+                'max_hours_per_week': rng.choice(WEEKLY_HOUR_LIMITS)
+            })
+    return teachers
+
+
+def _generate_classrooms(rng: random.Random, room_count: Optional[int], class_count: int,
+                         demand: Dict[str, int], slack: float) -> List[Dict]:
+    """
+    Sale specjalne według zapotrzebowania (z zapasem slack), resztę stanowią zwykłe sale.
+    Bez room_count każda klasa dostaje własną zwykłą salę.
+    """
+    special = {}
+    for room_type, subjects in _required_room_types().items():
+        hours = sum(demand[name] for name in subjects)
+        special[room_type] = max(1, math.ceil(hours * (1 + slack) / WEEKLY_SLOTS))
+    for room_type in OPTIONAL_ROOM_TYPES:
+        special.setdefault(room_type, max(1, math.ceil(class_count / CLASSES_PER_OPTIONAL_ROOM)))
+
+    if room_count is None:
+        room_count = class_count + sum(special.values())
+    regular_count = room_count - sum(special.values())
+    if regular_count < 1:
+        raise ValueError(f"At least {sum(special.values()) + 1} rooms are needed, got {room_count}")
+
+    classrooms = []
+    for index in range(regular_count):
+        floor, number = divmod(index, 20)
+        classrooms.append({
+            'id': len(classrooms) + 1,
+            'name': f"{floor + 1}{number + 1:02d}",
+            'capacity': rng.choice((24, 28, 30, 32)),
+            'room_type': 'regular'
+        })
+
+    for room_type, count in special.items():
+        for number in range(1, count + 1):
+            classrooms.append({
+                'id': len(classrooms) + 1,
+                'name': f"{room_type} {number}",
+                'capacity': 50 if room_type == 'sala_gimnastyczna' else rng.choice((20, 24)),
+                'room_type': room_type
+            })
+    return classrooms
+
+
+def generate_school_config(seed: int = 0, class_count: int = 30, teacher_count: Optional[int] = None,
+                           room_count: Optional[int] = None, profile_count: int = 3, second_subject_probability: float = 0.3,
+                           special_room_slack: float = 0.25) -> Dict:
+    """
+    Tworzy konfigurację syntetycznej szkoły.
+
+    Args:
+        seed: Ziarno — ta sama wartość daje tę samą szkołę
+        class_count: Liczba klas (rozłożonych równo na cztery roczniki)
+        teacher_count: Liczba nauczycieli (co najmniej jeden na przedmiot; domyślnie dwóch na klasę)
+        room_count: Liczba sal (specjalne według zapotrzebowania, reszta zwykłe;
+            domyślnie zwykła sala dla każdej klasy)
+        profile_count: Liczba profili klas wylosowanych z PROFILES
+        second_subject_probability: Szansa, że nauczyciel uczy także pokrewnego przedmiotu
+        special_room_slack: Zapas godzin w salach specjalnych ponad zapotrzebowanie
+
+    Returns:
+        Słownik konfiguracji dla School (class_counts, profiles, teachers, classrooms)
+
+    Raises:
+        ValueError: Gdy parametry nie pozwalają zbudować szkoły
+    """
+    if not 1 <= class_count <= MAX_CLASSES_PER_YEAR * len(YEAR_KEYS):
+        raise ValueError(f"Invalid class count: {class_count}")
+    if not 1 <= profile_count <= len(PROFILES):
+        raise ValueError(f"Invalid profile count: {profile_count}")
+
+    if teacher_count is None:
+        teacher_count = max(len(BASIC_SUBJECT_HOURS), 2 * class_count)
+
+    rng = random.Random(seed)
+    profiles = [
+        {'name': profile['name'], 'extended_subjects': list(profile['extended_subjects'])}
+        for profile in rng.sample(PROFILES, profile_count)
+    ]
+    demand = _subject_demand(class_count, profiles)
+
+    return {
+        'class_counts': _class_counts(class_count),
+        'profiles': profiles,
+        'teachers': _generate_teachers(rng, teacher_count, demand, second_subject_probability),
+        'classrooms': _generate_classrooms(rng, room_count, class_count, demand, special_room_slack)
+    }
+
+
+def generate_school(seed: int = 0, class_count: int = 30, **kwargs) -> School:
+    """Tworzy syntetyczną szkołę (parametry jak w generate_school_config)"""
+    return School(generate_school_config(seed, class_count, **kwargs))
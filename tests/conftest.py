@@ -0,0 +1,51 @@
+# tests/conftest.py
+
+"""
+Wspólne fikstury testów. Szkoły pochodzą z generatora syntetycznych szkół
+(src.utils.school_generator) ze stałym ziarnem, więc każdy test widzi te same dane.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.genetic.genetic_generator import ScheduleGenerator
+from src.models.school import School
+from src.utils.school_generator import generate_school
+
+
+@pytest.fixture(scope='session')
+def small_school() -> School:
+    """Szkoła z trzema klasami — wystarczająca dla testów operatorów i oceny"""
+    return generate_school(seed=3, class_count=3)
+
+
+@pytest.fixture(scope='session')
+def medium_school() -> School:
+    """Szkoła z dziesięcioma klasami (kilka klas w roczniku, więcej nauczycieli i sal)"""
+    return generate_school(seed=10, class_count=10)
+
+
+@pytest.fixture(autouse=True)
+def seeded_random():
+    """Stałe ziarno generatorów liczb losowych przed każdym testem"""
+    random.seed(0)
+    np.random.seed(0)
+
+
+@pytest.fixture
+def make_generator(tmp_path):
+    """Fabryka ScheduleGenerator z małą populacją i plikiem najlepszego rozwiązania w tmp_path"""
+    def make(school: School, **params) -> ScheduleGenerator:
+        defaults = {
+            'iterations': 5,
+            'population_size': 10,
+            'mutation_rate': 0.2,
+            'crossover_rate': 0.8,
+            'best_solution_path': str(tmp_path / 'best_solution.json')
+        }
+        defaults.update(params)
+        return ScheduleGenerator(school, defaults)
+
+    return make
@@ -0,0 +1,89 @@
+# tests/test_cache.py
+
+"""Cache LRU wyników fitness: kolejność usuwania wpisów i liczniki."""
+
+import pytest
+
+from src.genetic.genetic_cache import ENTRY_BYTES, FitnessCache
+
+
+def _cache(entries: int) -> FitnessCache:
+    cache = FitnessCache(max_memory_mb=entries * ENTRY_BYTES / (1024 * 1024))
+    assert cache.max_entries == entries
+    return cache
+
+
+def test_memory_budget_sets_entry_limit():
+    assert FitnessCache(max_memory_mb=1).max_entries == 1024 * 1024 // ENTRY_BYTES
+    assert FitnessCache(max_memory_mb=0).max_entries == 1
+
+
+def test_evicts_least_recently_put():
+    cache = _cache(2)
+    cache.put(1, (1.0,))
+    cache.put(2, (2.0,))
+    cache.put(3, (3.0,))
+
+    assert 1 not in cache
+    assert 2 in cache and 3 in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_get_marks_entry_as_recent():
+    cache = _cache(2)
+    cache.put(1, (1.0,))
+    cache.put(2, (2.0,))
+
+    assert cache.get(1) == (1.0,)
+    cache.put(3, (3.0,))
+
+    assert 1 in cache
+    assert 2 not in cache
+
+
+def test_put_existing_key_refreshes_without_eviction():
+    cache = _cache(2)
+    cache.put(1, (1.0,))
+    cache.put(2, (2.0,))
+    cache.put(1, (10.0,))
+    cache.put(3, (3.0,))
+
+    assert cache.get(1) == (10.0,)
+    assert 2 not in cache
+    assert cache.evictions == 1
+
+
+def test_counters_and_stats():
+    cache = _cache(4)
+    assert cache.hit_rate == 0.0
+
+    cache.put(1, (1.0,))
+    cache.get(1)
+    cache.get(1)
+    cache.get(2)
+
+    assert cache.hits == 2
+    assert cache.misses == 1
+    assert cache.hit_rate == pytest.approx(200 / 3)
+    assert cache.stats() == {
+        'hits': 2,
+        'misses': 1,
+        'evictions': 0,
+        'size': 1,
+        'max_entries': 4,
+        'hit_rate': pytest.approx(200 / 3)
+    }
+
+
+def test_clear_keeps_counters():
+    cache = _cache(4)
+    cache.put(1, (1.0,))
+    cache.get(1)
+    cache.get(2)
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get(1) is None
+    assert (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,69 @@
+# tests/test_checkpoint.py
+
+"""Zapis i odczyt checkpointów oraz wznowienie ewolucji w tym samym miejscu."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.genetic.genetic_checkpoint import load_checkpoint, save_checkpoint
+from src.utils.school_generator import generate_school
+
+
+def _history(make_generator, tmp_path, name: str, iterations: int, resume_from=None, **params):
+    """Uruchamia ewolucję od tego samego ziarna i zwraca historię postępu"""
+    random.seed(1)
+    np.random.seed(1)
+    generator = make_generator(
+        generate_school(seed=3, class_count=3),
+        iterations=iterations,
+        population_size=20,
+        best_solution_path=str(tmp_path / f'{name}.json'),
+        **params
+    )
+    _, history, _ = generator.generate(resume_from=resume_from)
+    return history
+
+
+def test_save_and_load_round_trip(tmp_path, make_generator):
+    path = tmp_path / 'checkpoint.npz'
+    _history(make_generator, tmp_path, 'run', 4, checkpoint_path=str(path), checkpoint_interval=2)
+
+    checkpoint = load_checkpoint(path)
+    copy_path = tmp_path / 'copy.npz'
+    save_checkpoint(copy_path, checkpoint)
+    restored = load_checkpoint(copy_path)
+
+    assert restored.generation == checkpoint.generation
+    np.testing.assert_array_equal(restored.population_genes, checkpoint.population_genes)
+    np.testing.assert_array_equal(restored.population_fitness, checkpoint.population_fitness)
+    np.testing.assert_array_equal(restored.hall_of_fame_genes, checkpoint.hall_of_fame_genes)
+    np.testing.assert_array_equal(restored.hall_of_fame_fitness, checkpoint.hall_of_fame_fitness)
+    assert restored.adaptive_rates == checkpoint.adaptive_rates
+    assert restored.random_state == checkpoint.random_state
+    assert restored.numpy_random_state[0] == checkpoint.numpy_random_state[0]
+    np.testing.assert_array_equal(restored.numpy_random_state[1], checkpoint.numpy_random_state[1])
+    assert restored.numpy_random_state[2:] == pytest.approx(checkpoint.numpy_random_state[2:])
+    assert restored.progress_history == checkpoint.progress_history
+    assert checkpoint.population_genes.shape[0] == 20
+
+
+def test_rejects_unknown_version(tmp_path):
+    path = tmp_path / 'broken.npz'
+    np.savez(path, metadata=np.array('{"version": -1}'))
+
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+
+
+def test_resume_reproduces_uninterrupted_run(tmp_path, make_generator):
+    path = str(tmp_path / 'checkpoint.npz')
+
+    full = _history(make_generator, tmp_path, 'full', 20)
+    _history(make_generator, tmp_path, 'first_half', 10, checkpoint_path=path, checkpoint_interval=10)
+    resumed = _history(make_generator, tmp_path, 'resumed', 20, checkpoint_path=path, checkpoint_interval=10,
+                       resume_from=path)
+
+    assert [entry['best_fitness'] for entry in resumed] == [entry['best_fitness'] for entry in full]
+    assert [entry['avg_fitness'] for entry in resumed] == [entry['avg_fitness'] for entry in full]
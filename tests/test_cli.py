@@ -0,0 +1,50 @@
+# tests/test_cli.py
+
+"""Przebiegi wiersza poleceń dla każdego silnika na małej syntetycznej szkole."""
+
+import json
+
+import pytest
+
+from src import cli
+from src.utils.school_generator import generate_school_config
+
+ENGINE_OPTIONS = {
+    'genetic': ['--iterations', '3', '--population-size', '8'],
+    'annealing': ['--annealing-time-limit', '1'],
+    'tabu': ['--tabu-time-limit', '1'],
+    'milp': ['--solver-time-limit', '10']
+}
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'school.json'
+    path.write_text(json.dumps(generate_school_config(seed=3, class_count=3)), encoding='utf-8')
+    return path
+
+
+@pytest.mark.parametrize('engine', cli.ENGINES)
+def test_engine_generates_schedule(engine, config_path, tmp_path, capsys):
+    if engine == 'milp':
+        pytest.importorskip('pulp')
+    output_dir = tmp_path / 'out'
+
+    exit_code = cli.main([str(config_path), '--engine', engine, '--output-dir', str(output_dir), '--seed', '1',
+                          *ENGINE_OPTIONS[engine]])
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{')]
+    assert exit_code == 0
+    assert [result['status'] for result in results] == ['ok']
+    assert results[0]['schedule'] == 'school'
+    assert any(output_dir.iterdir())
+
+
+def test_failed_config_sets_exit_code(tmp_path, capsys):
+    missing = tmp_path / 'missing.json'
+
+    exit_code = cli.main([str(missing), '--iterations', '1', '--output-dir', str(tmp_path / 'out')])
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{')]
+    assert exit_code == 1
+    assert results[0]['status'] == 'error'
@@ -0,0 +1,95 @@
+# tests/test_encoding.py
+
+"""
+Hasz Zobrista osobnika: aktualizacja przy zmianach genów, przenoszenie przez operatory
+genetyczne i inherit_tracking oraz rozróżnianie wartości pól na pełnej szerokości int16.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.genetic.creator import get_individual_class
+from src.genetic.genetic_encoding import (
+    GENE_DTYPE, TEACHER, individual_hash, inherit_tracking, segment_hash, set_gene, set_genes,
+    set_genes_at
+)
+
+
+@pytest.fixture
+def generator(small_school, make_generator):
+    return make_generator(small_school)
+
+
+def _assert_hash_current(individual):
+    assert individual.zhash == segment_hash(np.asarray(individual))
+
+
+def test_individual_hash_is_cached(generator):
+    individual = generator.toolbox.individual()
+    individual.__dict__.pop('zhash', None)
+
+    value = individual_hash(individual)
+
+    assert individual.zhash == value == segment_hash(np.asarray(individual))
+
+
+def test_set_gene_helpers_update_hash(generator):
+    individual = generator.toolbox.individual()
+    individual_hash(individual)
+    donor = np.asarray(generator.toolbox.individual())
+
+    for _ in range(20):
+        set_gene(individual, random.randrange(len(individual)), donor[random.randrange(len(donor))])
+        _assert_hash_current(individual)
+
+    set_genes(individual, 3, donor[10:20])
+    _assert_hash_current(individual)
+
+    set_genes_at(individual, [40, 2, 17], donor[[5, 6, 7]])
+    _assert_hash_current(individual)
+
+
+def test_crossover_and_mutation_keep_hash_current(generator):
+    first, second = generator.toolbox.individual(), generator.toolbox.individual()
+    for individual in (first, second):
+        individual_hash(individual)
+
+    for _ in range(30):
+        if random.random() < 0.5:
+            first, second = generator.operators.crossover(first, second)
+            _assert_hash_current(first)
+            _assert_hash_current(second)
+        else:
+            first = generator.operators.mutation(first)
+            _assert_hash_current(first)
+
+
+def test_inherit_tracking_moves_state(generator):
+    parent = generator.toolbox.individual()
+    generator.evaluator.evaluate_schedule(parent)
+    individual_hash(parent)
+    state = parent.eval_state
+
+    child = get_individual_class()(parent)
+    inherit_tracking(child, parent)
+
+    assert child.zhash == parent.zhash
+    assert child.eval_state is state
+    assert not hasattr(parent, 'eval_state')
+
+
+def test_hash_distinguishes_values_beyond_ten_bits():
+    genes = np.zeros((1, 6), dtype=GENE_DTYPE)
+    other = genes.copy()
+    genes[0, TEACHER] = 5
+    other[0, TEACHER] = 5 + 1024
+
+    assert segment_hash(genes) != segment_hash(other)
+
+
+def test_hash_depends_on_gene_position():
+    genes = np.arange(12, dtype=GENE_DTYPE).reshape(2, 6)
+
+    assert segment_hash(genes) != segment_hash(genes[::-1])
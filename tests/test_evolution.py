@@ -0,0 +1,52 @@
+# tests/test_evolution.py
+
+"""Postęp ewolucji na stałej szerokości chromosomu: najlepszy wynik populacji musi rosnąć."""
+
+import pytest
+
+from src.genetic.genetic_construction import DSaturInitializer
+
+
+def _best(population) -> float:
+    return max(individual.fitness.values[0] for individual in population)
+
+
+@pytest.fixture
+def evolution(medium_school, make_generator):
+    """Populacja losowych osobników i menedżer populacji gotowy do kolejnych generacji"""
+    generator = make_generator(medium_school, initializer='random', population_size=20)
+    manager = generator.population_manager
+    manager.set_params(generator.params)
+    population = manager.initialize_population(generator.toolbox, 20)
+    return generator, manager, population
+
+
+def test_random_population_escapes_zero_fitness(evolution):
+    generator, manager, population = evolution
+    initial = _best(population)
+
+    for _ in range(10):
+        manager.evolve_generation(population, generator.toolbox, generator.operators)
+
+    assert initial == 0
+    assert _best(population) > initial
+
+
+def _average(population) -> float:
+    return sum(individual.fitness.values[0] for individual in population) / len(population)
+
+
+def test_seeded_population_keeps_its_quality(medium_school, make_generator):
+    generator = make_generator(medium_school, population_size=20)
+    manager = generator.population_manager
+    manager.set_params(generator.params)
+    population = manager.initialize_population(generator.toolbox, 20)
+    initial_best, initial_average = _best(population), _average(population)
+
+    for _ in range(10):
+        manager.evolve_generation(population, generator.toolbox, generator.operators)
+
+    assert isinstance(generator.initializer, DSaturInitializer)
+    assert initial_best > 0
+    assert _best(population) >= initial_best
+    assert _average(population) >= initial_average / 2
@@ -0,0 +1,146 @@
+# tests/test_fitness.py
+
+"""
+Zgodność szybkich ścieżek oceny (kernel, ocena wsadowa, ocena przyrostowa)
+z referencyjną oceną na obiektach Schedule (evaluator_backend='python').
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.genetic.genetic_encoding import DAY, DAYS, HOUR, HOURS_PER_DAY, set_gene
+from src.genetic.genetic_evaluator import GeneticEvaluator
+from src.genetic.genetic_local_search import NeighbourhoodMoves
+
+
+def _individuals(generator, count: int):
+    return [generator.toolbox.individual() for _ in range(count)]
+
+
+@pytest.fixture(params=['random', 'dsatur'])
+def generator(request, medium_school, make_generator):
+    return make_generator(medium_school, initializer=request.param)
+
+
+@pytest.fixture
+def reference(generator):
+    """Ewaluator liczący fitness przez obiekty Schedule"""
+    return GeneticEvaluator(generator.school, generator.operators, {'evaluator_backend': 'python'})
+
+
+def _reference_scores(reference, individuals):
+    return [reference.evaluate_schedule(np.array(individual))[0] for individual in individuals]
+
+
+def test_kernel_matches_python_backend(generator, reference):
+    individuals = _individuals(generator, 8)
+
+    scores = [generator.evaluator.kernel.fitness(np.asarray(individual)) for individual in individuals]
+
+    assert scores == pytest.approx(_reference_scores(reference, individuals))
+
+
+def test_batch_matches_python_backend(generator, reference):
+    individuals = _individuals(generator, 8)
+    batch = np.stack([np.asarray(individual) for individual in individuals])
+
+    scores = generator.evaluator.kernel.fitness_batch(batch)
+
+    assert list(scores) == pytest.approx(_reference_scores(reference, individuals))
+
+
+def test_evaluate_population_matches_python_backend(generator, reference):
+    individuals = _individuals(generator, 8)
+    # Duplikat sprawdza ścieżkę oceny jednego osobnika dla kilku pozycji partii
+    individuals.append(individuals[0])
+
+    evaluator = GeneticEvaluator(generator.school, generator.operators, {'delta_evaluation': False})
+    results = evaluator.evaluate_population([np.array(individual) for individual in individuals])
+
+    assert [result[0] for result in results] == pytest.approx(_reference_scores(reference, individuals))
+
+
+def test_evaluate_population_batches_rebuilds_under_default_params(generator, reference):
+    evaluator = generator.evaluator
+    assert evaluator.delta is not None
+    individuals = _individuals(generator, 8)
+
+    # Nowe osobniki nie mają stanu — cała populacja idzie jedną partią kernela
+    results = evaluator.evaluate_population(individuals)
+    assert [result[0] for result in results] == pytest.approx(_reference_scores(reference, individuals))
+    assert all(getattr(individual, 'eval_state', None) is None for individual in individuals)
+
+    # Osobniki ze stanem i pojedynczą zmianą genu są aktualizowane przyrostowo
+    for individual in individuals:
+        evaluator.evaluate_schedule(individual)
+        source = np.asarray(individual)[0].copy()
+        source[HOUR] = (source[HOUR] + 1) % HOURS_PER_DAY
+        set_gene(individual, 1, source)
+
+    results = evaluator.evaluate_population(individuals)
+    assert [result[0] for result in results] == pytest.approx(_reference_scores(reference, individuals))
+    assert all(individual.eval_state is not None for individual in individuals)
+
+
+def test_delta_tracks_operators(generator, reference):
+    evaluator = generator.evaluator
+    assert evaluator.delta is not None
+
+    first, second = _individuals(generator, 2)
+    for _ in range(40):
+        if random.random() < 0.5:
+            first, second = generator.operators.crossover(first, second)
+        else:
+            first = generator.operators.mutation(first)
+
+        for individual in (first, second):
+            score = evaluator.evaluate_schedule(individual)[0]
+            assert score == pytest.approx(reference.evaluate_schedule(np.array(individual))[0])
+
+
+def test_delta_tracks_single_gene_edits(generator, reference):
+    evaluator = generator.evaluator
+    individual = generator.toolbox.individual()
+    evaluator.evaluate_schedule(individual)
+
+    genes = np.asarray(individual)
+    for _ in range(60):
+        index = random.randrange(len(genes))
+        source = genes[random.randrange(len(genes))].copy()
+        source[DAY] = random.randrange(DAYS)
+        source[HOUR] = random.randrange(HOURS_PER_DAY)
+        set_gene(individual, index, source)
+
+        score = evaluator.evaluate_schedule(individual)[0]
+        assert score == pytest.approx(reference.evaluate_schedule(np.array(individual))[0])
+
+        # Stan po aktualizacjach odpowiada stanowi zbudowanemu od zera
+        fresh = evaluator.delta.build(np.asarray(individual))
+        assert fresh.slot_accepted == individual.eval_state.slot_accepted
+        assert fresh.class_count == individual.eval_state.class_count
+        assert fresh.room_count == individual.eval_state.room_count
+
+
+def test_rejected_moves_restore_state(generator):
+    moves = NeighbourhoodMoves(generator.school)
+    delta = generator.evaluator.delta
+    individual = generator.toolbox.individual()
+    generator.evaluator.evaluate_schedule(individual)
+    genes = np.asarray(individual)
+
+    for _ in range(200):
+        before = genes.copy()
+        previous, undo = moves.evaluate(delta, individual, genes, moves.propose(genes, individual.eval_state))
+        if random.random() < 0.5:
+            moves.reject(delta, individual, genes, previous, undo)
+            np.testing.assert_array_equal(genes, before)
+
+        # Wycofany lub przyjęty ruch zostawia stan taki jak zbudowany od zera
+        state, fresh = individual.eval_state, delta.build(genes)
+        assert delta.score(state) == pytest.approx(generator.evaluator.kernel.fitness(genes))
+        for name in ('slot_members', 'slot_accepted', 'class_count', 'class_hours', 'teacher_day', 'room_count',
+                     'distribution_total', 'teacher_total', 'room_total', 'scheduled_total'):
+            assert getattr(state, name) == getattr(fresh, name), name
+        assert sorted(state.occupied) == sorted(fresh.occupied)
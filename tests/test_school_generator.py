@@ -0,0 +1,66 @@
+# tests/test_school_generator.py
+
+import pytest
+
+from src.models.school import BASIC_SUBJECT_HOURS, School
+from src.utils.school_generator import generate_school, generate_school_config
+
+
+@pytest.mark.parametrize('seed', [0, 7, 123])
+def test_same_seed_gives_same_config(seed):
+    assert generate_school_config(seed=seed, class_count=12) == generate_school_config(seed=seed, class_count=12)
+
+
+def test_different_seeds_give_different_configs():
+    configs = [generate_school_config(seed=seed, class_count=12) for seed in range(5)]
+    assert len({repr(config) for config in configs}) > 1
+
+
+@pytest.mark.parametrize('class_count, teacher_count, room_count', [
+    (1, None, None),
+    (4, 20, None),
+    (10, 30, 25),
+    (40, None, 60),
+    (104, 250, 150)
+])
+def test_requested_counts_are_met(class_count, teacher_count, room_count):
+    config = generate_school_config(seed=1, class_count=class_count, teacher_count=teacher_count,
+                                    room_count=room_count)
+    school = School(config)
+
+    assert sum(config['class_counts'].values()) == class_count
+    assert len(school.class_groups) == class_count
+    expected_teachers = teacher_count if teacher_count is not None else max(len(BASIC_SUBJECT_HOURS), 2 * class_count)
+    assert len(school.teachers) == expected_teachers
+    if room_count is not None:
+        assert len(school.classrooms) == room_count
+
+
+@pytest.mark.parametrize('seed, class_count', [(0, 1), (3, 5), (11, 17), (40, 40)])
+def test_every_required_subject_has_teacher_and_room(seed, class_count):
+    school = generate_school(seed=seed, class_count=class_count)
+
+    for class_name, required in school.class_required_subjects.items():
+        for subject_name, hours in required.items():
+            assert hours > 0
+            assert school.subject_teachers[subject_name], f"{class_name}: no teacher for {subject_name}"
+            assert school.subject_rooms[subject_name], f"{class_name}: no room for {subject_name}"
+
+
+def test_identifiers_are_unique():
+    config = generate_school_config(seed=5, class_count=30)
+    assert len({teacher['id'] for teacher in config['teachers']}) == len(config['teachers'])
+    assert len({teacher['name'] for teacher in config['teachers']}) == len(config['teachers'])
+    assert len({room['id'] for room in config['classrooms']}) == len(config['classrooms'])
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'class_count': 0},
+    {'class_count': 105},
+    {'class_count': 5, 'profile_count': 0},
+    {'class_count': 5, 'teacher_count': 3},
+    {'class_count': 5, 'room_count': 2}
+])
+def test_invalid_parameters_raise(kwargs):
+    with pytest.raises(ValueError):
+        generate_school_config(seed=0, **kwargs)